@@ -0,0 +1,81 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Load time benchmark of external box catalogue files.
+
+        Writes a synthetic catalogue of random positions with every valid
+        black move, then measures streaming the file into a computer.
+
+        Run with:
+            python -m benchmarks.bench_catalogue
+
+###############################################################################
+"""
+import gc
+import os
+import random
+import tempfile
+import time
+
+from hexapawn.computer import *
+from hexapawn.catalogue import *
+from hexapawn.catalogue import _MOVE_TOKENS
+
+COUNT = 100000
+"""Number of boxes in synthetic catalogue."""
+
+def writeSyntheticCatalogue(path:str,count:int,seed:int=0)->None:
+    """
+    Writes catalogue of random positions having at least one black move.
+    Turns are assigned so (turn,position) pairs are distinct.
+
+    Parameter
+    ---------
+    path : str
+        Catalogue file path.
+    count : int
+        Number of boxes.
+    seed : int
+        Seed for random generator.
+    """
+    rng = random.Random(seed)
+    colors = list(COLOR_LETTERS.keys())
+    used = set()
+    with open(path,"w") as f:
+        written = 0
+        while written < count:
+            tiles = "".join(rng.choice("BW---") for _ in range(SIZE*SIZE))
+            moves = [token for token, (code, color, fromIndex, toIndex, required) in _MOVE_TOKENS.items()\
+                     if token[3] == colors[0] and tiles[fromIndex] == "B" and tiles[toIndex] == required]
+            if len(moves) == 0:
+                continue
+            turn = 2
+            while (turn,tiles) in used:
+                turn += 2
+            used.add((turn,tiles))
+            moves = [m[:3] + colors[i%len(colors)] + ("" if i%2 == 0 else "=2.5")\
+                     for i, m in enumerate(moves)]
+            f.write("b{} {} {} {}\n".format(written,turn,tiles,",".join(moves)))
+            written += 1
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmpDir:
+        path = os.path.join(tmpDir,"catalogue.txt")
+        writeSyntheticCatalogue(path,COUNT)
+        # loading only allocates objects that are kept, skip collection passes
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            boxCount = sum(1 for _ in loadCatalogue(path))
+            loaded = time.perf_counter()
+            computer = Computer(boxes=loadCatalogue(path))
+            end = time.perf_counter()
+        finally:
+            gc.enable()
+    print("boxes                 : {}".format(boxCount))
+    print("loadCatalogue         : {:.3f} s".format(loaded-start))
+    print("Computer(boxes=...)   : {:.3f} s".format(end-loaded))
@@ -0,0 +1,116 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Memory benchmark of game objects and game sessions.
+
+        Each object is measured as is, with __slots__, and copied into a
+        dict-backed layout of the same attributes, the layout before the
+        classes were slotted, so the saving can be reproduced.
+
+        Run with:
+            python -m benchmarks.bench_memory
+
+###############################################################################
+"""
+import contextlib
+import gc
+import io
+import tracemalloc
+
+from hexapawn.game_manager import *
+from hexapawn.board import *
+from hexapawn.computer import *
+
+COUNT = 10000
+"""Number of instances created per measurement."""
+
+SLOTTED_TYPES = (Position,Pawn,Move,MoveRecord,GameManager,Board)
+"""Types copied into dict-backed layout."""
+
+OWNED_TYPES = (Position,Pawn)
+"""Types also copied when referenced by copied object. Other references,
+e.g. box and move of MoveRecord, are shared and kept."""
+
+_dictTypes = {}
+"""Dict-backed stand-in class by slotted type."""
+
+def toDictLayout(value,types:tuple=SLOTTED_TYPES):
+    """
+    Copies slotted objects into instances of plain classes with the same
+    attributes in a per-instance __dict__, recursing into lists and tuples.
+
+    Parameter
+    ---------
+    value : Any
+        Value to copy.
+    types : tuple
+        Types to copy.
+
+    Returns
+    ---------
+    Any : Dict-backed copy. value if it is not of types.
+    """
+    if type(value) in (list,tuple):
+        return type(value)(toDictLayout(item,types) for item in value)
+    if not type(value) in types:
+        return value
+    cls = type(value)
+    dictType = _dictTypes.get(cls)
+    if dictType == None:
+        dictType = type("Dict" + cls.__name__,(),{})
+        _dictTypes[cls] = dictType
+    copy = dictType()
+    for klass in cls.__mro__:
+        for name in getattr(klass,"__slots__",()):
+            if hasattr(value,name):
+                setattr(copy,name,toDictLayout(getattr(value,name),OWNED_TYPES))
+    return copy
+
+def measure(factory)->float:
+    """
+    Measures average allocated bytes per instance created by factory.
+
+    Parameter
+    ---------
+    factory : MethodType
+        Callback creating one instance.
+
+    Returns
+    ---------
+    float : Bytes per instance.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(COUNT)]
+    end = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (end-start)/COUNT
+
+def createSession()->tuple:
+    """
+    Creates game state held per session.
+    """
+    return (GameManager(),Board())
+
+if __name__ == "__main__":
+    with contextlib.redirect_stdout(io.StringIO()):
+        box = Computer()._boxes[0]
+    results = [
+        ("Position",        lambda : Position(1,1)),
+        ("Pawn",            lambda : Pawn(Color.WHITE,Position(1,1))),
+        ("Move",            lambda : Move(Position(0,1),MoveColor.GREEN,Movement.FORWARD)),
+        ("MoveRecord",      lambda : MoveRecord(box,box.moves[0])),
+        ("GameManager",     GameManager),
+        ("Board",           Board),
+        ("Session",         createSession),
+    ]
+    print("{:<12}   {:>10}   {:>10}".format("bytes","dict","slots"))
+    for name, factory in results:
+        print("{:<12} : {:10.1f} : {:10.1f}".format(
+            name,measure(lambda : toDictLayout(factory())),measure(factory)))
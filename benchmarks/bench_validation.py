@@ -0,0 +1,65 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Benchmark of CHECKED and FAST validation modes.
+
+        Run with:
+            python -m benchmarks.bench_validation
+
+###############################################################################
+"""
+import contextlib
+import io
+import time
+
+from hexapawn.board import *
+from hexapawn.computer import *
+from hexapawn.match_runner import MatchRunner, RandomPlayer
+
+GAMES = 5000
+"""Number of games played per measurement."""
+
+COMPARISONS = 20000
+"""Number of board comparisons per measurement."""
+
+def measureGames()->float:
+    """
+    Measures played games per second.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner = MatchRunner(Computer(seed=0),RandomPlayer(seed=0))
+        start = time.perf_counter()
+        runner.playGames(GAMES)
+        return GAMES / (time.perf_counter()-start)
+
+def measureStartup()->float:
+    """
+    Measures seconds to build computer boxes from definitions.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        Computer(cachePath=None)
+        return time.perf_counter()-start
+
+def measureComparisons()->float:
+    """
+    Measures board comparisons per second.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        boxes = Computer()._boxes
+        start = time.perf_counter()
+        for i in range(COMPARISONS):
+            areBoardsEqual(boxes[i%len(boxes)],boxes[(i+1)%len(boxes)])
+        return COMPARISONS / (time.perf_counter()-start)
+
+if __name__ == "__main__":
+    print("{:<10}{:>16}{:>16}{:>20}".format("mode","games/s","startup ms","comparisons/s"))
+    for mode in ValidationMode:
+        setValidationMode(mode)
+        print("{:<10}{:>16.0f}{:>16.2f}{:>20.0f}".format(
+            mode.name,measureGames(),measureStartup()*1000,measureComparisons()))
+    setValidationMode(ValidationMode.CHECKED)
@@ -0,0 +1,171 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for computer versus computer auto-play.
+
+        AutoPlayer steps a MatchRunner from a timer in the UI thread. At
+        real-time speeds one move is made per timer tick, at maximum speed
+        moves are made for a fixed time budget of each frame. Either way
+        board changes and game results of a tick are reported in a single
+        frame signal, so the UI repaints at most once per tick. Board
+        changes are detected from the board version.
+
+###############################################################################
+"""
+import time
+from typing import NamedTuple
+
+from PyQt5 import QtCore
+
+from hexapawn.game_manager import *
+from hexapawn.board import *
+from hexapawn.match_runner import MatchRunner
+
+AUTO_PLAY_FRAME_INTERVAL = 16
+"""Timer interval in milliseconds at maximum speed."""
+
+AUTO_PLAY_FRAME_BUDGET = 0.012
+"""Seconds spent making moves per frame at maximum speed."""
+
+AUTO_PLAY_SPEEDS = {
+    "Slow"      : 1000,
+    "Normal"    : 400,
+    "Fast"      : 100,
+    "Maximum"   : 0,
+}
+"""Milliseconds per move by speed name. 0 for as fast as possible."""
+
+class AutoPlayFrame(NamedTuple):
+    """
+    Changes made in a frame.
+    """
+    steps: int
+    """Number of moves and game resets made."""
+    boardChanged: bool
+    """True if board changed."""
+    results: list
+    """(winner,removed move record) of games ended in frame. See
+    MatchRunner.removedMoveRecord."""
+
+class AutoPlayer(QtCore.QObject):
+    """
+    Plays games of match runner continuously.
+    """
+
+    frame = QtCore.pyqtSignal(object)
+    """Emitted with AutoPlayFrame once per frame."""
+
+    def __init__(self,runner:MatchRunner,moveInterval:int=AUTO_PLAY_SPEEDS["Normal"],parent:QtCore.QObject=None) -> None:
+        """
+        Parameter
+        ---------
+        runner : MatchRunner
+            Match runner to step.
+        moveInterval : int
+            Milliseconds per move. 0 for as fast as possible.
+        parent : QtCore.QObject
+            Parent object.
+        """
+        super().__init__(parent)
+        assert not runner == None
+        self.runner = runner
+        """Match runner to step."""
+        self._moveInterval = 0
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.playFrame)
+        self.setMoveInterval(moveInterval)
+
+    def _step(self,results:list)->None:
+        """
+        Makes next move, or starts new game if game ended.
+
+        Parameter
+        ---------
+        results : list
+            Results to append result to if game ends.
+        """
+        if self.runner.gameManager.ended:
+            self.runner.reset()
+            return
+        self.runner.step()
+        if self.runner.gameManager.ended:
+            results.append((self.runner.gameManager.winner,self.runner.removedMoveRecord))
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def setMoveInterval(self,moveInterval:int)->None:
+        """
+        Sets speed.
+
+        Parameter
+        ---------
+        moveInterval : int
+            Milliseconds per move. 0 for as fast as possible.
+        """
+        assert type(moveInterval) == int and moveInterval >= 0
+        self._moveInterval = moveInterval
+        self._timer.setInterval(moveInterval if moveInterval > 0 else AUTO_PLAY_FRAME_INTERVAL)
+
+    def getMoveInterval(self)->int:
+        """
+        Gets speed.
+
+        Returns
+        ---------
+        int : Milliseconds per move. 0 for as fast as possible.
+        """
+        return self._moveInterval
+
+    def isRunning(self)->bool:
+        """
+        Checks if auto-play is running.
+
+        Returns
+        ---------
+        bool : True if running.
+        """
+        return self._timer.isActive()
+
+    def start(self)->None:
+        """
+        Starts auto-play from current game.
+        """
+        self._timer.start()
+
+    def stop(self)->None:
+        """
+        Stops auto-play.
+        """
+        self._timer.stop()
+
+    def playFrame(self)->AutoPlayFrame:
+        """
+        Plays one frame, a single move at real-time speeds or moves for
+        AUTO_PLAY_FRAME_BUDGET at maximum speed. Called by timer.
+
+        Returns
+        ---------
+        AutoPlayFrame : Changes made, also emitted as frame signal.
+        """
+        results = []
+        steps = 0
+        version = self.runner.board.getVersion()
+        if self._moveInterval > 0:
+            self._step(results)
+            steps = 1
+        else:
+            end = time.perf_counter() + AUTO_PLAY_FRAME_BUDGET
+            while True:
+                self._step(results)
+                steps += 1
+                if time.perf_counter() >= end:
+                    break
+        frame = AutoPlayFrame(steps,not self.runner.board.getVersion() == version,results)
+        self.frame.emit(frame)
+        return frame
@@ -9,14 +9,63 @@
 
 ###############################################################################
 """
+from collections import deque
 from enum import Enum, IntEnum, auto
-import math
+import functools
 from types import MethodType
+from typing import NamedTuple
 from PyQt5.QtCore import Qt
 
 SIZE = 3
 """Hexapawn size"""
 
+class ValidationMode(IntEnum):
+    """
+    Argument validation modes. See setValidationMode.
+    """
+    CHECKED = auto()
+    FAST    = auto()
+
+_checkedMode = True
+"""True to validate arguments in hot paths. See setValidationMode."""
+
+def setValidationMode(mode:ValidationMode)->None:
+    """
+    Sets validation mode of the process.\n
+    CHECKED validates arguments, moves and boxes in Board and Computer.
+    FAST skips these checks in hot paths for production play, without
+    running python with -O.
+
+    Parameter
+    ---------
+    mode : ValidationMode
+        Validation mode.
+    """
+    global _checkedMode
+    assert type(mode) == ValidationMode
+    _checkedMode = mode == ValidationMode.CHECKED
+
+def getValidationMode()->ValidationMode:
+    """
+    Gets validation mode of the process.
+
+    Returns
+    ---------
+    ValidationMode : Validation mode.
+    """
+    return ValidationMode.CHECKED if _checkedMode else ValidationMode.FAST
+
+def isCheckedMode()->bool:
+    """
+    Checks if validation mode of the process is CHECKED.
+
+    Returns
+    ---------
+    - True  : Arguments are validated.
+    - False : Validation is skipped.
+    """
+    return _checkedMode
+
 class Color(Enum):
     """
     Pawn color.
@@ -24,18 +73,57 @@ class Color(Enum):
     WHITE = Qt.white
     BLACK = Qt.black
 
+TILE_EMPTY = 0
+"""Key code of empty tile."""
+TILE_WHITE = 1
+"""Key code of tile with white pawn."""
+TILE_BLACK = 2
+"""Key code of tile with black pawn."""
+
 class Position():
     """
-    Indicator of pawn position in board.
+    Indicator of pawn position in board.\n
+    Positions are immutable and interned: Position(row,col) always returns
+    the same instance from POSITIONS, so positions can be compared by
+    identity.
     """
-    def __init__(self,row,col) -> None:
+
+    __slots__ = ("row","col")
+
+    def __new__(cls,row,col):
+        """
         """
+        if _checkedMode:
+            assert row>=0 and row<SIZE, "Invalid row."
+            assert col>=0 and col<SIZE, "Invalid col."
+        elif row < 0 or col < 0:
+            # negative index would wrap around POSITIONS, too large index
+            # raises IndexError on lookup
+            raise IndexError("Invalid position.")
+
+        return POSITIONS[row][col]
+
+    @classmethod
+    def _create(cls,row:int,col:int)->"Position":
         """
-        assert row>=0 and row<SIZE, "Invalid row."
-        assert col>=0 and col<SIZE, "Invalid col."
+        Creates position instance for POSITIONS table.
+        """
+        position = object.__new__(cls)
+        object.__setattr__(position,"row",row)
+        object.__setattr__(position,"col",col)
+        return position
+
+    def __setattr__(self,name,value):
+        raise AttributeError("Position is immutable.")
 
-        self.row = row
-        self.col = col
+    def __reduce__(self):
+        return (Position,(self.row,self.col))
+
+    def __repr__(self) -> str:
+        return "Position({},{})".format(self.row,self.col)
+
+POSITIONS = [[Position._create(row,col) for col in range(SIZE)] for row in range(SIZE)]
+"""Table of every position, POSITIONS[row][col]."""
 
 def arePositionsEqual(positionA:Position,positionB:Position)->None:
     """
@@ -51,16 +139,18 @@ def arePositionsEqual(positionA:Position,positionB:Position)->None:
     - True  : Positions are equal
     - False : Positions are not equal
     """
-    assert not positionA == None and type(positionA) == Position
-    assert not positionB == None and type(positionB) == Position
-    return True if positionA.row == positionB.row and\
-        positionA.col == positionB.col\
-            else False
+    if _checkedMode:
+        assert not positionA == None and type(positionA) == Position
+        assert not positionB == None and type(positionB) == Position
+    return positionA is positionB
 
 class Pawn():
     """
     Pawn.
     """
+
+    __slots__ = ("color","position")
+
     def __init__(self,color:Color,position:Position) -> None:
         self.color = color
         self.position = position
@@ -101,8 +191,9 @@ def arePawnsEqual(aPawns:list,bPawns:list)->bool:
     True - list of pawns are equal.
     False - list of pawns are not equal.
     """
-    assert type(aPawns) == list and all(type(a)==Pawn for a in aPawns)
-    assert type(bPawns) == list and all(type(b)==Pawn for b in bPawns)
+    if _checkedMode:
+        assert type(aPawns) == list and all(type(a)==Pawn for a in aPawns)
+        assert type(bPawns) == list and all(type(b)==Pawn for b in bPawns)
     res = False
     if len(aPawns) == len(bPawns):
         res = True
@@ -116,6 +207,31 @@ def arePawnsEqual(aPawns:list,bPawns:list)->bool:
                 break
     return res
 
+@functools.lru_cache(maxsize=4096)
+def _decodePawnPositions(key:int)->tuple:
+    """
+    Decodes board key into pawn positions.
+
+    Parameter
+    ---------
+    key : int
+        Board key.
+
+    Returns
+    ---------
+    tuple : (white pawn positions,black pawn positions).
+    """
+    whitePositions = []
+    blackPositions = []
+    for row in range(SIZE):
+        for col in range(SIZE):
+            key, tile = divmod(key,3)
+            if tile == TILE_WHITE:
+                whitePositions.append(POSITIONS[row][col])
+            elif tile == TILE_BLACK:
+                blackPositions.append(POSITIONS[row][col])
+    return (tuple(whitePositions),tuple(blackPositions))
+
 class MovePawnResult(IntEnum):
     """
     To indicate result of pawn movement regarding winner declaration.
@@ -125,18 +241,125 @@ class MovePawnResult(IntEnum):
     BLACK_WIN   = auto()
     INVALID     = auto()
 
+class BoardChange(NamedTuple):
+    """
+    Change of board pawns. Reset changes (resetPawns, setPawnsFromKey or
+    setup from strings) have no positions, captured pawn and result, and
+    mean every tile may have changed.
+    """
+    version : int
+    """Board version after change."""
+    fromPosition : Position
+    """Previous position of moved pawn. None for reset."""
+    toPosition : Position
+    """New position of moved pawn. None for reset."""
+    captured : Pawn
+    """Pawn taken by move. None if no pawn is taken."""
+    result : MovePawnResult
+    """Result of move. None for reset."""
+
+    def isReset(self)->bool:
+        """
+        Checks if change is a reset of every tile.
+        """
+        return self.fromPosition == None
+
+class BoardChangeLog():
+    """
+    Ring buffer of recent board changes. Register as board change
+    listener (see Board.addChangeListener).
+    """
+
+    def __init__(self,capacity:int=256) -> None:
+        """
+        Parameter
+        ---------
+        capacity : int
+            Maximum number of kept changes.
+        """
+        assert type(capacity) == int and capacity > 0
+        self._changes = deque(maxlen=capacity)
+
+    def __call__(self,change:BoardChange)->None:
+        self._changes.append(change)
+
+    def __len__(self)->int:
+        return len(self._changes)
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def getChangesSince(self,version:int)->list:
+        """
+        Gets changes after board version.
+
+        Parameter
+        ---------
+        version : int
+            Last board version seen by consumer.
+
+        Returns
+        ---------
+        list : Changes in order. None if changes after version were
+        dropped from the buffer and consumer must rescan the board.
+        """
+        changes = [change for change in self._changes if change.version > version]
+        if len(changes) > 0 and not changes[0].version == version+1:
+            return None
+        return changes
+
+    def clear(self)->None:
+        """
+        Removes every change.
+        """
+        self._changes.clear()
+
 class Board():
     """
-    Board containing pawns.
+    Board containing pawns.\n
+    Every change of pawns increments the board version (see getVersion).
+    Derived views (tile positions, occupancy, key and symmetry) are computed
+    on first read and kept until the next change.
     """
 
+    __slots__ = ("_whitePawns","_blackPawns","_version",
+                 "_tilePositions","_occupancy","_key","_symmetric","_listeners")
+
     def __init__(self) -> None:
 
         self._whitePawns = []
         self._blackPawns = []
+        self._version = 0
+        self._listeners = None
         
         self.resetPawns()
 
+    def _invalidate(self)->None:
+        """
+        Increments version and drops derived views. Must be called after
+        changing pawns.
+        """
+        self._version += 1
+        self._tilePositions = None
+        self._occupancy = None
+        self._key = None
+        self._symmetric = None
+
+    def _notify(
+            self,
+            fromPosition:Position=None,
+            toPosition:Position=None,
+            captured:Pawn=None,
+            result:MovePawnResult=None)->None:
+        """
+        Sends change to listeners. Reset change if no position is given.
+        """
+        if self._listeners:
+            change = BoardChange(self._version,fromPosition,toPosition,captured,result)
+            for listener in list(self._listeners):
+                listener(change)
+
     def _getPawnInPosition(self,position:Position)->Pawn:
         """
         Gets the pawn in specified position.
@@ -150,13 +373,9 @@ class Board():
         ---------
         Pawn : Pawn in position. None if there is no pawn in position.
         """
-        res = None
-        allPawns = self._whitePawns + self._blackPawns
-        for pawn in allPawns:
-            if pawn.inPosition(position):
-                res = pawn
-                break
-        return res
+        if _checkedMode:
+            assert not position == None and type(position) == Position
+        return self.getTilePositions()[position.row][position.col]
     
     def _isMoveValid(
             self,
@@ -183,8 +402,9 @@ class Board():
         - True  : move is valid
         - False : move is invalid
         """
-        assert not pawn is None
-        assert not newPosition is None
+        if _checkedMode:
+            assert not pawn is None
+            assert not newPosition is None
         res = False
         moveForwardAdjust = -1\
             if pawn.color == Color.WHITE else 1
@@ -216,10 +436,11 @@ class Board():
             forwardInc:int):
         """
         """
-        assert not pawns == None and type(pawns) == list
-        assert type(pawnColor) == Color
-        assert not rowVerifier == None
-        assert type(forwardInc) == int and (forwardInc == 1 or forwardInc == -1)
+        if _checkedMode:
+            assert not pawns == None and type(pawns) == list
+            assert type(pawnColor) == Color
+            assert not rowVerifier == None
+            assert type(forwardInc) == int and (forwardInc == 1 or forwardInc == -1)
         pawnColorToTake = Color.WHITE\
             if pawnColor == Color.BLACK else\
                 Color.BLACK
@@ -228,24 +449,21 @@ class Board():
             pawnPosition = pawn.position
             if rowVerifier(pawnPosition.row):
                 pawnInFront = self._getPawnInPosition(
-                    Position(pawnPosition.row+forwardInc,
-                             pawnPosition.col))
+                    POSITIONS[pawnPosition.row+forwardInc][pawnPosition.col])
                 if pawnInFront == None:
                     # can move forward
                     res = True
                     break
                 if pawnPosition.col > 0 and pawnPosition.col < (SIZE-1):
                     pawnInDiagonalLeft = self._getPawnInPosition(
-                        Position(pawnPosition.row+forwardInc,
-                                pawnPosition.col-1))
+                        POSITIONS[pawnPosition.row+forwardInc][pawnPosition.col-1])
                     if not pawnInDiagonalLeft == None and\
                         pawnInDiagonalLeft.color == pawnColorToTake:
                         # can move diagonal left to take pawn
                         res = True
                         break
                     pawnInDiagonalRight = self._getPawnInPosition(
-                        Position(pawnPosition.row+forwardInc,
-                                pawnPosition.col+1))
+                        POSITIONS[pawnPosition.row+forwardInc][pawnPosition.col+1])
                     if not pawnInDiagonalRight == None and\
                         pawnInDiagonalRight.color == pawnColorToTake:
                         # can move diagonal right to take pawn
@@ -328,25 +546,145 @@ class Board():
     #                          public functions                          #
     ######################################################################
 
+    def getVersion(self)->int:
+        """
+        Gets board version, incremented on every change of pawns.
+
+        Returns
+        ---------
+        int : Board version.
+        """
+        return self._version
+
+    def addChangeListener(self,listener:MethodType)->None:
+        """
+        Registers listener called with BoardChange after every change of
+        pawns.
+
+        Parameter
+        ---------
+        listener : MethodType
+            Callback taking BoardChange, e.g. BoardChangeLog.
+        """
+        assert not listener == None
+        if self._listeners == None:
+            self._listeners = []
+        self._listeners.append(listener)
+
+    def removeChangeListener(self,listener:MethodType)->None:
+        """
+        Unregisters change listener.
+
+        Parameter
+        ---------
+        listener : MethodType
+            Registered callback. Raises ValueError if not registered.
+        """
+        if self._listeners == None or not listener in self._listeners:
+            raise ValueError("Listener is not registered.")
+        self._listeners.remove(listener)
+
     def getTilePositions(self)->list:
         """
-        Retruens a 2D list representing pawn positions.
+        Retruens a 2D list representing pawn positions.\n
+        The list is shared until the next change of pawns and must not be
+        modified.
 
         Returns
         ---------
         list : 2D list of pawns. None value indicates empty tile.
         """
-        allPawns = self._whitePawns + self._blackPawns
-        positions = []
-        for row in range(SIZE):
-            positions.append([None] * SIZE)
-            for col in range(SIZE):
-                pawn = next((x for x in allPawns \
-                             if x.position.row == row and \
-                                x.position.col == col), 
-                             None)
-                positions[row][col] = pawn
-        return positions
+        if self._tilePositions == None:
+            positions = [[None] * SIZE for _ in range(SIZE)]
+            for pawn in self._blackPawns:
+                positions[pawn.position.row][pawn.position.col] = pawn
+            for pawn in self._whitePawns:
+                positions[pawn.position.row][pawn.position.col] = pawn
+            self._tilePositions = positions
+        return self._tilePositions
+
+    def getOccupancy(self)->tuple:
+        """
+        Gets tile contents as key codes (see TILE_EMPTY, TILE_WHITE and
+        TILE_BLACK), tile (row,col) at index row*SIZE+col.
+
+        Returns
+        ---------
+        tuple : Key code of each tile.
+        """
+        if self._occupancy == None:
+            occupancy = [TILE_EMPTY] * (SIZE*SIZE)
+            for pawn in self._blackPawns:
+                occupancy[pawn.position.row*SIZE + pawn.position.col] = TILE_BLACK
+            for pawn in self._whitePawns:
+                occupancy[pawn.position.row*SIZE + pawn.position.col] = TILE_WHITE
+            self._occupancy = tuple(occupancy)
+        return self._occupancy
+
+    def getKey(self)->int:
+        """
+        Encodes pawn positions into an integer key.\n
+        Each tile is a base-3 digit (see TILE_EMPTY, TILE_WHITE and TILE_BLACK)
+        with tile (row,col) at digit row*SIZE+col.
+
+        Returns
+        ---------
+        int : Board key.
+        """
+        if self._key == None:
+            key = 0
+            for pawn in self._whitePawns:
+                key += TILE_WHITE * 3**(pawn.position.row*SIZE+pawn.position.col)
+            for pawn in self._blackPawns:
+                key += TILE_BLACK * 3**(pawn.position.row*SIZE+pawn.position.col)
+            self._key = key
+        return self._key
+
+    def setPawnsFromKey(self,key:int)->None:
+        """
+        Sets pawns from board key (see getKey).
+
+        Parameter
+        ---------
+        key : int
+            Board key.
+        """
+        if _checkedMode:
+            assert type(key) == int and key >= 0 and key < 3**(SIZE*SIZE), "Invalid key."
+        whitePositions, blackPositions = _decodePawnPositions(key)
+        self._whitePawns = [Pawn(Color.WHITE,position) for position in whitePositions]
+        self._blackPawns = [Pawn(Color.BLACK,position) for position in blackPositions]
+        self._invalidate()
+        self._key = key
+        self._notify()
+
+    def getPossibleMoves(self,color:Color)->list:
+        """
+        Gets every valid move of pawns of color.
+
+        Parameter
+        ---------
+        color : Color
+            Color of pawns to move.
+
+        Returns
+        ---------
+        list : List of (pawn,newPosition).
+        """
+        pawns = self._whitePawns if color == Color.WHITE else self._blackPawns
+        forwardInc = -1 if color == Color.WHITE else 1
+        moves = []
+        for pawn in pawns:
+            newRow = pawn.position.row + forwardInc
+            if newRow < 0 or newRow >= SIZE:
+                continue
+            for newCol in range(pawn.position.col-1,pawn.position.col+2):
+                if newCol < 0 or newCol >= SIZE:
+                    continue
+                newPosition = POSITIONS[newRow][newCol]
+                if self._isMoveValid(pawn,newPosition,self._getPawnInPosition(newPosition)):
+                    moves.append((pawn,newPosition))
+        return moves
 
     def movePawn(self,pawn:Pawn,newPosition:Position)->MovePawnResult:
         """
@@ -375,21 +713,25 @@ class Board():
             if not pawnInNewPosition == None:
                 # taking rival pawn
                 if pawn.color == Color.WHITE:
-                    assert pawnInNewPosition.color == Color.BLACK, "Invalid move."
+                    if _checkedMode:
+                        assert pawnInNewPosition.color == Color.BLACK, "Invalid move."
                     # delete pawn
                     self._blackPawns = [x for x in self._blackPawns\
                                         if not x.inPosition(newPosition)]
                 else:
-                    assert pawnInNewPosition.color == Color.WHITE, "Invalid move."
+                    if _checkedMode:
+                        assert pawnInNewPosition.color == Color.WHITE, "Invalid move."
                     # delete pawn
                     self._whitePawns = [x for x in self._whitePawns\
                                         if not x.inPosition(newPosition)]
             
-            pawn.position.row = newPosition.row
-            pawn.position.col = newPosition.col
+            fromPosition = pawn.position
+            pawn.position = newPosition
+            self._invalidate()
 
             # check for winning
             res = self._checkForWinner(pawn)
+            self._notify(fromPosition,newPosition,pawnInNewPosition,res)
         return res
 
     def arePawnPositionsSymmetric(self)->bool:
@@ -401,25 +743,11 @@ class Board():
         True - Symmetric.
         False - Not symmetric.
         """
-        res = True
-        tilePositions = self.getTilePositions()
-        r = math.floor(SIZE/2)
-        for row in range(SIZE):
-            if not res:
-                break
-            for col in range(r):
-                reversedCol = (SIZE-1)-col
-                pawnA = tilePositions[row][col]
-                pawnB = tilePositions[row][reversedCol]
-                if ( not pawnA == None and pawnB == None) or\
-                    ( pawnA == None and not pawnB == None):
-                    res = False
-                elif not pawnA == None and not pawnB == None:
-                    if not (pawnA.color == pawnB.color):
-                        res = False
-                if not res:
-                    break
-        return res
+        if self._symmetric == None:
+            occupancy = self.getOccupancy()
+            self._symmetric = all(occupancy[row*SIZE:(row+1)*SIZE] == occupancy[row*SIZE:(row+1)*SIZE][::-1]\
+                                  for row in range(SIZE))
+        return self._symmetric
 
     def resetPawns(self)->None:
         """
@@ -435,6 +763,8 @@ class Board():
             Pawn(Color.BLACK,Position(0,1)),
             Pawn(Color.BLACK,Position(0,2))
         ]
+        self._invalidate()
+        self._notify()
 
 def areBoardsEqual(boardA:Board,boardB:Board)->bool:
     """
@@ -450,7 +780,7 @@ def areBoardsEqual(boardA:Board,boardB:Board)->bool:
     True - Boards are equal.
     False - Boards are not equal.
     """
-    assert not boardA == None and isinstance(boardA,Board)
-    assert not boardB == None and isinstance(boardB,Board)
-    return arePawnsEqual(boardA._whitePawns,boardB._whitePawns) and\
-        arePawnsEqual(boardA._blackPawns,boardB._blackPawns)
+    if _checkedMode:
+        assert not boardA == None and isinstance(boardA,Board)
+        assert not boardB == None and isinstance(boardB,Board)
+    return boardA.getKey() == boardB.getKey()
@@ -0,0 +1,305 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for box browser of boxes panel.
+
+        Boxes are listed by a model over the computer boxes and painted by
+        a delegate through DrawUtil.drawBoxItem, so only visible boxes are
+        drawn and no widget is created per box. While another thread trains
+        the computer, removed moves are painted from a snapshot of removed
+        move masks (see Computer.getRemovedMasks) instead of live boxes.
+
+###############################################################################
+"""
+from PyQt5 import QtCore, QtWidgets
+from PyQt5.QtCore import Qt, QModelIndex
+
+from hexapawn.computer import *
+from hexapawn.draw_util import *
+
+BOX_ROLE = Qt.UserRole
+"""Item data role of box."""
+
+REMOVED_MASK_ROLE = Qt.UserRole + 1
+"""Item data role of removed move mask of box. See Box.getRemovedMask."""
+
+ALL_TURNS_TEXT = "All"
+"""Turn filter text for every turn."""
+
+class BoxListModel(QtCore.QAbstractListModel):
+    """
+    List model of computer boxes filtered by turn and ID, ordered by turn.
+    """
+
+    def __init__(self,computer:Computer,parent:QtCore.QObject=None) -> None:
+        """
+        Parameter
+        ---------
+        computer : Computer
+            Computer of boxes.
+        parent : QtCore.QObject
+            Parent object.
+        """
+        super().__init__(parent)
+        self._computer = None
+        self._boxes = []
+        self._boxCount = 0
+        self._rows = []
+        self._turn = None
+        self._idFilter = ""
+        self._learningVersion = None
+        self._removedMasks = None
+        self.setComputer(computer)
+
+    def _applyFilter(self)->None:
+        """
+        Rebuilds rows of box indexes from boxes and filters.
+        """
+        self.beginResetModel()
+        idFilter = self._idFilter.lower()
+        boxes = self._boxes
+        self._rows = sorted(
+            (index for index, box in enumerate(boxes)\
+                if (self._turn == None or box.turn == self._turn) and\
+                    idFilter in box.id.lower()),
+            key=lambda index: boxes[index].turn)
+        self._boxCount = len(self._boxes)
+        self._learningVersion = self._computer.getLearningVersion()
+        self.endResetModel()
+
+    def rowCount(self,parent:QModelIndex=QModelIndex())->int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self,index:QModelIndex,role:int=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        boxIndex = self._rows[index.row()]
+        box = self._boxes[boxIndex]
+        if role == Qt.DisplayRole:
+            return box.id
+        if role == Qt.ToolTipRole:
+            return "Turn {} : {}".format(box.turn,box.id)
+        if role == BOX_ROLE:
+            return box
+        if role == REMOVED_MASK_ROLE:
+            if not self._removedMasks == None and boxIndex < len(self._removedMasks):
+                return self._removedMasks[boxIndex]
+            return box.getRemovedMask()
+        return None
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def setComputer(self,computer:Computer)->None:
+        """
+        Sets computer of boxes.
+
+        Parameter
+        ---------
+        computer : Computer
+            Computer of boxes.
+        """
+        assert not computer == None
+        self._computer = computer
+        self._boxes = computer._boxes
+        self._removedMasks = None
+        self._applyFilter()
+
+    def getTurns(self)->list:
+        """
+        Gets turns having boxes.
+
+        Returns
+        ---------
+        list : Sorted turns.
+        """
+        return sorted({ box.turn for box in self._boxes })
+
+    def setTurnFilter(self,turn:int)->None:
+        """
+        Sets turn of listed boxes.
+
+        Parameter
+        ---------
+        turn : int
+            Turn. None for every turn.
+        """
+        if not self._turn == turn:
+            self._turn = turn
+            self._applyFilter()
+
+    def setIdFilter(self,text:str)->None:
+        """
+        Sets text listed box IDs must contain, ignoring case.
+
+        Parameter
+        ---------
+        text : str
+            Text to search. Empty for every box.
+        """
+        if not self._idFilter == text:
+            self._idFilter = text
+            self._applyFilter()
+
+    def getBox(self,row:int)->Box:
+        """
+        Gets listed box.
+
+        Parameter
+        ---------
+        row : int
+            Row of box.
+
+        Returns
+        ---------
+        Box : Box in row.
+        """
+        return self._boxes[self._rows[row]]
+
+    def refresh(self,removedMasks:tuple=None)->None:
+        """
+        Notifies views of learning since last refresh. Views repaint only
+        visible boxes. Rows are rebuilt if boxes were added.
+
+        Parameter
+        ---------
+        removedMasks : tuple
+            Snapshot of removed moves to paint, see Computer.getRemovedMasks.
+            None to paint removed moves of boxes, only when no other thread
+            changes them.
+        """
+        if not self._boxCount == len(self._boxes):
+            self._removedMasks = removedMasks
+            self._applyFilter()
+            return
+        if removedMasks == None:
+            learningVersion = self._computer.getLearningVersion()
+            changed = not (self._learningVersion == learningVersion and self._removedMasks == None)
+            self._learningVersion = learningVersion
+        else:
+            changed = not self._removedMasks == removedMasks
+            # repaint from live boxes once snapshots end
+            self._learningVersion = None
+        self._removedMasks = removedMasks
+        if changed:
+            if len(self._rows) > 0:
+                self.dataChanged.emit(
+                    self.index(0),
+                    self.index(len(self._rows)-1))
+
+class BoxDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints box items of BoxListModel. See DrawUtil.drawBoxItem.
+    """
+
+    def sizeHint(self,option:QtWidgets.QStyleOptionViewItem,index:QModelIndex)->QSize:
+        return BOX_ITEM_SIZE
+
+    def paint(self,painter:QPainter,option:QtWidgets.QStyleOptionViewItem,index:QModelIndex)->None:
+        box = index.data(BOX_ROLE)
+        if not box == None:
+            selected = bool(option.state & QtWidgets.QStyle.State_Selected)
+            DrawUtil.drawBoxItem(painter,option.rect,box,selected,index.data(REMOVED_MASK_ROLE))
+
+class BoxBrowser(QtWidgets.QWidget):
+    """
+    Boxes panel with turn filter and ID search over a list view painting
+    only visible boxes.
+    """
+
+    def __init__(self,computer:Computer,parent:QtWidgets.QWidget=None) -> None:
+        """
+        Parameter
+        ---------
+        computer : Computer
+            Computer of boxes.
+        parent : QtWidgets.QWidget
+            Parent widget.
+        """
+        super().__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+
+        # filters
+        filterLayout = QtWidgets.QHBoxLayout()
+        self._cmbTurn = QtWidgets.QComboBox()
+        self._txtId = QtWidgets.QLineEdit()
+        self._txtId.setPlaceholderText("Search ID")
+        self._txtId.setClearButtonEnabled(True)
+        filterLayout.addWidget(QtWidgets.QLabel("Turn"))
+        filterLayout.addWidget(self._cmbTurn)
+        filterLayout.addWidget(self._txtId)
+        filterLayout.addStretch()
+        layout.addLayout(filterLayout)
+
+        # boxes
+        self.model = BoxListModel(computer,self)
+        """Model of listed boxes."""
+        self._listBoxes = QtWidgets.QListView()
+        self._listBoxes.setModel(self.model)
+        self._listBoxes.setItemDelegate(BoxDelegate(self._listBoxes))
+        self._listBoxes.setViewMode(QtWidgets.QListView.IconMode)
+        self._listBoxes.setMovement(QtWidgets.QListView.Static)
+        self._listBoxes.setResizeMode(QtWidgets.QListView.Adjust)
+        self._listBoxes.setUniformItemSizes(True)
+        self._listBoxes.setLayoutMode(QtWidgets.QListView.Batched)
+        self._listBoxes.setSpacing(2)
+        layout.addWidget(self._listBoxes)
+
+        self._fillTurns()
+        self._cmbTurn.currentIndexChanged.connect(self._turnSelected)
+        self._txtId.textChanged.connect(self.model.setIdFilter)
+
+    def _fillTurns(self)->None:
+        """
+        Fills turn filter from boxes.
+        """
+        self._cmbTurn.blockSignals(True)
+        self._cmbTurn.clear()
+        self._cmbTurn.addItem(ALL_TURNS_TEXT,None)
+        for turn in self.model.getTurns():
+            self._cmbTurn.addItem(str(turn),turn)
+        self._cmbTurn.blockSignals(False)
+
+    def _turnSelected(self,index:int)->None:
+        """
+        Callback when turn filter is selected.
+
+        Parameter
+        ---------
+        index : int
+            Index of selected turn.
+        """
+        self.model.setTurnFilter(self._cmbTurn.itemData(index))
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def setComputer(self,computer:Computer)->None:
+        """
+        Sets computer of boxes and clears turn filter.
+
+        Parameter
+        ---------
+        computer : Computer
+            Computer of boxes.
+        """
+        self.model.setTurnFilter(None)
+        self.model.setComputer(computer)
+        self._fillTurns()
+
+    def refresh(self,removedMasks:tuple=None)->None:
+        """
+        Repaints visible boxes if computer learned since last refresh.
+
+        Parameter
+        ---------
+        removedMasks : tuple
+            Snapshot of removed moves to paint. See BoxListModel.refresh.
+        """
+        self.model.refresh(removedMasks)
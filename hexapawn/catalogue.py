@@ -0,0 +1,307 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for external box catalogue files.
+
+        A catalogue file has one box record per line. Empty lines and lines
+        starting with "#" are ignored. A record is:
+
+            <id> <turn> <tiles> <moves>
+
+        id      : Box ID without spaces.
+        turn    : Black turn number. Must be even.
+        tiles   : SIZE*SIZE tiles in row order, "B" for black pawn, "W" for
+                  white pawn and "-" for empty tile.
+        moves   : Comma separated moves <row><col><movement><color>[=weight]
+                  where movement is F (forward), R (diagonal right) or L
+                  (diagonal left), color is G, R, B or Y (see MoveColor) and
+                  weight is the relative selection weight, 1 if omitted.
+
+        Sample:
+            2A 2 BBBW---WW 01LG,01FR,02FB
+
+        Records are validated on tile strings and move code tables without
+        building boards, and boxes are yielded while the file is read so
+        the lookup index of Computer is built incrementally.
+
+###############################################################################
+"""
+import functools
+import re
+
+from hexapawn.board import *
+from hexapawn.computer import *
+from hexapawn.enumeration import enumeratePositions
+
+RECORD_REGEX = re.compile(
+    r"^(\S+) +(\d+) +([BW-]{%d}) +((?:\d\d[FRL][GRBY](?:=[0-9.eE+-]+)?,)*\d\d[FRL][GRBY](?:=[0-9.eE+-]+)?)\s*$"
+    % (SIZE*SIZE))
+"""Regex to verify catalogue record."""
+
+MOVEMENT_LETTERS = {
+    "F" : Movement.FORWARD,
+    "R" : Movement.DIAGONAL_RIGHT,
+    "L" : Movement.DIAGONAL_LEFT,
+}
+"""Movements by record letter."""
+
+COLOR_LETTERS = {
+    "G" : MoveColor.GREEN,
+    "R" : MoveColor.RED,
+    "B" : MoveColor.BLUE,
+    "Y" : MoveColor.YELLOW,
+}
+"""Move colors by record letter."""
+
+_TILE_DIGITS = str.maketrans({ "-" : str(TILE_EMPTY), "W" : str(TILE_WHITE), "B" : str(TILE_BLACK) })
+"""Translation of tile letters into board key digits."""
+
+def _buildMoveTokenTable()->dict:
+    """
+    Builds lookup table of move tokens without weight.
+
+    Returns
+    ---------
+    dict : (move code,color,tile index of pawn,tile index of new position,
+    required tile letter in new position) by token.
+    """
+    table = {}
+    for row in range(SIZE):
+        for col in range(SIZE):
+            for movementLetter, movement in MOVEMENT_LETTERS.items():
+                code = getMoveCode(POSITIONS[row][col],movement)
+                newPosition = MOVE_TO[code]
+                if newPosition == None:
+                    continue
+                for colorLetter, color in COLOR_LETTERS.items():
+                    token = "{}{}{}{}".format(row,col,movementLetter,colorLetter)
+                    table[token] = (
+                        code,
+                        color,
+                        row*SIZE + col,
+                        newPosition.row*SIZE + newPosition.col,
+                        "-" if movement == Movement.FORWARD else "W")
+    return table
+
+_MOVE_TOKENS = _buildMoveTokenTable()
+"""Valid move tokens. See _buildMoveTokenTable."""
+
+def getTilesKey(tiles:str)->int:
+    """
+    Gets board key of record tiles (see Board.getKey).
+
+    Parameter
+    ---------
+    tiles : str
+        Record tiles.
+
+    Returns
+    ---------
+    int : Board key.
+    """
+    # tile (row,col) is digit row*SIZE+col, least significant first
+    return int(tiles.translate(_TILE_DIGITS)[::-1],3)
+
+def _parseWeight(token:str)->float:
+    """
+    Parses weight of move token.
+
+    Parameter
+    ---------
+    token : str
+        Move token with weight.
+
+    Returns
+    ---------
+    float : Weight.
+    """
+    try:
+        weight = float(token[5:])
+    except ValueError:
+        raise ValueError("Invalid weight: {}.".format(token))
+    if not (weight >= 0 and weight < float("inf")):
+        raise ValueError("Invalid weight: {}.".format(token))
+    return weight
+
+@functools.lru_cache(maxsize=65536)
+def _parsePosition(tiles:str,moveTokens:str)->tuple:
+    """
+    Parses and validates moves of record position. Cached since a
+    catalogue repeats positions over turns.
+
+    Parameter
+    ---------
+    tiles : str
+        Record tiles.
+    moveTokens : str
+        Record moves.
+
+    Returns
+    ---------
+    tuple : (key,moves) where moves is a tuple of (move code,color,weight).
+    """
+    moves = []
+    for token in moveTokens.split(","):
+        entry = _MOVE_TOKENS.get(token[:4])
+        if entry == None:
+            raise ValueError("Results to outside board: {}.".format(token))
+        code, color, fromIndex, toIndex, required = entry
+        if not tiles[fromIndex] == "B":
+            raise ValueError("No black pawn to move: {}.".format(token))
+        if not tiles[toIndex] == required:
+            raise ValueError("Invalid movement: {}.".format(token))
+        moves.append((code,color,1.0 if len(token) == 4 else _parseWeight(token)))
+    if len({ move[0] for move in moves }) < len(moves):
+        raise ValueError("Duplicate move.")
+    return (getTilesKey(tiles),tuple(moves))
+
+def _parseRecord(line:str)->tuple:
+    """
+    Parses and validates catalogue record.
+
+    Parameter
+    ---------
+    line : str
+        Record line.
+
+    Returns
+    ---------
+    tuple : (id,turn,key,moves).
+    """
+    match = RECORD_REGEX.match(line)
+    if match == None:
+        raise ValueError("Invalid record.")
+    id, turn, tiles, moveTokens = match.groups()
+    turn = int(turn)
+    if turn <= 0 or not turn%2 == 0:
+        raise ValueError("Turn must be even.")
+    key, moves = _parsePosition(tiles,moveTokens)
+    return (id,turn,key,[Move._fromCode(code,color,weight) for code, color, weight in moves])
+
+######################################################################
+#                          public functions                          #
+######################################################################
+
+def loadCatalogue(path:str):
+    """
+    Yields validated boxes of catalogue file while reading it.
+
+    Parameter
+    ---------
+    path : str
+        Catalogue file path.
+
+    Returns
+    ---------
+    Generator of Box. Raises ValueError with file position on first invalid
+    record.
+    """
+    ids = set()
+    with open(path,"r") as f:
+        for lineNumber, line in enumerate(f,1):
+            if len(line) == 0 or line[0] == "#" or line.isspace():
+                continue
+            try:
+                id, turn, key, moves = _parseRecord(line)
+                if id in ids:
+                    raise ValueError("Duplicate box ID.")
+            except ValueError as err:
+                raise ValueError("{}:{}: {}".format(path,lineNumber,err)) from None
+            ids.add(id)
+            yield Box._fromCache(id,turn,key,moves)
+
+def formatRecord(box:Box)->str:
+    """
+    Formats box as catalogue record.
+
+    Parameter
+    ---------
+    box : Box
+        Box.
+
+    Returns
+    ---------
+    str : Record without line end.
+    """
+    tiles = ["-"] * (SIZE*SIZE)
+    for row in range(SIZE):
+        for col in range(SIZE):
+            pawn = box._getPawnInPosition(POSITIONS[row][col])
+            if not pawn == None:
+                tiles[row*SIZE+col] = "W" if pawn.color == Color.WHITE else "B"
+    movementLetters = { v : k for k, v in MOVEMENT_LETTERS.items() }
+    colorLetters = { v : k for k, v in COLOR_LETTERS.items() }
+    moves = []
+    for move in box.moves:
+        token = "{}{}{}{}".format(
+            move.position.row,move.position.col,
+            movementLetters[move.movement],colorLetters[move.color])
+        if not move.weight == 1.0:
+            token += "={!r}".format(move.weight)
+        moves.append(token)
+    return "{} {} {} {}".format(box.id,box.turn,"".join(tiles),",".join(moves))
+
+def saveCatalogue(boxes,path:str)->None:
+    """
+    Saves boxes to catalogue file.
+
+    Parameter
+    ---------
+    boxes : Any
+        Iterable of boxes.
+    path : str
+        Catalogue file path.
+    """
+    with open(path,"w") as f:
+        for box in boxes:
+            f.write(formatRecord(box))
+            f.write("\n")
+
+def generateCatalogue(path:str)->int:
+    """
+    Generates catalogue file of every reachable black turn position with
+    every valid black move.
+
+    Parameter
+    ---------
+    path : str
+        Catalogue file path.
+
+    Returns
+    ---------
+    int : Number of boxes.
+    """
+    colors = list(COLOR_LETTERS.keys())
+    movementLetters = { v : k for k, v in MOVEMENT_LETTERS.items() }
+    count = 0
+    boxNumber = 0
+    lastTurn = 0
+    with open(path,"w") as f:
+        f.write("# generated hexapawn box catalogue\n")
+        for turn, key in enumeratePositions():
+            if not turn%2 == 0:
+                continue
+            if not turn == lastTurn:
+                lastTurn = turn
+                boxNumber = 0
+            tiles = []
+            for _ in range(SIZE*SIZE):
+                key, tile = divmod(key,3)
+                tiles.append("-" if tile == TILE_EMPTY else ("W" if tile == TILE_WHITE else "B"))
+            tiles = "".join(tiles)
+            moves = []
+            for token, entry in _MOVE_TOKENS.items():
+                code, color, fromIndex, toIndex, required = entry
+                if token[3] == colors[0] and tiles[fromIndex] == "B" and tiles[toIndex] == required:
+                    moves.append("{}{}{}{}".format(
+                        token[0],token[1],
+                        movementLetters[MOVE_MOVEMENT[code]],
+                        colors[len(moves)%len(colors)]))
+            boxNumber += 1
+            f.write("{}-{} {} {} {}\n".format(turn,boxNumber,turn,tiles,",".join(moves)))
+            count += 1
+    return count
@@ -1,7 +1,12 @@
 from enum import Enum, IntEnum, auto
+import hashlib
+import json
+import os
 import re
+from typing import NamedTuple
 from PyQt5 import QtGui
 from hexapawn.board import *
+from hexapawn.sampling import MoveSampler, NO_MOVE
 
 class MoveColor(Enum):
     """
@@ -20,24 +25,69 @@ class Movement(IntEnum):
     DIAGONAL_RIGHT  = auto()
     DIAGONAL_LEFT   = auto()
 
-class Move():
+MOVEMENT_OFFSETS = {
+    Movement.FORWARD        : (1,0),
+    Movement.DIAGONAL_RIGHT : (1,1),
+    Movement.DIAGONAL_LEFT  : (1,-1),
+}
+"""Row and column offset of black pawn for each movement."""
+
+MOVE_CODE_COUNT = SIZE * SIZE * len(Movement)
+"""Number of move codes. Move code is (row*SIZE+col)*len(Movement)+(movement-1)."""
+
+def getMoveCode(position:Position,movement:Movement)->int:
     """
-    Move.
+    Encodes black pawn position and movement into move code.
+
+    Parameter
+    ---------
+    position : Position
+        Position of black pawn to move.
+    movement : Movement
+        Movement type.
+
+    Returns
+    ---------
+    int : Move code.
     """
+    return (position.row*SIZE + position.col)*len(Movement) + (movement-1)
 
-    position = None
-    """Position of black pawn to move."""
+def _buildMoveTables()->tuple:
+    """
+    Builds move code lookup tables.
+
+    Returns
+    ---------
+    tuple : (from positions,movements,new positions) by move code.
+    """
+    moveFrom = [None] * MOVE_CODE_COUNT
+    moveMovement = [None] * MOVE_CODE_COUNT
+    moveTo = [None] * MOVE_CODE_COUNT
+    for row in range(SIZE):
+        for col in range(SIZE):
+            position = POSITIONS[row][col]
+            for movement in Movement:
+                code = getMoveCode(position,movement)
+                newRow = row + MOVEMENT_OFFSETS[movement][0]
+                newCol = col + MOVEMENT_OFFSETS[movement][1]
+                moveFrom[code] = position
+                moveMovement[code] = movement
+                if newRow < SIZE and newCol >= 0 and newCol < SIZE:
+                    moveTo[code] = POSITIONS[newRow][newCol]
+    return (moveFrom,moveMovement,moveTo)
 
-    color = None
-    """Movement color."""
+MOVE_FROM, MOVE_MOVEMENT, MOVE_TO = _buildMoveTables()
+"""Position of pawn to move, movement and new position (None if outside
+board) by move code."""
 
-    movement = None
-    """Movement type : forward, diagonal left or diagonal right."""
+class Move():
+    """
+    Move.
+    """
 
-    removed = False
-    """Remove if resulted to lose."""
+    __slots__ = ("position","color","movement","removed","weight","code")
 
-    def __init__(self,position:Position,color:MoveColor,movement:Movement) -> None:
+    def __init__(self,position:Position,color:MoveColor,movement:Movement,weight:float=1.0) -> None:
         """
         Parameter
         ---------
@@ -47,13 +97,26 @@ class Move():
             Movement color.
         movement : Movement
             Movement type : forward, diagonal left or diagonal right.
+        weight : float
+            Relative weight for random selection.
         """
-        assert type(position) == Position and not position == None
-        assert type(color) == MoveColor and not color == None
-        assert type(movement) == Movement and not movement == None
+        if isCheckedMode():
+            assert type(position) == Position and not position == None
+            assert type(color) == MoveColor and not color == None
+            assert type(movement) == Movement and not movement == None
+            assert weight >= 0
         self.position = position
+        """Position of black pawn to move."""
         self.color = color
+        """Movement color."""
         self.movement = movement
+        """Movement type : forward, diagonal left or diagonal right."""
+        self.removed = False
+        """Remove if resulted to lose."""
+        self.weight = weight
+        """Relative weight for random selection."""
+        self.code = getMoveCode(position,movement)
+        """Move code. See getMoveCode."""
 
     ######################################################################
     #                          public functions                          #
@@ -61,30 +124,47 @@ class Move():
 
     def newPosition(self)->Position:
         """
-        Calculates new position based on current position and movement type.
+        Gets new position based on current position and movement type.
 
         Returns
         ---------
         Position : New position.
         """
-        newRow = self.position.row
-        newCol = self.position.col
-        if self.movement == Movement.FORWARD:
-            newRow+=1
-        elif self.movement == Movement.DIAGONAL_LEFT:
-            newRow+=1
-            newCol-=1
-        elif self.movement == Movement.DIAGONAL_RIGHT:
-            newRow+=1
-            newCol+=1
-        return Position(newRow,newCol)
+        newPosition = MOVE_TO[self.code]
+        if isCheckedMode():
+            assert not newPosition == None, "Results to outside board."
+        return newPosition
     
     def remove(self)->None:
         """
-        Reset move.
+        Remove move.
         """
         self.removed = True
 
+    @staticmethod
+    def _fromCode(code:int,color:MoveColor,weight:float)->"Move":
+        """
+        Creates move from already validated move code without checks.
+        """
+        move = Move.__new__(Move)
+        move.position = MOVE_FROM[code]
+        move.color = color
+        move.movement = MOVE_MOVEMENT[code]
+        move.removed = False
+        move.weight = weight
+        move.code = code
+        return move
+
+    def getSelectionWeight(self)->float:
+        """
+        Gets weight for random selection.
+
+        Returns
+        ---------
+        float : Weight. 0 if move is removed.
+        """
+        return 0.0 if self.removed else self.weight
+
     def reset(self):
         """
         Reset move.
@@ -129,16 +209,84 @@ class Box(Board):
             Moves for black player.
         """
         super().__init__()
-        assert len(id) > 0
-        assert type(turn) == int and turn > 0 and turn%2 == 0
-        assert all(type(move)==Move for move in moves)
+        checked = isCheckedMode()
+        if checked:
+            assert len(id) > 0
+            assert type(turn) == int and turn > 0 and turn%2 == 0
+            assert all(type(move)==Move for move in moves)
         Box._setPawnsFromStringSetup(self,setup)
         self.id = id
         self.turn = turn
-        for move in moves:
-            self._assertMove(move)
+        if checked:
+            for move in moves:
+                self._assertMove(move)
         self.moves = moves
+        self._moveSlots = { (move.position,move.newPosition()) : slot\
+                            for slot, move in enumerate(moves) }
         
+    @staticmethod
+    def _fromCache(id:str,turn:int,key:int,moves:list)->"Box":
+        """
+        Creates box from already validated catalogue record without checks.
+        Pawns are created from key on first access.
+
+        Parameter
+        ---------
+        id : str
+            ID of box.
+        turn : int
+            Turn number.
+        key : int
+            Board key of pawn positions.
+        moves : list
+            Moves for black player.
+        """
+        box = Box.__new__(Box)
+        box._version = 0
+        box._listeners = None
+        box._invalidate()
+        box._key = key
+        box._pendingKey = key
+        box.id = id
+        box.turn = turn
+        box.moves = moves
+        box._moveSlots = { (move.position,MOVE_TO[move.code]) : slot\
+                           for slot, move in enumerate(moves) }
+        return box
+
+    def _ensurePawns(self)->None:
+        """
+        Creates pawns of box from _fromCache from its key on first access.
+        Must be called before reading pawns. The board key is kept by
+        _fromCache, so getKey does not need pawns.
+        """
+        if not self._pendingKey == None:
+            self.setPawnsFromKey(self._pendingKey)
+
+    def getTilePositions(self)->list:
+        self._ensurePawns()
+        return super().getTilePositions()
+
+    def getOccupancy(self)->tuple:
+        self._ensurePawns()
+        return super().getOccupancy()
+
+    def getPossibleMoves(self,color:Color)->list:
+        self._ensurePawns()
+        return super().getPossibleMoves(color)
+
+    def movePawn(self,pawn:Pawn,newPosition:Position)->MovePawnResult:
+        self._ensurePawns()
+        return super().movePawn(pawn,newPosition)
+
+    def setPawnsFromKey(self,key:int)->None:
+        self._pendingKey = None
+        super().setPawnsFromKey(key)
+
+    def resetPawns(self)->None:
+        self._pendingKey = None
+        super().resetPawns()
+
     @staticmethod
     def _setPawnsFromStringSetup(board:Board,setup:list)->None:
         """
@@ -158,9 +306,11 @@ class Box(Board):
             [ "B B B", "- - -", "W W W" ] indicates first row of black pawns; second row of empty tiles, and third row of white pawns.\n
             The setup list must be in correct format.
         """
-        assert type(setup) == list
-        assert len(setup) == SIZE
-        assert all(type(s) == str and re.match(Box.BOARD_ROW_SETTING_REGEX,s) for s in setup)
+        checked = isCheckedMode()
+        if checked:
+            assert type(setup) == list
+            assert len(setup) == SIZE
+            assert all(type(s) == str and re.match(Box.BOARD_ROW_SETTING_REGEX,s) for s in setup)
         board._blackPawns = []
         board._whitePawns = []
         for row in range(SIZE):
@@ -168,11 +318,14 @@ class Box(Board):
             for col in range(len(tokens)):
                 char = tokens[col]
                 if char == "B":
-                    board._blackPawns.append(Pawn(Color.BLACK,Position(row,col)))
+                    board._blackPawns.append(Pawn(Color.BLACK,POSITIONS[row][col]))
                 elif char == "W":
-                    board._whitePawns.append(Pawn(Color.WHITE,Position(row,col)))
-        assert len(board._blackPawns) <= SIZE
-        assert len(board._whitePawns) <= SIZE
+                    board._whitePawns.append(Pawn(Color.WHITE,POSITIONS[row][col]))
+        if checked:
+            assert len(board._blackPawns) <= SIZE
+            assert len(board._whitePawns) <= SIZE
+        board._invalidate()
+        board._notify()
 
     @staticmethod
     def _createAssertMoveError(description:str,turn:int,move:Move)->str:
@@ -215,19 +368,19 @@ class Box(Board):
         assert blackPawn.position.row < (SIZE-1),\
             Box._createAssertMoveError("Results to outside board.",self.turn,move)
         if movement == Movement.FORWARD:
-            pawnInFront = self._getPawnInPosition(Position(position.row+1,position.col))
+            pawnInFront = self._getPawnInPosition(POSITIONS[position.row+1][position.col])
             assert pawnInFront == None,\
             Box._createAssertMoveError("Expecting empty tile in front.",self.turn,move)
         elif movement == Movement.DIAGONAL_LEFT:
             assert position.col > 0,\
             Box._createAssertMoveError("Results to outside board.",self.turn,move)
-            pawnInLowerLeft = self._getPawnInPosition(Position(position.row+1,position.col-1))
+            pawnInLowerLeft = self._getPawnInPosition(POSITIONS[position.row+1][position.col-1])
             assert not pawnInLowerLeft == None and pawnInLowerLeft.color == Color.WHITE,\
                 Box._createAssertMoveError("Expecting to take white pawn.",self.turn,move)
         elif movement == Movement.DIAGONAL_RIGHT:
             assert position.col < (SIZE-1),\
             Box._createAssertMoveError("Results to outside board.",self.turn,move)
-            pawnInLowerRight = self._getPawnInPosition(Position(position.row+1,position.col+1))
+            pawnInLowerRight = self._getPawnInPosition(POSITIONS[position.row+1][position.col+1])
             assert not pawnInLowerRight == None and pawnInLowerRight.color == Color.WHITE,\
                 Box._createAssertMoveError("Expecting to take white pawn.",self.turn,move)
 
@@ -235,6 +388,38 @@ class Box(Board):
     #                          public functions                          #
     ######################################################################
 
+    def findMove(self,position:Position,newPosition:Position)->Move:
+        """
+        Finds move of box moving black pawn between positions.
+
+        Parameter
+        ---------
+        position : Position
+            Position of black pawn to move.
+        newPosition : Position
+            New position of moved pawn.
+
+        Returns
+        ---------
+        Move : Move. None if box has no such move.
+        """
+        slot = self._moveSlots.get((position,newPosition))
+        return None if slot == None else self.moves[slot]
+
+    def getRemovedMask(self)->int:
+        """
+        Gets bit mask of removed moves, bit i for move i.
+
+        Returns
+        ---------
+        int : Removed move mask. 0 if no move is removed.
+        """
+        mask = 0
+        for slot, move in enumerate(self.moves):
+            if move.removed:
+                mask |= 1 << slot
+        return mask
+
     def reset(self):
         """
         Resets box.
@@ -247,12 +432,8 @@ class MoveRecord():
     Move record.
     """
 
-    box = None
-    """Box containing the move."""
+    __slots__ = ("box","move")
 
-    move = None
-    """Move executed."""
-    
     def __init__(self,box:Box,move:Move) -> None:
         """
         Parameter
@@ -262,10 +443,68 @@ class MoveRecord():
         move : Move
             Move executed.
         """
-        assert not box == None and type(box) == Box
-        assert not move == None and type(move) == Move
+        if isCheckedMode():
+            assert not box == None and type(box) == Box
+            assert not move == None and type(move) == Move
         self.box = box
+        """Box containing the move."""
         self.move = move
+        """Move executed."""
+
+class MoveDefinition(NamedTuple):
+    """
+    Source definition of box move. See Move.
+    """
+    position : Position
+    color : MoveColor
+    movement : Movement
+    weight : float = 1.0
+
+class BoxDefinition(NamedTuple):
+    """
+    Source definition of box. See Box.
+    """
+    id : str
+    turn : int
+    setup : list
+    moves : list
+
+CATALOGUE_CACHE_VERSION = 1
+"""Version of catalogue cache file format."""
+
+DEFAULT_CATALOGUE_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"),".cache","pyhexapawn","catalogue.json")
+"""Default catalogue cache file path."""
+
+def getCatalogueHash(definitions:list)->str:
+    """
+    Gets hash of box definitions used to key catalogue cache.
+
+    Parameter
+    ---------
+    definitions : list
+        Box definitions.
+
+    Returns
+    ---------
+    str : Hex digest.
+    """
+    source = [
+        [d.id,d.turn,list(d.setup),
+            [[m.position.row,m.position.col,m.color.name,m.movement.name,m.weight]\
+                for m in d.moves]]
+        for d in definitions]
+    return hashlib.sha256(json.dumps([CATALOGUE_CACHE_VERSION,SIZE,source]).encode()).hexdigest()
+
+class _MissingBox():
+    """
+    Sentinel type of MISSING_BOX.
+    """
+    def __repr__(self) -> str:
+        return "MISSING_BOX"
+
+MISSING_BOX = _MissingBox()
+"""Chosen move for board without box for turn."""
 
 class Computer():
     """
@@ -273,8 +512,8 @@ class Computer():
     pawn positions in board.
     """
     
-    _boxes = [
-        Box(
+    _boxDefinitions = [
+        BoxDefinition(
             "2A", 2,
             [
                 "B B B",
@@ -282,12 +521,12 @@ class Computer():
                 "- W W"
             ],
             [
-                Move(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
-                Move(Position(0,1),MoveColor.RED,Movement.FORWARD),
-                Move(Position(0,2),MoveColor.BLUE,Movement.FORWARD)
+                MoveDefinition(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(0,1),MoveColor.RED,Movement.FORWARD),
+                MoveDefinition(Position(0,2),MoveColor.BLUE,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "2B", 2,
             [
                 "B B B",
@@ -295,11 +534,11 @@ class Computer():
                 "W - W"
             ],
             [
-                Move(Position(0,0),MoveColor.GREEN,Movement.FORWARD),
-                Move(Position(0,0),MoveColor.RED,Movement.DIAGONAL_RIGHT)
+                MoveDefinition(Position(0,0),MoveColor.GREEN,Movement.FORWARD),
+                MoveDefinition(Position(0,0),MoveColor.RED,Movement.DIAGONAL_RIGHT)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4A", 4,
             [
                 "B - B",
@@ -307,13 +546,13 @@ class Computer():
                 "- - W"
             ],
             [
-                Move(Position(0,0),MoveColor.RED,Movement.DIAGONAL_RIGHT),
-                Move(Position(0,2),MoveColor.BLUE,Movement.DIAGONAL_LEFT),
-                Move(Position(0,2),MoveColor.YELLOW,Movement.FORWARD),
-                Move(Position(1,0),MoveColor.GREEN,Movement.FORWARD)
+                MoveDefinition(Position(0,0),MoveColor.RED,Movement.DIAGONAL_RIGHT),
+                MoveDefinition(Position(0,2),MoveColor.BLUE,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(0,2),MoveColor.YELLOW,Movement.FORWARD),
+                MoveDefinition(Position(1,0),MoveColor.GREEN,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4B", 4,
             [
                 "- B B",
@@ -321,12 +560,12 @@ class Computer():
                 "- - W"
             ],
             [
-                Move(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
-                Move(Position(0,2),MoveColor.BLUE,Movement.FORWARD),
-                Move(Position(1,1),MoveColor.RED,Movement.FORWARD)
+                MoveDefinition(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(0,2),MoveColor.BLUE,Movement.FORWARD),
+                MoveDefinition(Position(1,1),MoveColor.RED,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4C", 4,
             [
                 "B - B",
@@ -334,12 +573,12 @@ class Computer():
                 "- W -"
             ],
             [
-                Move(Position(0,0),MoveColor.GREEN,Movement.DIAGONAL_RIGHT),
-                Move(Position(0,2),MoveColor.RED,Movement.DIAGONAL_LEFT),
-                Move(Position(0,2),MoveColor.BLUE,Movement.FORWARD)
+                MoveDefinition(Position(0,0),MoveColor.GREEN,Movement.DIAGONAL_RIGHT),
+                MoveDefinition(Position(0,2),MoveColor.RED,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(0,2),MoveColor.BLUE,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4D", 4,
             [
                 "B B -",
@@ -347,12 +586,12 @@ class Computer():
                 "- - W"
             ],
             [
-                Move(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
-                Move(Position(0,1),MoveColor.RED,Movement.FORWARD),
-                Move(Position(0,1),MoveColor.BLUE,Movement.DIAGONAL_RIGHT)
+                MoveDefinition(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(0,1),MoveColor.RED,Movement.FORWARD),
+                MoveDefinition(Position(0,1),MoveColor.BLUE,Movement.DIAGONAL_RIGHT)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4E", 4,
             [
                 "- B B",
@@ -360,12 +599,12 @@ class Computer():
                 "W - -"
             ],
             [
-                Move(Position(0,1),MoveColor.RED,Movement.DIAGONAL_RIGHT),
-                Move(Position(1,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
-                Move(Position(1,1),MoveColor.BLUE,Movement.FORWARD)
+                MoveDefinition(Position(0,1),MoveColor.RED,Movement.DIAGONAL_RIGHT),
+                MoveDefinition(Position(1,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(1,1),MoveColor.BLUE,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4F", 4,
             [
                 "- B B",
@@ -373,11 +612,11 @@ class Computer():
                 "W - -"
             ],
             [
-                Move(Position(0,1),MoveColor.RED,Movement.DIAGONAL_RIGHT),
-                Move(Position(0,2),MoveColor.GREEN,Movement.DIAGONAL_LEFT)
+                MoveDefinition(Position(0,1),MoveColor.RED,Movement.DIAGONAL_RIGHT),
+                MoveDefinition(Position(0,2),MoveColor.GREEN,Movement.DIAGONAL_LEFT)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4G", 4,
             [
                 "B - B",
@@ -385,11 +624,11 @@ class Computer():
                 "- W -"
             ],
             [
-                Move(Position(1,0),MoveColor.GREEN,Movement.FORWARD),
-                Move(Position(1,0),MoveColor.RED,Movement.DIAGONAL_RIGHT)
+                MoveDefinition(Position(1,0),MoveColor.GREEN,Movement.FORWARD),
+                MoveDefinition(Position(1,0),MoveColor.RED,Movement.DIAGONAL_RIGHT)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4H", 4,
             [
                 "B B -",
@@ -397,11 +636,11 @@ class Computer():
                 "- - W"
             ],
             [
-                Move(Position(0,0),MoveColor.RED,Movement.DIAGONAL_RIGHT),
-                Move(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT)
+                MoveDefinition(Position(0,0),MoveColor.RED,Movement.DIAGONAL_RIGHT),
+                MoveDefinition(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4I", 4,
             [
                 "- B B",
@@ -409,11 +648,11 @@ class Computer():
                 "- - W"
             ],
             [
-                Move(Position(0,2),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
-                Move(Position(0,2),MoveColor.RED,Movement.FORWARD)
+                MoveDefinition(Position(0,2),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(0,2),MoveColor.RED,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4J", 4,
             [
                 "- B B",
@@ -421,11 +660,11 @@ class Computer():
                 "W - -"
             ],
             [
-                Move(Position(0,2),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
-                Move(Position(0,2),MoveColor.RED,Movement.FORWARD)
+                MoveDefinition(Position(0,2),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(0,2),MoveColor.RED,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "4K", 4,
             [
                 "B - B",
@@ -433,10 +672,10 @@ class Computer():
                 "- - W"
             ],
             [
-                Move(Position(0,2),MoveColor.GREEN,Movement.FORWARD)
+                MoveDefinition(Position(0,2),MoveColor.GREEN,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6A", 6,
             [
                 "- - B",
@@ -444,11 +683,11 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(1,0),MoveColor.GREEN,Movement.FORWARD),
-                Move(Position(1,1),MoveColor.RED,Movement.FORWARD)
+                MoveDefinition(Position(1,0),MoveColor.GREEN,Movement.FORWARD),
+                MoveDefinition(Position(1,1),MoveColor.RED,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6B", 6,
             [
                 "B - -",
@@ -456,10 +695,10 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(0,0),MoveColor.GREEN,Movement.DIAGONAL_RIGHT)
+                MoveDefinition(Position(0,0),MoveColor.GREEN,Movement.DIAGONAL_RIGHT)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6C", 6,
             [
                 "- B -",
@@ -467,11 +706,11 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(0,1),MoveColor.RED,Movement.DIAGONAL_RIGHT),
-                Move(Position(1,0),MoveColor.GREEN,Movement.FORWARD)
+                MoveDefinition(Position(0,1),MoveColor.RED,Movement.DIAGONAL_RIGHT),
+                MoveDefinition(Position(1,0),MoveColor.GREEN,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6D", 6,
             [
                 "- B -",
@@ -479,11 +718,11 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
-                Move(Position(1,2),MoveColor.RED,Movement.FORWARD)
+                MoveDefinition(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(1,2),MoveColor.RED,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6E", 6,
             [
                 "B - -",
@@ -491,11 +730,11 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(1,0),MoveColor.GREEN,Movement.FORWARD),
-                Move(Position(1,1),MoveColor.RED,Movement.FORWARD)
+                MoveDefinition(Position(1,0),MoveColor.GREEN,Movement.FORWARD),
+                MoveDefinition(Position(1,1),MoveColor.RED,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6F", 6,
             [
                 "- - B",
@@ -503,11 +742,11 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(1,1),MoveColor.GREEN,Movement.FORWARD),
-                Move(Position(1,2),MoveColor.RED,Movement.FORWARD)
+                MoveDefinition(Position(1,1),MoveColor.GREEN,Movement.FORWARD),
+                MoveDefinition(Position(1,2),MoveColor.RED,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6G", 6,
             [
                 "- - B",
@@ -515,12 +754,12 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(0,2),MoveColor.RED,Movement.DIAGONAL_LEFT),
-                Move(Position(0,2),MoveColor.BLUE,Movement.FORWARD),
-                Move(Position(1,0),MoveColor.GREEN,Movement.FORWARD)
+                MoveDefinition(Position(0,2),MoveColor.RED,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(0,2),MoveColor.BLUE,Movement.FORWARD),
+                MoveDefinition(Position(1,0),MoveColor.GREEN,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6H", 6,
             [
                 "- B -",
@@ -528,11 +767,11 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
-                Move(Position(1,1),MoveColor.RED ,Movement.FORWARD)
+                MoveDefinition(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(1,1),MoveColor.RED ,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6I", 6,
             [
                 "- B -",
@@ -540,11 +779,11 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(0,1),MoveColor.RED,Movement.DIAGONAL_RIGHT),
-                Move(Position(1,1),MoveColor.GREEN ,Movement.FORWARD)
+                MoveDefinition(Position(0,1),MoveColor.RED,Movement.DIAGONAL_RIGHT),
+                MoveDefinition(Position(1,1),MoveColor.GREEN ,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6J", 6,
             [
                 "B - -",
@@ -552,11 +791,11 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(0,0),MoveColor.RED,Movement.DIAGONAL_RIGHT),
-                Move(Position(1,0),MoveColor.GREEN ,Movement.FORWARD)
+                MoveDefinition(Position(0,0),MoveColor.RED,Movement.DIAGONAL_RIGHT),
+                MoveDefinition(Position(1,0),MoveColor.GREEN ,Movement.FORWARD)
             ]
         ),
-        Box(
+        BoxDefinition(
             "6K", 6,
             [
                 "- - B",
@@ -564,19 +803,190 @@ class Computer():
                 "- - -"
             ],
             [
-                Move(Position(0,2),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
-                Move(Position(1,2),MoveColor.RED ,Movement.FORWARD)
+                MoveDefinition(Position(0,2),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                MoveDefinition(Position(1,2),MoveColor.RED ,Movement.FORWARD)
             ]
         ),
     ]
-    """Boxes for black player moves."""
+    """Box definitions for black player moves."""
 
-    def __init__(self) -> None:
+    def __init__(
+            self,
+            seed:int=None,
+            cachePath:str=None,
+            boxes=None) -> None:
+        """
+        Parameter
+        ---------
+        seed : int
+            Seed for random move selection. None for random seed.
+        cachePath : str
+            Catalogue cache file path, e.g. DEFAULT_CATALOGUE_CACHE_PATH.
+            None to always build boxes from definitions.
+        boxes : Any
+            Iterable of validated boxes to use instead of the box
+            definitions, e.g. from catalogue.loadCatalogue. Consumed once.
+            Raises ValueError if two boxes have the same turn and board.
+        """
+        self._boxes = []
+        self._boxIndexesByKey = {}
+        self._learningVersion = 0
+        if not boxes == None:
+            self._addBoxes(boxes)
+        else:
+            self._addDefinedBoxes(cachePath)
+        self._sampler = MoveSampler(self._boxes,seed)
 
-        self._addMirrorsOfAsymmetricBoxes()
+    def _addBoxes(self,boxes)->None:
+        """
+        Adds validated boxes and indexes them while iterating.
 
-        self._boxes = sorted(self._boxes, key=lambda x: x.id, reverse=False)
+        Parameter
+        ---------
+        boxes : Any
+            Iterable of boxes.
+        """
+        for box in boxes:
+            boxKey = (box.turn,box.getKey())
+            if boxKey in self._boxIndexesByKey:
+                raise ValueError("Duplicate box position: {}.".format(box.id))
+            self._boxIndexesByKey[boxKey] = len(self._boxes)
+            self._boxes.append(box)
+
+    def _addDefinedBoxes(self,cachePath:str)->None:
+        """
+        Adds boxes of box definitions and their mirrors, from catalogue
+        cache if up to date.
+
+        Parameter
+        ---------
+        cachePath : str
+            Catalogue cache file path. None to not use cache.
+        """
+        definitionsHash = getCatalogueHash(Computer._boxDefinitions)
+        boxes = Computer._loadCatalogueCache(cachePath,definitionsHash)\
+            if not cachePath == None else None
+        if boxes == None:
+            self._boxes = [
+                Box(d.id,d.turn,d.setup,
+                    [Move(m.position,m.color,m.movement,m.weight) for m in d.moves])
+                for d in Computer._boxDefinitions]
+
+            self._addMirrorsOfAsymmetricBoxes()
+
+            boxes = sorted(self._boxes, key=lambda x: x.id, reverse=False)
+            self._boxes = []
+
+            if not cachePath == None:
+                Computer._saveCatalogueCache(cachePath,definitionsHash,boxes)
+
+        self._addBoxes(boxes)
     
+    @staticmethod
+    def _loadCatalogueCache(path:str,definitionsHash:str)->list:
+        """
+        Loads boxes from catalogue cache file.
+
+        Parameter
+        ---------
+        path : str
+            Catalogue cache file path.
+        definitionsHash : str
+            Hash of box definitions. See getCatalogueHash.
+
+        Returns
+        ---------
+        list : Boxes. None if cache is missing, unreadable, stale or has an
+        invalid record.
+        """
+        try:
+            with open(path,"r") as f:
+                cache = json.load(f)
+            if not (cache["version"] == CATALOGUE_CACHE_VERSION and\
+                    cache["hash"] == definitionsHash):
+                return None
+            boxes = []
+            for id, turn, key, moves in cache["boxes"]:
+                Computer._checkCacheRecord(id,turn,key,moves)
+                boxes.append(Box._fromCache(id,turn,key,
+                    [Move._fromCode(code,MoveColor[color],weight) for code, color, weight in moves]))
+            return boxes
+        except (OSError,ValueError,KeyError,TypeError,IndexError):
+            return None
+
+    @staticmethod
+    def _checkCacheRecord(id:str,turn:int,key:int,moves:list)->None:
+        """
+        Validates catalogue cache record on board key digits and move code
+        tables, same rules as catalogue records, as boxes of cache are
+        created without checks. Raises ValueError if record is invalid.
+
+        Parameter
+        ---------
+        id : str
+            ID of box.
+        turn : int
+            Turn number.
+        key : int
+            Board key of pawn positions.
+        moves : list
+            [move code,color name,weight] of moves.
+        """
+        if not (type(id) == str and len(id) > 0 and\
+                type(turn) == int and turn > 0 and turn%2 == 0 and\
+                type(key) == int and key >= 0 and key < 3**(SIZE*SIZE) and\
+                type(moves) == list):
+            raise ValueError("Invalid cache record.")
+        tiles = [(key // 3**i) % 3 for i in range(SIZE*SIZE)]
+        codes = set()
+        for code, color, weight in moves:
+            if not (type(code) == int and code >= 0 and code < MOVE_CODE_COUNT) or\
+               code in codes or MOVE_TO[code] == None:
+                raise ValueError("Invalid cache move code: {}.".format(id))
+            position = MOVE_FROM[code]
+            newPosition = MOVE_TO[code]
+            # forward moves into empty tile, diagonal moves capture white pawn
+            required = TILE_EMPTY if MOVE_MOVEMENT[code] == Movement.FORWARD else TILE_WHITE
+            if not (tiles[position.row*SIZE + position.col] == TILE_BLACK and\
+                    tiles[newPosition.row*SIZE + newPosition.col] == required):
+                raise ValueError("Invalid cache move: {}.".format(id))
+            if not (type(color) == str and color in MoveColor.__members__):
+                raise ValueError("Invalid cache move color: {}.".format(id))
+            if not (type(weight) in (int,float) and weight >= 0 and weight < float("inf")):
+                raise ValueError("Invalid cache move weight: {}.".format(id))
+            codes.add(code)
+
+    @staticmethod
+    def _saveCatalogueCache(path:str,definitionsHash:str,boxes:list)->None:
+        """
+        Saves boxes to catalogue cache file. Failing to write is ignored.
+
+        Parameter
+        ---------
+        path : str
+            Catalogue cache file path.
+        definitionsHash : str
+            Hash of box definitions. See getCatalogueHash.
+        boxes : list
+            Validated boxes.
+        """
+        cache = {
+            "version" : CATALOGUE_CACHE_VERSION,
+            "hash" : definitionsHash,
+            "boxes" : [
+                [box.id,box.turn,box.getKey(),
+                    [[move.code,move.color.name,move.weight] for move in box.moves]]
+                for box in boxes],
+        }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)),exist_ok=True)
+            tmpPath = "{}.{}.tmp".format(path,os.getpid())
+            with open(tmpPath,"w") as f:
+                json.dump(cache,f,separators=(",",":"))
+            os.replace(tmpPath,path)
+        except OSError:
+            pass
+
     def _addMirrorsOfAsymmetricBoxes(self)->None:
         """
         Adds mirrors of asymmetric boxexs.
@@ -635,7 +1045,7 @@ class Computer():
                 newMovement = Movement.DIAGONAL_RIGHT
             elif move.movement == Movement.DIAGONAL_RIGHT:
                 newMovement = Movement.DIAGONAL_LEFT
-            newMoves.append(Move(newPosition,move.color,newMovement))
+            newMoves.append(Move(newPosition,move.color,newMovement,move.weight))
         box = Box( "{}r".format(box.id), box.turn, newSetting, newMoves )
         return box
 
@@ -659,19 +1069,149 @@ class Computer():
         ---------
         Box : Box for current turn based on board pawn positions. None if box is not found.
         """
-        assert turn >= 2 and (turn%2) == 0
-        assert not currentBoard == None
-        boxForTurn = None
-        boxesWithTurn = list(filter(lambda x : x.turn == turn, self._boxes))
-        for box in boxesWithTurn:
-            if areBoardsEqual(box,currentBoard):
-                boxForTurn = box
-                break  
-        return boxForTurn
+        if isCheckedMode():
+            assert turn >= 2 and (turn%2) == 0
+            assert not currentBoard == None
+        boxIndex = self._boxIndexesByKey.get((turn,currentBoard.getKey()))
+        return None if boxIndex == None else self._boxes[boxIndex]
+
+    def chooseMoves(self,boards:list,turns:list)->list:
+        """
+        Chooses random moves for many boards at once. Box lookups and move
+        sampling are done in one batch.
+
+        Parameter
+        ---------
+        boards : list
+            Boards or board keys (see Board.getKey) with black to move.
+        turns : list
+            Turn of each board. Must be even numbers.
+
+        Returns
+        ---------
+        list : Chosen move for each board. None if all moves of the box are
+        removed, MISSING_BOX if there is no box for the board and turn.
+        """
+        assert len(boards) == len(turns)
+        chosen = [MISSING_BOX] * len(boards)
+        found = []
+        boxIndexes = []
+        for i in range(len(boards)):
+            board = boards[i]
+            key = board.getKey() if isinstance(board,Board) else int(board)
+            boxIndex = self._boxIndexesByKey.get((int(turns[i]),key))
+            if not boxIndex == None:
+                found.append(i)
+                boxIndexes.append(boxIndex)
+        if len(found) > 0:
+            slots = self._sampler.sampleBatch(boxIndexes)
+            for i in range(len(found)):
+                slot = slots[i]
+                chosen[found[i]] = None if slot == NO_MOVE else\
+                    self._boxes[boxIndexes[i]].moves[slot]
+        return chosen
     
+    def _getBoxIndex(self,box:Box)->int:
+        """
+        Gets index of box in computer boxes, also the sampler row of box.
+
+        Parameter
+        ---------
+        box : Box
+            Box of computer.
+
+        Returns
+        ---------
+        int : Box index.
+        """
+        boxIndex = self._boxIndexesByKey[(box.turn,box.getKey())]
+        if isCheckedMode():
+            assert self._boxes[boxIndex] is box, "Box is not in computer."
+        return boxIndex
+
+    def selectRandomMove(self,box:Box)->Move:
+        """
+        Selects a random move from box, weighted by move weight.
+        Removed moves are never selected.
+
+        Parameter
+        ---------
+        box : Box
+            Box to select move from.
+
+        Returns
+        ---------
+        Move : Selected move. None if all moves of box are removed.
+        """
+        if isCheckedMode():
+            assert not box == None
+        slot = self._sampler.sample(self._getBoxIndex(box))
+        return None if slot == NO_MOVE else box.moves[slot]
+
+    def removeMove(self,box:Box,move:Move)->None:
+        """
+        Removes move of box so it will not be selected again.
+
+        Parameter
+        ---------
+        box : Box
+            Box containing the move.
+        move : Move
+            Move to remove.
+        """
+        if isCheckedMode():
+            assert not box == None and not move == None
+        move.remove()
+        self._sampler.refreshBox(self._getBoxIndex(box))
+        self._learningVersion += 1
+
+    def setMoveWeight(self,box:Box,move:Move,weight:float)->None:
+        """
+        Sets relative selection weight of move of box.
+
+        Parameter
+        ---------
+        box : Box
+            Box containing the move.
+        move : Move
+            Move to re-weight.
+        weight : float
+            Weight. 0 to never select the move.
+        """
+        if isCheckedMode():
+            assert not box == None and not move == None
+        slot = box.moves.index(move)
+        self._sampler.setWeight(self._getBoxIndex(box),slot,weight)
+        self._learningVersion += 1
+
     def resetIntelligence(self)->None:
         """
         Resets intelligence of computer.
         """
         for box in self._boxes:
             box.reset()
+        self._sampler.reset()
+        self._learningVersion += 1
+
+    def getRemovedMasks(self)->tuple:
+        """
+        Gets snapshot of removed moves of every box, e.g. for painting boxes
+        while another thread trains the computer.
+
+        Returns
+        ---------
+        tuple : Removed move mask of each box by box index. See
+        Box.getRemovedMask.
+        """
+        return tuple(box.getRemovedMask() for box in self._boxes)
+
+    def getLearningVersion(self)->int:
+        """
+        Gets learning version, incremented whenever moves of boxes are
+        removed, re-weighted or reset.
+
+        Returns
+        ---------
+        int : Learning version.
+        """
+        return self._learningVersion
@@ -9,18 +9,20 @@
 
 ###############################################################################
 """
+import functools
 import os
+from collections import OrderedDict
 from enum import Enum
 from types import MethodType
 
 from PyQt5 import QtGui, QtWidgets
 from PyQt5.QtGui import QPainter, QPixmap, QPen, QPolygon
-from PyQt5.QtCore import Qt, QSize, QPoint
-from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QGridLayout
+from PyQt5.QtCore import Qt, QSize, QPoint, QRect
 
 from hexapawn.game_manager import *
 from hexapawn.board import *
 from hexapawn.computer import *
+from hexapawn.results import ResultsLog
 
 class TileFillColor(Enum):
     """
@@ -32,13 +34,13 @@ class TileFillColor(Enum):
 """Main board tile constants."""
 TILE_BUTTON_SIZE = 96
 PAWN_DRAWING_SIZE = 86
-PAWN_ELLIPSE_XY = (TILE_BUTTON_SIZE - PAWN_DRAWING_SIZE)/2
+PAWN_ELLIPSE_XY = (TILE_BUTTON_SIZE - PAWN_DRAWING_SIZE)//2
 
 """Box board draw constants."""
 BOX_BOARD_TILE_SIZE = 60
 BOX_BOARD_DRAW_SIZE = SIZE * BOX_BOARD_TILE_SIZE
 BOX_BOARD_PAWN_SIZE = 40
-BOX_BOARD_PAWNW_START_POINT_DIFF = (BOX_BOARD_TILE_SIZE-BOX_BOARD_PAWN_SIZE)/2
+BOX_BOARD_PAWNW_START_POINT_DIFF = (BOX_BOARD_TILE_SIZE-BOX_BOARD_PAWN_SIZE)//2
 BOX_BOARD_COLOR = QtGui.QColor(255,193,116)
 
 SELECT_MOVE_BUTTON_SIZE = QSize(150,15)
@@ -46,6 +48,14 @@ MOVE_REMOVED_COLOR = QtGui.QColor(195,195,195)
 
 BOXES_BOARD_SIZE = 50
 
+"""Box list item constants. See DrawUtil.drawBoxItem."""
+BOX_ITEM_LABEL_HEIGHT = 15
+BOX_ITEM_MOVE_SIZE = 10
+BOX_ITEM_SIZE = QSize(BOXES_BOARD_SIZE+4,BOX_ITEM_LABEL_HEIGHT+BOXES_BOARD_SIZE+BOX_ITEM_MOVE_SIZE+4)
+
+BOX_PIXMAP_CACHE_BUDGET = 16 * 1024 * 1024
+"""Default memory budget in bytes of rendered box pixmaps."""
+
 MOVEMENT_POINTS_MAP = {
     Movement.FORWARD : [
         QPoint(27,50),
@@ -77,47 +87,130 @@ MOVEMENT_POINTS_MAP = {
 }
 """Polygon point list for each movement for drawing."""
 
-class BoxInfoWidget(QtWidgets.QWidget):
+class BoxPixmapCache():
     """
+    LRU cache of rendered box pixmaps keyed by box, removed move mask and
+    scale. Least recently used pixmaps are evicted when over memory budget.
     """
 
-    def __init__(self,box:Box) -> None:
-        super().__init__()
+    def __init__(self,budget:int=BOX_PIXMAP_CACHE_BUDGET) -> None:
+        """
+        Parameter
+        ---------
+        budget : int
+            Memory budget in bytes.
+        """
+        assert type(budget) == int and budget > 0
+        self.budget = budget
+        """Memory budget in bytes."""
+        self.size = 0
+        """Bytes used by cached pixmaps."""
+        self._pixmaps = OrderedDict()
 
-        layout = QtWidgets.QVBoxLayout()
-        layout.setSpacing(0)
-        self.setLayout(layout)
+    def __len__(self)->int:
+        return len(self._pixmaps)
 
-        # ID
-        self.lblID = QtWidgets.QLabel(box.id)
-        layout.addWidget(self.lblID)
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
 
-        # board button
-        btnBoard = QtWidgets.QPushButton()
-        btnBoard.setObjectName(box.id)
-        DrawUtil._drawBoxToButton(box,btnBoard,BOXES_BOARD_SIZE)
-        layout.addWidget(btnBoard)
+    def get(self,box:Box,scaleTo:int=-1,removedMask:int=None)->QPixmap:
+        """
+        Gets rendered box, rendering it if not cached.
+
+        Parameter
+        ---------
+        box : Box
+            Box to render.
+        scaleTo : int
+            Scale. -1 if there is no scaling.
+        removedMask : int
+            Removed moves to render, see Box.getRemovedMask. None for
+            removed moves of box.
+
+        Returns
+        ---------
+        QPixmap : Rendered box. Must not be modified.
+        """
+        if removedMask == None:
+            removedMask = box.getRemovedMask()
+        key = (box.id,box.turn,box.getKey(),removedMask,scaleTo)
+        pixmap = self._pixmaps.get(key)
+        if not pixmap == None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+        pixmap = DrawUtil._renderBox(box,removedMask)
+        if not scaleTo == -1:
+            pixmap = pixmap.scaledToHeight(scaleTo,Qt.SmoothTransformation)
+        self._pixmaps[key] = pixmap
+        self.size += BoxPixmapCache._getCost(pixmap)
+        while self.size > self.budget and len(self._pixmaps) > 1:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self.size -= BoxPixmapCache._getCost(evicted)
+        return pixmap
+
+    @staticmethod
+    def _getCost(pixmap:QPixmap)->int:
+        """
+        Gets approximate memory cost of pixmap in bytes.
+        """
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(),8) // 8
+
+    def clear(self)->None:
+        """
+        Removes every cached pixmap.
+        """
+        self._pixmaps.clear()
+        self.size = 0
+
+BOX_PIXMAP_CACHE = BoxPixmapCache()
+"""Shared cache of rendered boxes."""
+
+class MoveButton(QtWidgets.QPushButton):
+    """
+    Move select button. Buttons are pooled and reconfigured for the move of
+    each new box. See DrawUtil._drawMoveButtons.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.boundMove = None
+        """Bound move. None if button is unused."""
+        self._moveSelectFunc = None
+        self._drawnColor = None
+        self.setIconSize(SELECT_MOVE_BUTTON_SIZE)
+        self.clicked.connect(self._moveClicked)
+
+    def _moveClicked(self)->None:
+        """
+        Callback when button is clicked.
+        """
+        if not self.boundMove == None and not self._moveSelectFunc == None:
+            self._moveSelectFunc(self.boundMove)
+
+    def setMove(self,move:Move,moveSelectFunc:MethodType)->None:
+        """
+        Binds move and updates icon and enabled state.
+
+        Parameter
+        ---------
+        move : Move
+            Move to bind. None to unbind.
+        moveSelectFunc : MethodType
+            Callback when move is selected.
+        """
+        self.boundMove = move
+        self._moveSelectFunc = moveSelectFunc
+        if move == None:
+            return
+        self.setEnabled(not move.removed)
+        color = MOVE_REMOVED_COLOR if move.removed else move.color.value
+        if not color is self._drawnColor:
+            pixmap = QPixmap(SELECT_MOVE_BUTTON_SIZE)
+            pixmap.fill(color)
+            self.setIcon(QtGui.QIcon(pixmap))
+            self._drawnColor = color
 
-        # moves
-        hWidget = QtWidgets.QWidget()
-        hWidget.setStyleSheet("border: 1px solid black;")
-        hLayout = QtWidgets.QHBoxLayout(hWidget)
-        hLayout.setSpacing(0)
-        hWidget.setFixedWidth(BOXES_BOARD_SIZE)
-        size = QSize(10,10)
-        for move in box.moves:
-            btn = QtWidgets.QPushButton()
-            pixmap = QPixmap(size)
-            if move.removed:
-                pixmap.fill(MOVE_REMOVED_COLOR)
-            else:
-                pixmap.fill(move.color.value)
-            btn.setIcon(QtGui.QIcon(pixmap))
-            btn.setIconSize(size)
-            btn.setFixedSize(size)
-            hLayout.addWidget(btn)
-        layout.addWidget(hWidget)
-        
 class DrawUtil():
     """
     Draw utility.
@@ -158,25 +251,6 @@ class DrawUtil():
         button.setIcon(QtGui.QIcon(pixmap))
         button.setIconSize(size)
 
-    @staticmethod
-    def _clearLayout(layout):
-        """
-        Clears layout.
-        
-        Parameter
-        ---------
-        layout : Any
-            Layout to clear.
-        """
-        if layout is not None:
-            while layout.count():
-                item = layout.takeAt(0)
-                widget = item.widget()
-                if widget is not None:
-                    widget.deleteLater()
-                else:
-                    DrawUtil._clearLayout(item.layout())
-
     @staticmethod
     def _drawBoardTiles(painter:QPainter,board:Board)->None:
         """
@@ -226,7 +300,8 @@ class DrawUtil():
         box:Board,
         moveSelectFunc:MethodType)->None:
         """
-        Draws move buttons.
+        Draws move buttons. Buttons are kept in grpMoveButton.moveButtons
+        and reconfigured for the box, unused buttons are hidden.
 
         Parameter
         ---------
@@ -238,64 +313,112 @@ class DrawUtil():
             Callback when move is selected. None to skip drawing buttons.
         """
         layout = grpMoveButton.layout
-        DrawUtil._clearLayout(layout)
-        if not box == None:
-            for move in box.moves:
-                button = QtWidgets.QPushButton()
-                button.clicked.connect(lambda event,move=move:moveSelectFunc(move))
-                button.setEnabled(not move.removed)
-                pixmap = QPixmap(SELECT_MOVE_BUTTON_SIZE)
-                if not move.removed:
-                    pixmap.fill(move.color.value)
-                else:
-                    pixmap.fill(MOVE_REMOVED_COLOR)
-                button.setIcon(QtGui.QIcon(pixmap))
-                button.setIconSize(SELECT_MOVE_BUTTON_SIZE)
-                layout.addWidget(button)
+        buttons = getattr(grpMoveButton,"moveButtons",None)
+        if buttons == None:
+            buttons = []
+            grpMoveButton.moveButtons = buttons
             layout.setSpacing(0)
+        moves = box.moves if not box == None and not moveSelectFunc == None else []
+        while len(buttons) < len(moves):
+            button = MoveButton()
+            layout.addWidget(button)
+            buttons.append(button)
+        for slot, button in enumerate(buttons):
+            if slot < len(moves):
+                button.setMove(moves[slot],moveSelectFunc)
+                button.setVisible(True)
+            else:
+                button.setMove(None,None)
+                button.setVisible(False)
 
     @staticmethod
-    def _drawBoxToButton(box:Box,button:QtWidgets.QPushButton,scaleTo:int=-1):
+    @functools.lru_cache(maxsize=None)
+    def _getMovePolygons(tileSize:int)->tuple:
+        """
+        Gets movement arrow polygons translated to the tile of each move,
+        built once per tile size and shared by every box render.
+
+        Parameter
+        ---------
+        tileSize : int
+            Tile size. MOVEMENT_POINTS_MAP is scaled from BOX_BOARD_TILE_SIZE.
+
+        Returns
+        ---------
+        tuple : QPolygon by move code. None if movement is not drawn.
         """
-        Draws box to button.
+        polygons = [None] * MOVE_CODE_COUNT
+        scale = tileSize / BOX_BOARD_TILE_SIZE
+        for code in range(MOVE_CODE_COUNT):
+            pts = MOVEMENT_POINTS_MAP.get(MOVE_MOVEMENT[code])
+            if pts == None:
+                continue
+            adjX = MOVE_FROM[code].col*tileSize
+            adjY = MOVE_FROM[code].row*tileSize
+            polygons[code] = QPolygon([
+                QPoint(round(pt.x()*scale)+adjX,round(pt.y()*scale)+adjY) for pt in pts])
+        return tuple(polygons)
+
+    @staticmethod
+    def _renderBox(box:Box,removedMask:int=None)->QPixmap:
+        """
+        Renders box board and movement arrows.
 
         Parameter
         ---------
         box : Box
-            Box  to draw.
-        button : QtWidgets.QPushButton
-            Button to draw box into.
-        scaleTo : int
-            Scale. -1 if there is no scaling.
+            Box to render. None for empty board.
+        removedMask : int
+            Removed moves to render, see Box.getRemovedMask. None for
+            removed moves of box.
+
+        Returns
+        ---------
+        QPixmap : Rendered box.
         """
         size = QSize( BOX_BOARD_DRAW_SIZE, BOX_BOARD_DRAW_SIZE )
         pixmap = QPixmap(size)
         painter = QPainter(pixmap)
         DrawUtil._drawBoardTiles(painter,box)
         if not box == None:
-            for move in box.moves:
+            if removedMask == None:
+                removedMask = box.getRemovedMask()
+            polygons = DrawUtil._getMovePolygons(BOX_BOARD_TILE_SIZE)
+            painter.setPen(QPen(Qt.black, 1, Qt.SolidLine))
+            for slot, move in enumerate(box.moves):
                 # movement arrow
-                pts = MOVEMENT_POINTS_MAP[move.movement]
-                if not pts == None:
-                    painter.setPen(QPen(Qt.black, 1, Qt.SolidLine))
-                    if not move.removed:
+                polygon = polygons[move.code]
+                if not polygon == None:
+                    if not removedMask & (1 << slot):
                         painter.setBrush(move.color.value)
                     else:
                         painter.setBrush(MOVE_REMOVED_COLOR)
-                    adjustP = []
-                    adjX = (move.position.col*BOX_BOARD_TILE_SIZE)
-                    adjY = (move.position.row*BOX_BOARD_TILE_SIZE)
-                    for pt in pts:
-                        adjustP.append(QPoint(pt.x()+adjX,pt.y()+adjY))
-                    painter.drawPolygon(QPolygon(adjustP))
+                    painter.drawPolygon(polygon)
         painter.end()
+        return pixmap
+
+    @staticmethod
+    def _drawBoxToButton(box:Box,button:QtWidgets.QPushButton,scaleTo:int=-1):
+        """
+        Draws box to button. Rendered boxes are taken from BOX_PIXMAP_CACHE.
+
+        Parameter
+        ---------
+        box : Box
+            Box  to draw.
+        button : QtWidgets.QPushButton
+            Button to draw box into.
+        scaleTo : int
+            Scale. -1 if there is no scaling.
+        """
+        pixmap = BOX_PIXMAP_CACHE.get(box,scaleTo)\
+            if not box == None else DrawUtil._renderBox(None)
         if not scaleTo == -1:
             scaledSize = QSize(scaleTo,scaleTo)
             button.setIconSize(scaledSize)
             button.setFixedSize(QSize(scaleTo,scaleTo))
-            pixmap.scaledToHeight(scaleTo)
         else:
-            button.setIconSize(size)
+            button.setIconSize(QSize( BOX_BOARD_DRAW_SIZE, BOX_BOARD_DRAW_SIZE ))
         button.setIcon(QtGui.QIcon(pixmap))
 
     ######################################################################
@@ -324,10 +447,7 @@ class DrawUtil():
         tilePositions = board.getTilePositions()
         for row in range(SIZE):
             for col in range(SIZE):
-                selected = True if not selectedTilePosition == None and \
-                    selectedTilePosition.row == row and \
-                    selectedTilePosition.col == col else \
-                    False
+                selected = selectedTilePosition is POSITIONS[row][col]
                 DrawUtil._drawTile(buttonMap[row][col],tilePositions[row][col],selected)
 
     @staticmethod
@@ -369,6 +489,23 @@ class DrawUtil():
         else:
             lblPlayerToMove.setText("Player To Move")
 
+    @staticmethod
+    def drawResultsSummary(lblSummary:QtWidgets.QLabel,log:ResultsLog)->None:
+        """
+        Draws game count and win rates.
+
+        Parameter
+        ---------
+        lblSummary : QtWidgets.QLabel
+            Label to write to.
+        log : ResultsLog
+            Results log for aggregates.
+        """
+        lblSummary.setText("Games: {}  White: {:.0%}  Black: {:.0%}".format(
+            log.gameCount,
+            log.getWinRate(Player.WHITE),
+            log.getWinRate(Player.BLACK)))
+
     @staticmethod
     def drawCurrentBox(btnComputerMove:QtWidgets.QPushButton,grpMoves:QtWidgets.QGroupBox,box:Board,moveSelectFunc:MethodType)->None:
         """
@@ -389,25 +526,50 @@ class DrawUtil():
         DrawUtil._drawMoveButtons(grpMoves,box,moveSelectFunc)
 
     @staticmethod
-    def drawBoxes(grpBox:QtWidgets.QGroupBox,computer:Computer):
-        boxes = computer._boxes
-        layout = grpBox.layout()
-        if layout == None:
-            layout = QGridLayout()
-            grpBox.setLayout(layout)
-            layout.setSpacing(0)
-        else:
-            DrawUtil._clearLayout(grpBox.layout())
-        row = 0
-        col = 0
-        for turn in range(10):
-            turnBoxes = list(filter(lambda b : b.turn == turn, boxes))
-            if len(turnBoxes)>0:
-                lbl = QtWidgets.QLabel("{}".format(turn))
-                layout.addWidget(lbl,row,0)
-                col = 1
-                for box in turnBoxes:
-                    boxInfoWidget = BoxInfoWidget(box)
-                    layout.addWidget(boxInfoWidget,row,col)
-                    col+=1
-                row+=1
\ No newline at end of file
+    def drawBoxItem(
+        painter:QPainter,
+        rect:QRect,
+        box:Box,
+        selected:bool=False,
+        removedMask:int=None)->None:
+        """
+        Draws box ID, board and move states into rect, for box lists
+        painting only visible boxes. Board is taken from BOX_PIXMAP_CACHE.
+
+        Parameter
+        ---------
+        painter : QPainter
+            Initialized painter.
+        rect : QRect
+            Item rect. See BOX_ITEM_SIZE.
+        box : Box
+            Box to draw.
+        selected : bool
+            Indication if item is currently selected.
+        removedMask : int
+            Removed moves to draw, see Box.getRemovedMask. None for removed
+            moves of box.
+        """
+        if removedMask == None:
+            removedMask = box.getRemovedMask()
+        painter.save()
+        if selected:
+            painter.fillRect(rect,TileFillColor.SELECTED.value)
+        x = rect.x()
+        y = rect.y()
+        # ID
+        painter.setPen(Qt.black)
+        painter.drawText(
+            QRect(x,y,rect.width(),BOX_ITEM_LABEL_HEIGHT),
+            Qt.AlignLeft | Qt.AlignVCenter,
+            box.id)
+        # board
+        y += BOX_ITEM_LABEL_HEIGHT
+        painter.drawPixmap(x,y,BOX_PIXMAP_CACHE.get(box,BOXES_BOARD_SIZE,removedMask))
+        # moves
+        y += BOXES_BOARD_SIZE
+        for slot, move in enumerate(box.moves):
+            moveRect = QRect(x+slot*BOX_ITEM_MOVE_SIZE,y,BOX_ITEM_MOVE_SIZE,BOX_ITEM_MOVE_SIZE)
+            painter.fillRect(moveRect,MOVE_REMOVED_COLOR if removedMask & (1 << slot) else move.color.value)
+            painter.drawRect(moveRect.adjusted(0,0,-1,-1))
+        painter.restore()
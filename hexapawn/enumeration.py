@@ -0,0 +1,271 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for streaming position enumeration.
+
+        Positions reachable from the initial board are enumerated turn by
+        turn. Each turn's frontier of board keys is kept in a set bounded by
+        memory budget and spilled to sorted chunk files on disk when full.
+        Chunks are merged back in key order while the next frontier is being
+        collected, so the full position set is never held in memory. Chunks
+        are merged in passes of bounded fan-in whose read buffers fit the
+        memory budget, so open files and merge memory do not grow with the
+        number of chunks.
+
+###############################################################################
+"""
+import heapq
+import os
+import tempfile
+
+from hexapawn.board import *
+from hexapawn.tablebase import _decodeKey, _getSuccessorKeys, _isRivalOnGoal
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+"""Default memory budget in bytes for buffered board keys."""
+
+BUFFERED_KEY_COST = 128
+"""Approximate memory cost in bytes of board key buffered in set."""
+
+SPILL_READ_RECORDS = 4096
+"""Maximum number of records read at a time from spilled chunk file."""
+
+MAX_MERGE_FAN_IN = 64
+"""Maximum number of chunk files merged at once."""
+
+def getInitialKey(size:int=SIZE)->int:
+    """
+    Gets board key of initial pawn positions.
+
+    Parameter
+    ---------
+    size : int
+        Board size.
+
+    Returns
+    ---------
+    int : Board key.
+    """
+    key = 0
+    for col in range(size):
+        key += TILE_BLACK * 3**col
+        key += TILE_WHITE * 3**((size-1)*size + col)
+    return key
+
+class _SpillSet():
+    """
+    Set of board keys spilled to sorted chunk files when exceeding limit.
+    """
+
+    def __init__(self,recordSize:int,limit:int,directory:str) -> None:
+        """
+        Parameter
+        ---------
+        recordSize : int
+            Bytes per key in chunk files.
+        limit : int
+            Maximum number of keys kept in memory. Once keys are spilled for
+            merging, their memory (limit*BUFFERED_KEY_COST) holds the merge
+            read and write buffers instead.
+        directory : str
+            Directory for chunk files.
+        """
+        self._recordSize = recordSize
+        self._limit = limit
+        self._directory = directory
+        self._keys = set()
+        self._chunkPaths = []
+        bufferBudget = limit * BUFFERED_KEY_COST
+        self.fanIn = max(2,min(MAX_MERGE_FAN_IN,bufferBudget // (recordSize*SPILL_READ_RECORDS)))
+        """Maximum number of chunk files merged at once."""
+        self.readRecords = max(1,min(SPILL_READ_RECORDS,bufferBudget // ((self.fanIn+1)*recordSize)))
+        """Number of records per read or write buffer while merging, one
+        buffer per merged chunk and one for the output."""
+
+    def _writeChunk(self,records)->str:
+        """
+        Writes sorted records to a new chunk file.
+
+        Parameter
+        ---------
+        records : Any
+            Iterable of records in ascending order.
+
+        Returns
+        ---------
+        str : Chunk file path.
+        """
+        fd, path = tempfile.mkstemp(suffix=".chunk",dir=self._directory)
+        with os.fdopen(fd,"wb",buffering=self.readRecords*self._recordSize) as f:
+            for record in records:
+                f.write(record)
+        return path
+
+    def _spill(self)->None:
+        """
+        Writes buffered keys to a new sorted chunk file.
+        """
+        recordSize = self._recordSize
+        self._chunkPaths.append(self._writeChunk(
+            key.to_bytes(recordSize,"big") for key in sorted(self._keys)))
+        self._keys = set()
+
+    def _readChunk(self,path:str):
+        """
+        Yields records of chunk file, reading readRecords at a time.
+        """
+        recordSize = self._recordSize
+        with open(path,"rb",buffering=0) as f:
+            while True:
+                block = f.read(recordSize * self.readRecords)
+                if len(block) == 0:
+                    break
+                for i in range(0,len(block),recordSize):
+                    yield block[i:i+recordSize]
+
+    def _mergeChunks(self,paths:list):
+        """
+        Yields unique records of chunk files in ascending order.
+
+        Parameter
+        ---------
+        paths : list
+            Chunk file paths, at most fanIn.
+        """
+        readers = [self._readChunk(p) for p in paths]
+        try:
+            previous = None
+            for record in heapq.merge(*readers):
+                if not record == previous:
+                    previous = record
+                    yield record
+        finally:
+            # close chunk files even if consumer stops early
+            for reader in readers:
+                reader.close()
+
+    def _reduceChunks(self)->None:
+        """
+        Merges oldest fanIn chunk files into a new chunk file until at most
+        fanIn chunk files are left.
+        """
+        while len(self._chunkPaths) > self.fanIn:
+            group = self._chunkPaths[:self.fanIn]
+            path = self._writeChunk(self._mergeChunks(group))
+            self._chunkPaths = self._chunkPaths[self.fanIn:] + [path]
+            for merged in group:
+                os.remove(merged)
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def add(self,key:int)->None:
+        """
+        Adds key.
+
+        Parameter
+        ---------
+        key : int
+            Board key.
+        """
+        self._keys.add(key)
+        if len(self._keys) >= self._limit:
+            self._spill()
+
+    def isEmpty(self)->bool:
+        """
+        Checks if no key was added.
+        """
+        return len(self._keys) == 0 and len(self._chunkPaths) == 0
+
+    def iterSorted(self):
+        """
+        Yields unique keys in ascending order. The generator must be closed
+        before close if not exhausted.
+        """
+        if len(self._chunkPaths) == 0:
+            yield from sorted(self._keys)
+            return
+        if len(self._keys) > 0:
+            self._spill()
+        self._reduceChunks()
+        records = self._mergeChunks(self._chunkPaths)
+        try:
+            for record in records:
+                yield int.from_bytes(record,"big")
+        finally:
+            records.close()
+
+    def close(self)->None:
+        """
+        Deletes chunk files. Generators of iterSorted must be closed first.
+        """
+        for path in self._chunkPaths:
+            os.remove(path)
+        self._chunkPaths = []
+        self._keys = set()
+
+def enumeratePositions(
+        size:int=SIZE,
+        memoryBudget:int=DEFAULT_MEMORY_BUDGET,
+        directory:str=None):
+    """
+    Yields positions reachable from initial board where the player to move
+    has not lost yet. Positions are yielded by turn, and in ascending board
+    key within a turn. White moves on odd turns and black on even turns.
+
+    Parameter
+    ---------
+    size : int
+        Board size.
+    memoryBudget : int
+        Memory budget in bytes for buffered keys. The current and next
+        turn frontiers share the budget.
+    directory : str
+        Directory for spilled chunk files. None for system temp directory.
+
+    Returns
+    ---------
+    Generator of (turn,key).
+    """
+    assert type(memoryBudget) == int and memoryBudget > 0
+    recordSize = max(1,((3**(size*size)).bit_length()+7)//8)
+    limit = max(1,memoryBudget // (2*BUFFERED_KEY_COST))
+    with tempfile.TemporaryDirectory(dir=directory) as spillDirectory:
+        frontier = _SpillSet(recordSize,limit,spillDirectory)
+        frontier.add(getInitialKey(size))
+        nextFrontier = None
+        turn = 1
+        try:
+            while not frontier.isEmpty():
+                whiteToMove = (turn % 2) == 1
+                nextFrontier = _SpillSet(recordSize,limit,spillDirectory)
+                keys = frontier.iterSorted()
+                try:
+                    for key in keys:
+                        tiles = _decodeKey(key,size)
+                        if _isRivalOnGoal(tiles,size,whiteToMove):
+                            continue
+                        successors = _getSuccessorKeys(key,tiles,size,whiteToMove)
+                        if len(successors) == 0:
+                            continue
+                        yield (turn,key)
+                        for successor in successors:
+                            nextFrontier.add(successor)
+                finally:
+                    # close chunk files before deleting them, consumer may
+                    # stop early
+                    keys.close()
+                    frontier.close()
+                frontier = nextFrontier
+                nextFrontier = None
+                turn += 1
+        finally:
+            frontier.close()
+            if not nextFrontier == None:
+                nextFrontier.close()
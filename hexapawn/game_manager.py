@@ -26,19 +26,17 @@ class GameManager():
     Game manager.
     """
 
-    turn = 1
-    """Turn"""
-
-    turnPlayer = FIRST_PLAYER_TO_MOVE
-    """Player making move."""
-
-    ended = False
-    """Game end flag."""
-
-    winner = None
-    """Winning player"""
+    __slots__ = ("turn","turnPlayer","ended","winner")
 
     def __init__(self) -> None:
+        self.turn = 1
+        """Turn"""
+        self.turnPlayer = FIRST_PLAYER_TO_MOVE
+        """Player making move."""
+        self.ended = False
+        """Game end flag."""
+        self.winner = None
+        """Winning player"""
         self.reset()
 
     ######################################################################
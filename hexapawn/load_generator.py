@@ -0,0 +1,265 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for game server load generator.
+
+        Simulates concurrent white players against a game server (see
+        hexapawn.server) and reports request latency percentiles,
+        throughput and error rate.
+
+        Run with:
+            python -m hexapawn.load_generator --clients 500 --duration 10
+
+###############################################################################
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+
+from hexapawn.board import *
+from hexapawn.server import GameServer, DEFAULT_HOST, DEFAULT_PORT
+
+def _firstMovePolicy(board:Board,rng:random.Random)->tuple:
+    """
+    Policy making first possible move.
+    """
+    moves = board.getPossibleMoves(Color.WHITE)
+    return moves[0] if len(moves) > 0 else None
+
+def _randomMovePolicy(board:Board,rng:random.Random)->tuple:
+    """
+    Policy making random possible move.
+    """
+    moves = board.getPossibleMoves(Color.WHITE)
+    return rng.choice(moves) if len(moves) > 0 else None
+
+def _captureMovePolicy(board:Board,rng:random.Random)->tuple:
+    """
+    Policy taking black pawn when possible, random move otherwise.
+    """
+    moves = board.getPossibleMoves(Color.WHITE)
+    takes = [m for m in moves if not m[0].position.col == m[1].col]
+    if len(takes) > 0:
+        return rng.choice(takes)
+    return rng.choice(moves) if len(moves) > 0 else None
+
+POLICIES = {
+    "first"     : _firstMovePolicy,
+    "random"    : _randomMovePolicy,
+    "capture"   : _captureMovePolicy,
+}
+"""White move policies by name."""
+
+class LoadReport():
+    """
+    Load generation results.
+    """
+
+    def __init__(self) -> None:
+        self.latencies = []
+        """Request latencies in seconds."""
+        self.errors = 0
+        """Number of failed requests."""
+        self.games = 0
+        """Number of completed games."""
+        self.elapsed = 0.0
+        """Run duration in seconds."""
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def getPercentile(self,percent:float)->float:
+        """
+        Gets latency percentile.
+
+        Parameter
+        ---------
+        percent : float
+            Percentile, 0 to 100.
+
+        Returns
+        ---------
+        float : Latency in seconds. 0 if there is no request.
+        """
+        if len(self.latencies) == 0:
+            return 0.0
+        latencies = sorted(self.latencies)
+        index = max(0,math.ceil(percent/100*len(latencies))-1)
+        return latencies[index]
+
+    def getThroughput(self)->float:
+        """
+        Gets successful and failed requests per second.
+        """
+        requests = len(self.latencies) + self.errors
+        return requests / self.elapsed if self.elapsed > 0 else 0.0
+
+    def getErrorRate(self)->float:
+        """
+        Gets ratio of failed requests.
+        """
+        requests = len(self.latencies) + self.errors
+        return self.errors / requests if requests > 0 else 0.0
+
+    def summary(self)->str:
+        """
+        Creates printable summary.
+        """
+        return "\n".join([
+            "requests   : {} ({} errors, {:.2%})".format(
+                len(self.latencies)+self.errors,self.errors,self.getErrorRate()),
+            "games      : {}".format(self.games),
+            "throughput : {:.1f} req/s".format(self.getThroughput()),
+            "latency    : p50 {:.3f} ms, p90 {:.3f} ms, p99 {:.3f} ms, max {:.3f} ms".format(
+                self.getPercentile(50)*1000,
+                self.getPercentile(90)*1000,
+                self.getPercentile(99)*1000,
+                self.getPercentile(100)*1000),
+        ])
+
+async def _runClient(
+        host:str,
+        port:int,
+        deadline:float,
+        policy,
+        thinkTime:tuple,
+        rng:random.Random,
+        report:LoadReport)->None:
+    """
+    Plays games as white until deadline. Error responses are counted and a
+    new game is started, the client only stops early on connection loss.
+    """
+    try:
+        reader, writer = await asyncio.open_connection(host,port)
+    except OSError:
+        report.errors += 1
+        return
+    board = Board()
+
+    async def request(message:dict)->dict:
+        start = time.perf_counter()
+        writer.write(json.dumps(message,separators=(",",":")).encode() + b"\n")
+        await writer.drain()
+        line = await reader.readline()
+        if len(line) == 0:
+            raise ConnectionError("Connection closed.")
+        try:
+            response = json.loads(line)
+        except ValueError:
+            response = None
+        if not type(response) == dict:
+            response = { "ok" : False, "error" : "Invalid response." }
+        if response.get("ok"):
+            report.latencies.append(time.perf_counter()-start)
+        else:
+            report.errors += 1
+        return response
+
+    try:
+        while time.perf_counter() < deadline:
+            response = await request({"op" : "new"})
+            while response.get("ok") and response["winner"] == None and\
+                    time.perf_counter() < deadline:
+                board.setPawnsFromKey(response["board"])
+                choice = policy(board,rng)
+                if choice == None:
+                    break
+                pawn, newPosition = choice
+                if thinkTime[1] > 0:
+                    await asyncio.sleep(rng.uniform(thinkTime[0],thinkTime[1]))
+                response = await request({
+                    "op" : "move",
+                    "from" : [pawn.position.row,pawn.position.col],
+                    "to" : [newPosition.row,newPosition.col]})
+                if not response.get("winner") == None:
+                    report.games += 1
+            # error responses are counted, start a new game until deadline
+    except ConnectionError:
+        report.errors += 1
+    finally:
+        writer.close()
+
+async def runLoad(
+        host:str=DEFAULT_HOST,
+        port:int=DEFAULT_PORT,
+        clients:int=100,
+        duration:float=10.0,
+        policy:str="random",
+        thinkTime:tuple=(0.0,0.0),
+        seed:int=None)->LoadReport:
+    """
+    Runs concurrent white players against game server.
+
+    Parameter
+    ---------
+    host : str
+        Server host.
+    port : int
+        Server port.
+    clients : int
+        Number of concurrent players.
+    duration : float
+        Seconds to run.
+    policy : str
+        White move policy name. See POLICIES.
+    thinkTime : tuple
+        (min,max) seconds waited before each move.
+    seed : int
+        Seed for random generators. None for random seed.
+
+    Returns
+    ---------
+    LoadReport : Results.
+    """
+    assert type(clients) == int and clients > 0
+    assert policy in POLICIES, "Unknown policy."
+    assert thinkTime[0] >= 0 and thinkTime[1] >= thinkTime[0]
+    report = LoadReport()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        _runClient(host,port,deadline,POLICIES[policy],thinkTime,
+                   random.Random(rng.random()),report)
+        for _ in range(clients)])
+    report.elapsed = time.perf_counter() - start
+    return report
+
+async def _main(args:argparse.Namespace)->LoadReport:
+    """
+    Runs load generator from command line arguments.
+    """
+    server = None
+    port = args.port
+    if args.local:
+        server = GameServer(host=args.host,port=0,maxSessions=max(args.clients,1))
+        port = await server.start()
+    try:
+        return await runLoad(
+            args.host,port,args.clients,args.duration,args.policy,
+            (args.think_min,args.think_max),args.seed)
+    finally:
+        if not server == None:
+            await server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hexapawn game server load generator.")
+    parser.add_argument("--host",default=DEFAULT_HOST)
+    parser.add_argument("--port",type=int,default=DEFAULT_PORT)
+    parser.add_argument("--clients",type=int,default=100)
+    parser.add_argument("--duration",type=float,default=10.0)
+    parser.add_argument("--policy",choices=sorted(POLICIES.keys()),default="random")
+    parser.add_argument("--think-min",type=float,default=0.0)
+    parser.add_argument("--think-max",type=float,default=0.0)
+    parser.add_argument("--seed",type=int,default=None)
+    parser.add_argument("--local",action="store_true",
+                        help="Start server in this process.")
+    print(asyncio.run(_main(parser.parse_args())).summary())
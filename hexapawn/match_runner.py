@@ -0,0 +1,228 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for headless match runner implementations and
+        definitions.
+
+        Players are callbacks taking (board,gameManager,box) and returning
+        the move to make as (pawn,newPosition), or None to resign. box is
+        the computer box for the board on black turns, None otherwise.
+
+###############################################################################
+"""
+import random
+from types import MethodType
+
+from hexapawn.game_manager import *
+from hexapawn.board import *
+from hexapawn.computer import *
+
+class RandomPlayer():
+    """
+    Player making random valid moves.
+    """
+
+    def __init__(self,seed:int=None) -> None:
+        """
+        Parameter
+        ---------
+        seed : int
+            Seed for random generator. None for random seed.
+        """
+        self._random = random.Random(seed)
+
+    def __call__(self,board:Board,gameManager:GameManager,box:Box)->tuple:
+        color = Color.WHITE if gameManager.turnPlayer == Player.WHITE else Color.BLACK
+        moves = board.getPossibleMoves(color)
+        return self._random.choice(moves) if len(moves) > 0 else None
+
+class ComputerPlayer():
+    """
+    Black player selecting random moves from computer boxes.
+    """
+
+    def __init__(self,computer:Computer) -> None:
+        """
+        Parameter
+        ---------
+        computer : Computer
+            Computer to select moves from.
+        """
+        self._computer = computer
+
+    def __call__(self,board:Board,gameManager:GameManager,box:Box)->tuple:
+        if box == None:
+            return None
+        move = self._computer.selectRandomMove(box)
+        if move == None:
+            # all moves removed, resign
+            return None
+        return (board._getPawnInPosition(move.position),move.newPosition())
+
+class MatchRunner():
+    """
+    Plays games between two players without UI. Learning removes the last
+    black move leading to a white win, same as playing in the application.
+    """
+
+    def __init__(
+            self,
+            computer:Computer,
+            whitePlayer:MethodType,
+            blackPlayer:MethodType=None,
+            learn:bool=True,
+            board:Board=None,
+            gameManager:GameManager=None) -> None:
+        """
+        Parameter
+        ---------
+        computer : Computer
+            Computer containing boxes for black turns.
+        whitePlayer : MethodType
+            White player callback.
+        blackPlayer : MethodType
+            Black player callback. None for ComputerPlayer of computer.
+        learn : bool
+            True to remove black moves leading to white win.
+        board : Board
+            Board to play on. None to create new board.
+        gameManager : GameManager
+            Game manager to use. None to create new game manager.
+        """
+        assert not computer == None
+        assert not whitePlayer == None
+        self.computer = computer
+        self.board = board if not board == None else Board()
+        self.gameManager = gameManager if not gameManager == None else GameManager()
+        self.learn = learn
+        self._players = {
+            Player.WHITE : whitePlayer,
+            Player.BLACK : blackPlayer if not blackPlayer == None else ComputerPlayer(computer),
+        }
+        self._recordedMoves = []
+        self.removedMoveRecord = None
+        """Move removed by learning from last ended game. None if no move was removed."""
+
+    def _recordMove(self,box:Box,pawn:Pawn,newPosition:Position)->None:
+        """
+        Records box move equivalent to pawn movement.
+
+        Parameter
+        ---------
+        box : Box
+            Box for current turn.
+        pawn : Pawn
+            Pawn to be moved.
+        newPosition : Position
+            New position of moved pawn.
+        """
+        move = box.findMove(pawn.position,newPosition)
+        if not move == None:
+            self._recordedMoves.append(MoveRecord(box,move))
+
+    def _declareWinner(self,winner:Player)->None:
+        """
+        Ends game and learns from result.
+
+        Parameter
+        ---------
+        winner : Player
+            Winning player.
+        """
+        if not self.gameManager.turnPlayer == winner:
+            self.gameManager.nextPlayer()
+        self.gameManager.endGame()
+        if self.learn and winner == Player.WHITE:
+            for moveRecord in reversed(self._recordedMoves):
+                if not moveRecord.move.removed:
+                    self.computer.removeMove(moveRecord.box,moveRecord.move)
+                    self.removedMoveRecord = moveRecord
+                    break
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def reset(self)->None:
+        """
+        Resets board and game for a new game.
+        """
+        self.board.resetPawns()
+        self.gameManager.reset()
+        self._recordedMoves.clear()
+        self.removedMoveRecord = None
+
+    def step(self)->MovePawnResult:
+        """
+        Makes the move of the player to move.
+
+        Precondition: Game has not ended.
+
+        Returns
+        ---------
+        MovePawnResult : Result of move. WHITE_WIN or BLACK_WIN if the player
+        to move resigned.
+        """
+        assert not self.gameManager.ended
+        turnPlayer = self.gameManager.turnPlayer
+        box = None
+        if turnPlayer == Player.BLACK:
+            box = self.computer.getBoxForCurrentBlackTurn(
+                self.gameManager.turn,
+                self.board)
+        choice = self._players[turnPlayer](self.board,self.gameManager,box)
+        if choice == None:
+            # resigned
+            winner = Player.WHITE if turnPlayer == Player.BLACK else Player.BLACK
+            self._declareWinner(winner)
+            return MovePawnResult.WHITE_WIN if winner == Player.WHITE\
+                else MovePawnResult.BLACK_WIN
+        pawn, newPosition = choice
+        if not box == None:
+            self._recordMove(box,pawn,newPosition)
+        res = self.board.movePawn(pawn,newPosition)
+        assert not res == MovePawnResult.INVALID, "Invalid move."
+        if res == MovePawnResult.NO_WINNER:
+            self.gameManager.nextPlayer()
+        elif res == MovePawnResult.WHITE_WIN:
+            self._declareWinner(Player.WHITE)
+        else:
+            self._declareWinner(Player.BLACK)
+        return res
+
+    def playGame(self)->Player:
+        """
+        Plays a complete game from initial board.
+
+        Returns
+        ---------
+        Player : Winner.
+        """
+        self.reset()
+        while not self.gameManager.ended:
+            self.step()
+        return self.gameManager.winner
+
+    def playGames(self,count:int)->tuple:
+        """
+        Plays games.
+
+        Parameter
+        ---------
+        count : int
+            Number of games.
+
+        Returns
+        ---------
+        tuple : (white wins, black wins).
+        """
+        assert type(count) == int and count >= 0
+        blackWins = 0
+        for _ in range(count):
+            if self.playGame() == Player.BLACK:
+                blackWins += 1
+        return (count-blackWins,blackWins)
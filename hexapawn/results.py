@@ -0,0 +1,265 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for game results log.
+
+        Only the most recent games are kept in a ring buffer, win counts
+        and removed moves per box are kept as running aggregates so memory
+        does not grow with the number of games played.
+
+###############################################################################
+"""
+from collections import deque
+from typing import NamedTuple
+
+from PyQt5 import QtCore
+from PyQt5.QtCore import Qt, QModelIndex
+
+from hexapawn.game_manager import *
+from hexapawn.computer import *
+
+RESULTS_CAPACITY = 1000
+"""Default number of recent games kept."""
+
+class GameResult(NamedTuple):
+    """
+    Result of a game.
+    """
+    number: int
+    """Game number, starting from 1."""
+    winner: Player
+    """Winning player."""
+    removedBoxId: str = None
+    """ID of box whose move was removed. None if no move was removed."""
+    removedColor: MoveColor = None
+    """Color of removed move. None if no move was removed."""
+
+    def getDetails(self)->str:
+        """
+        Gets result description.
+
+        Returns
+        ---------
+        str : Winner and removed move.
+        """
+        if self.removedBoxId == None:
+            return self.winner.name
+        return "{} : Removed {} for from {}."\
+            .format(self.winner.name,self.removedColor.name,self.removedBoxId)
+
+class ResultsLog():
+    """
+    Ring buffer of recent game results with running aggregates.
+    """
+
+    def __init__(self,capacity:int=RESULTS_CAPACITY) -> None:
+        """
+        Parameter
+        ---------
+        capacity : int
+            Number of recent games kept.
+        """
+        assert type(capacity) == int and capacity > 0
+        self.capacity = capacity
+        """Number of recent games kept."""
+        self._results = deque(maxlen=capacity)
+        self.clear()
+
+    def __len__(self)->int:
+        return len(self._results)
+
+    def __getitem__(self,index:int)->GameResult:
+        return self._results[index]
+
+    def __iter__(self):
+        return iter(self._results)
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def addResult(self,winner:Player,moveRecord:MoveRecord=None)->GameResult:
+        """
+        Adds game result, dropping the oldest result if full.
+
+        Parameter
+        ---------
+        winner : Player
+            Winning player.
+        moveRecord : MoveRecord
+            Removed move. None if no move was removed.
+
+        Returns
+        ---------
+        GameResult : Added result.
+        """
+        assert not winner == None
+        self.gameCount += 1
+        self._wins[winner] += 1
+        if moveRecord == None:
+            result = GameResult(self.gameCount,winner)
+        else:
+            boxId = moveRecord.box.id
+            self._removalsByBox[boxId] = self._removalsByBox.get(boxId,0) + 1
+            self.removalCount += 1
+            result = GameResult(self.gameCount,winner,boxId,moveRecord.move.color)
+        self._results.append(result)
+        return result
+
+    def dropOldest(self)->GameResult:
+        """
+        Removes the oldest kept result. Aggregates are not changed.
+
+        Returns
+        ---------
+        GameResult : Removed result. None if log is empty.
+        """
+        if len(self._results) == 0:
+            return None
+        return self._results.popleft()
+
+    def getWins(self,player:Player)->int:
+        """
+        Gets number of games won by player.
+
+        Parameter
+        ---------
+        player : Player
+            Player.
+
+        Returns
+        ---------
+        int : Wins of player.
+        """
+        return self._wins[player]
+
+    def getWinRate(self,player:Player)->float:
+        """
+        Gets ratio of games won by player.
+
+        Parameter
+        ---------
+        player : Player
+            Player.
+
+        Returns
+        ---------
+        float : Win rate from 0 to 1. 0 if no game was played.
+        """
+        if self.gameCount == 0:
+            return 0.0
+        return self._wins[player] / self.gameCount
+
+    def getRemovals(self,boxId:str)->int:
+        """
+        Gets number of moves removed from box.
+
+        Parameter
+        ---------
+        boxId : str
+            Box ID.
+
+        Returns
+        ---------
+        int : Removed moves.
+        """
+        return self._removalsByBox.get(boxId,0)
+
+    def clear(self)->None:
+        """
+        Removes every result and resets aggregates.
+        """
+        self._results.clear()
+        self.gameCount = 0
+        """Number of games played."""
+        self.removalCount = 0
+        """Number of moves removed."""
+        self._wins = { player : 0 for player in Player }
+        self._removalsByBox = {}
+
+class ResultsModel(QtCore.QAbstractTableModel):
+    """
+    Table model of recent results of a ResultsLog, oldest first.
+    """
+
+    COLUMNS = ["Game","Winner"]
+    """Column headers."""
+
+    def __init__(self,log:ResultsLog=None,parent:QtCore.QObject=None) -> None:
+        """
+        Parameter
+        ---------
+        log : ResultsLog
+            Results log. None to create new log.
+        parent : QtCore.QObject
+            Parent object.
+        """
+        super().__init__(parent)
+        self.log = log if not log == None else ResultsLog()
+        """Results log."""
+
+    def rowCount(self,parent:QModelIndex=QModelIndex())->int:
+        return 0 if parent.isValid() else len(self.log)
+
+    def columnCount(self,parent:QModelIndex=QModelIndex())->int:
+        return 0 if parent.isValid() else len(ResultsModel.COLUMNS)
+
+    def data(self,index:QModelIndex,role:int=Qt.DisplayRole):
+        if not role == Qt.DisplayRole or not index.isValid() or index.row() >= len(self.log):
+            return None
+        result = self.log[index.row()]
+        if index.column() == 0:
+            return str(result.number)
+        return result.getDetails()
+
+    def headerData(self,section:int,orientation:Qt.Orientation,role:int=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return ResultsModel.COLUMNS[section]
+        return None
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def addResult(self,winner:Player,moveRecord:MoveRecord=None)->GameResult:
+        """
+        Adds game result to log. See ResultsLog.addResult.
+        """
+        if len(self.log) == self.log.capacity:
+            self.beginRemoveRows(QModelIndex(),0,0)
+            self.log.dropOldest()
+            self.endRemoveRows()
+        row = len(self.log)
+        self.beginInsertRows(QModelIndex(),row,row)
+        result = self.log.addResult(winner,moveRecord)
+        self.endInsertRows()
+        return result
+
+    def addResults(self,results:list)->None:
+        """
+        Adds game results to log with a single model reset, for results
+        reported in batches.
+
+        Parameter
+        ---------
+        results : list
+            (winner,removed move record) of games. See ResultsLog.addResult.
+        """
+        if len(results) == 0:
+            return
+        self.beginResetModel()
+        for winner, moveRecord in results:
+            self.log.addResult(winner,moveRecord)
+        self.endResetModel()
+
+    def clear(self)->None:
+        """
+        Clears log.
+        """
+        self.beginResetModel()
+        self.log.clear()
+        self.endResetModel()
@@ -0,0 +1,204 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for weighted move sampling implementations and
+        definitions.
+
+        Each box keeps a row of alias tables (Vose's alias method) over its
+        move slots, so sampling a move is O(1) and sampling moves for an
+        array of boxes is a single vectorised NumPy operation. Rows are
+        rebuilt incrementally when a move of the box is removed or
+        re-weighted, and built on first sampling of the box so large box
+        catalogues load without building every row.
+
+###############################################################################
+"""
+import numpy as np
+
+NO_MOVE = -1
+"""Sampled slot for box without remaining move."""
+
+class MoveSampler():
+    """
+    Weighted random move selection over boxes.
+    """
+
+    def __init__(self,boxes:list,seed:int=None) -> None:
+        """
+        Parameter
+        ---------
+        boxes : list
+            Boxes to sample from. Box index is the index in this list.
+        seed : int
+            Seed for random generator. None for random seed.
+        """
+        self._boxes = list(boxes)
+        counts = [len(box.moves) for box in self._boxes]
+        maxMoves = max(counts + [1])
+        self._counts = np.array(counts,dtype=np.int64)
+        self._weights = np.zeros((len(self._boxes),maxMoves),dtype=np.float64)
+        self._prob = np.zeros((len(self._boxes),maxMoves),dtype=np.float64)
+        self._alias = np.zeros((len(self._boxes),maxMoves),dtype=np.int64)
+        self._hasMove = np.zeros(len(self._boxes),dtype=bool)
+        self._stale = np.ones(len(self._boxes),dtype=bool)
+        self._rng = np.random.default_rng(seed)
+
+    def _loadWeights(self,boxIndex:int)->None:
+        """
+        Loads slot weights of box from its moves.
+
+        Parameter
+        ---------
+        boxIndex : int
+            Box index.
+        """
+        moves = self._boxes[boxIndex].moves
+        if len(moves) > 0:
+            self._weights[boxIndex,:len(moves)] = [move.getSelectionWeight() for move in moves]
+        self._stale[boxIndex] = False
+
+    def _buildAliasRows(self,rows:np.ndarray)->None:
+        """
+        Builds alias table rows of boxes from their slot weights at once.
+        Each pass pairs one small and one large slot of every row.
+
+        Parameter
+        ---------
+        rows : np.ndarray
+            Unique box indexes.
+        """
+        counts = self._counts[rows]
+        weights = self._weights[rows]
+        slots = np.arange(weights.shape[1])
+        total = weights.sum(axis=1)
+        hasMove = total > 0
+        scale = np.divide(counts,total,out=np.zeros(len(rows)),where=hasMove)
+        scaled = weights * scale[:,None]
+        done = ~(slots < counts[:,None])
+        # slots left unpaired are always selected (small only by rounding)
+        prob = np.ones(weights.shape,dtype=np.float64)
+        alias = np.broadcast_to(slots,weights.shape).copy()
+        allRows = np.arange(len(rows))
+        for _ in range(len(slots)):
+            small = ~done & (scaled < 1.0)
+            large = ~done & (scaled >= 1.0)
+            pairRows = allRows[small.any(axis=1) & large.any(axis=1)]
+            if len(pairRows) == 0:
+                break
+            s = small[pairRows].argmax(axis=1)
+            l = large[pairRows].argmax(axis=1)
+            prob[pairRows,s] = scaled[pairRows,s]
+            alias[pairRows,s] = l
+            done[pairRows,s] = True
+            scaled[pairRows,l] = (scaled[pairRows,l] + scaled[pairRows,s]) - 1.0
+        self._prob[rows] = prob
+        self._alias[rows] = alias
+        self._hasMove[rows] = hasMove
+
+    def _refreshStale(self,boxIndexes:np.ndarray)->None:
+        """
+        Reloads and builds alias table rows of stale boxes at once.
+
+        Parameter
+        ---------
+        boxIndexes : np.ndarray
+            Box indexes to check.
+        """
+        rows = np.unique(boxIndexes[self._stale[boxIndexes]])
+        if len(rows) == 0:
+            return
+        for boxIndex in rows.tolist():
+            self._loadWeights(boxIndex)
+        self._buildAliasRows(rows)
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def refreshBox(self,boxIndex:int)->None:
+        """
+        Reloads slot weights of box from its moves and rebuilds its alias
+        table row.
+
+        Parameter
+        ---------
+        boxIndex : int
+            Box index.
+        """
+        self._loadWeights(boxIndex)
+        self._buildAliasRows(np.array([boxIndex]))
+
+    def setWeight(self,boxIndex:int,slot:int,weight:float)->None:
+        """
+        Sets weight of move in slot of box and rebuilds its alias table
+        row. The move weight is updated so the weight is kept when the row
+        is reloaded from the moves.
+
+        Parameter
+        ---------
+        boxIndex : int
+            Box index.
+        slot : int
+            Move slot in box.
+        weight : float
+            Weight. 0 to never select the slot.
+        """
+        assert slot >= 0 and slot < self._counts[boxIndex]
+        assert weight >= 0
+        self._boxes[boxIndex].moves[slot].weight = weight
+        self.refreshBox(boxIndex)
+
+    def reset(self)->None:
+        """
+        Reloads every box on next sampling.
+        """
+        self._stale[:] = True
+
+    def sample(self,boxIndex:int)->int:
+        """
+        Samples move slot of box.
+
+        Parameter
+        ---------
+        boxIndex : int
+            Box index.
+
+        Returns
+        ---------
+        int : Move slot. NO_MOVE if box has no remaining move.
+        """
+        if self._stale[boxIndex]:
+            self.refreshBox(boxIndex)
+        if not self._hasMove[boxIndex]:
+            return NO_MOVE
+        u = self._rng.random() * self._counts[boxIndex]
+        slot = int(u)
+        if (u - slot) < self._prob[boxIndex,slot]:
+            return slot
+        return int(self._alias[boxIndex,slot])
+
+    def sampleBatch(self,boxIndexes)->np.ndarray:
+        """
+        Samples a move slot for each box index.
+
+        Parameter
+        ---------
+        boxIndexes : Any
+            Array-like of box indexes.
+
+        Returns
+        ---------
+        np.ndarray : Move slots. NO_MOVE for boxes without remaining move.
+        """
+        boxIndexes = np.asarray(boxIndexes,dtype=np.int64)
+        self._refreshStale(boxIndexes)
+        u = self._rng.random(len(boxIndexes)) * self._counts[boxIndexes]
+        slots = u.astype(np.int64)
+        accept = (u - slots) < self._prob[boxIndexes,slots]
+        slots = np.where(accept,slots,self._alias[boxIndexes,slots])
+        slots[~self._hasMove[boxIndexes]] = NO_MOVE
+        return slots
@@ -0,0 +1,402 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for asyncio hexapawn game server.
+
+        Each TCP connection is a game session where the client plays white
+        and black moves come from a computer shared by every session.
+        Requests and responses are JSON objects, one per line. Boards are
+        sent as board keys (see Board.getKey).
+
+        Requests:
+            {"op": "new"}
+                Starts a new game.
+            {"op": "move", "from": [row, col], "to": [row, col]}
+                Moves white pawn. Black answers in the same response.
+
+        Responses:
+            {"ok": true, "board": key, "turn": turn, "black": [[row, col],
+             [row, col]] or null, "winner": "WHITE", "BLACK" or null}
+            {"ok": false, "error": description}
+
+        Run with:
+            python -m hexapawn.server --port 8765
+
+###############################################################################
+"""
+import argparse
+import asyncio
+import json
+import threading
+
+from hexapawn.game_manager import *
+from hexapawn.board import *
+from hexapawn.computer import *
+
+DEFAULT_HOST = "127.0.0.1"
+"""Default listening host."""
+
+DEFAULT_PORT = 8765
+"""Default listening port."""
+
+DEFAULT_MAX_SESSIONS = 10000
+"""Default maximum number of concurrent sessions."""
+
+DEFAULT_IDLE_TIMEOUT = 60.0
+"""Default seconds without request before session is evicted."""
+
+MAX_REQUEST_SIZE = 1024
+"""Maximum request line size in bytes."""
+
+INITIAL_BOARD_KEY = Board().getKey()
+"""Board key of initial pawn positions."""
+
+_scratch = threading.local()
+"""Scratch board of thread, see Session._getBoard."""
+
+class Session():
+    """
+    Game session of one connection. The board is kept as its board key and
+    decoded into a scratch board shared by the sessions of the thread for
+    each request, so an idle session holds a few integers only.
+    """
+
+    __slots__ = ("computer","learn","key","turn","winner","_moveRecords")
+
+    def __init__(self,computer:Computer,learn:bool) -> None:
+        """
+        Parameter
+        ---------
+        computer : Computer
+            Shared computer for black moves.
+        learn : bool
+            True to remove black moves leading to white win.
+        """
+        self.computer = computer
+        """Shared computer for black moves."""
+        self.learn = learn
+        """True to remove black moves leading to white win."""
+        self.key = INITIAL_BOARD_KEY
+        """Board key. See Board.getKey."""
+        self.turn = 1
+        """Turn. White moves on odd turns."""
+        self.winner = None
+        """Winning player. None if game has not ended."""
+        self._moveRecords = ()
+
+    @staticmethod
+    def _getBoard(key:int)->Board:
+        """
+        Gets scratch board of thread set to board key.
+        """
+        board = getattr(_scratch,"board",None)
+        if board == None:
+            board = Board()
+            _scratch.board = board
+        board.setPawnsFromKey(key)
+        return board
+
+    def _declareWinner(self,winner:Player)->None:
+        """
+        Ends game and learns from result, same as MatchRunner.
+
+        Parameter
+        ---------
+        winner : Player
+            Winning player.
+        """
+        self.winner = winner
+        if self.learn and winner == Player.WHITE:
+            for moveRecord in reversed(self._moveRecords):
+                if not moveRecord.move.removed:
+                    self.computer.removeMove(moveRecord.box,moveRecord.move)
+                    break
+
+    def _moveBlack(self,board:Board)->list:
+        """
+        Moves black pawn with move selected from computer box. Black
+        resigns if there is no box or remaining move.
+
+        Parameter
+        ---------
+        board : Board
+            Board set to session board.
+
+        Returns
+        ---------
+        list : Black move [[row, col], [row, col]]. None if black resigned.
+        """
+        box = self.computer.getBoxForCurrentBlackTurn(self.turn,board)
+        move = self.computer.selectRandomMove(box) if not box == None else None
+        if move == None:
+            # resigned, white wins on white turn
+            self.turn += 1
+            self._declareWinner(Player.WHITE)
+            return None
+        self._moveRecords += (MoveRecord(box,move),)
+        newPosition = move.newPosition()
+        res = board.movePawn(board._getPawnInPosition(move.position),newPosition)
+        if res == MovePawnResult.NO_WINNER:
+            self.turn += 1
+        elif res == MovePawnResult.BLACK_WIN:
+            self._declareWinner(Player.BLACK)
+        else:
+            self.turn += 1
+            self._declareWinner(Player.WHITE)
+        return [[move.position.row,move.position.col],[newPosition.row,newPosition.col]]
+
+    def _getResponse(self,blackMove:list)->dict:
+        """
+        Creates response of session state.
+        """
+        return {
+            "ok" : True,
+            "board" : self.key,
+            "turn" : self.turn,
+            "black" : blackMove,
+            "winner" : None if self.winner == None else self.winner.name,
+        }
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def newGame(self)->dict:
+        """
+        Starts new game.
+
+        Returns
+        ---------
+        dict : Response.
+        """
+        self.key = INITIAL_BOARD_KEY
+        self.turn = 1
+        self.winner = None
+        self._moveRecords = ()
+        return self._getResponse(None)
+
+    def moveWhite(self,fromRow:int,fromCol:int,toRow:int,toCol:int)->dict:
+        """
+        Moves white pawn then black pawn if game has not ended.
+
+        Parameter
+        ---------
+        fromRow, fromCol : int
+            Position of white pawn to move.
+        toRow, toCol : int
+            New position of white pawn.
+
+        Returns
+        ---------
+        dict : Response.
+        """
+        if not self.winner == None:
+            raise ValueError("Game has ended.")
+        if not all(type(v) == int and v >= 0 and v < SIZE for v in (fromRow,fromCol,toRow,toCol)):
+            raise ValueError("Invalid position.")
+        board = Session._getBoard(self.key)
+        whiteMove = next(((pawn,newPosition) for pawn, newPosition\
+                          in board.getPossibleMoves(Color.WHITE)\
+                          if pawn.inPosition(Position(fromRow,fromCol)) and\
+                             arePositionsEqual(newPosition,Position(toRow,toCol))),
+                         None)
+        if whiteMove == None:
+            raise ValueError("Invalid move.")
+        blackMove = None
+        res = board.movePawn(*whiteMove)
+        if res == MovePawnResult.NO_WINNER:
+            self.turn += 1
+            blackMove = self._moveBlack(board)
+        elif res == MovePawnResult.WHITE_WIN:
+            self._declareWinner(Player.WHITE)
+        else:
+            self.turn += 1
+            self._declareWinner(Player.BLACK)
+        self.key = board.getKey()
+        return self._getResponse(blackMove)
+
+    def handle(self,request:dict)->dict:
+        """
+        Handles request.
+
+        Parameter
+        ---------
+        request : dict
+            Decoded request.
+
+        Returns
+        ---------
+        dict : Response.
+        """
+        if not isinstance(request,dict):
+            raise ValueError("Request must be an object.")
+        op = request.get("op")
+        if op == "new":
+            return self.newGame()
+        elif op == "move":
+            fromPosition = request.get("from")
+            toPosition = request.get("to")
+            if not (type(fromPosition) == list and len(fromPosition) == 2 and\
+                    type(toPosition) == list and len(toPosition) == 2):
+                raise ValueError("Invalid position.")
+            return self.moveWhite(fromPosition[0],fromPosition[1],toPosition[0],toPosition[1])
+        raise ValueError("Unknown op.")
+
+class GameServer():
+    """
+    Asyncio TCP server hosting game sessions.
+    """
+
+    def __init__(
+            self,
+            computer:Computer=None,
+            host:str=DEFAULT_HOST,
+            port:int=DEFAULT_PORT,
+            maxSessions:int=DEFAULT_MAX_SESSIONS,
+            idleTimeout:float=DEFAULT_IDLE_TIMEOUT,
+            learn:bool=True) -> None:
+        """
+        Parameter
+        ---------
+        computer : Computer
+            Computer shared by sessions. None to create new computer.
+        host : str
+            Listening host.
+        port : int
+            Listening port. 0 for any free port.
+        maxSessions : int
+            Maximum number of concurrent sessions. Connections over the
+            limit are answered with an error and closed.
+        idleTimeout : float
+            Seconds without request before session is evicted.
+        learn : bool
+            True to remove black moves leading to white win.
+        """
+        assert type(maxSessions) == int and maxSessions > 0
+        assert idleTimeout > 0
+        self.computer = computer if not computer == None else Computer()
+        self.host = host
+        self.port = port
+        self.maxSessions = maxSessions
+        self.idleTimeout = idleTimeout
+        self.learn = learn
+        self.sessionCount = 0
+        self._server = None
+
+    async def _send(self,writer:asyncio.StreamWriter,response:dict)->None:
+        """
+        Sends response. Waits while the transport buffer is full so slow
+        clients do not grow memory.
+        """
+        writer.write(json.dumps(response,separators=(",",":")).encode() + b"\n")
+        await writer.drain()
+
+    @staticmethod
+    async def _close(writer:asyncio.StreamWriter)->None:
+        """
+        Closes connection and waits until its transport is closed.
+        """
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _handleConnection(
+            self,
+            reader:asyncio.StreamReader,
+            writer:asyncio.StreamWriter)->None:
+        """
+        Serves session of connection until closed, evicted or failed.
+        """
+        if self.sessionCount >= self.maxSessions:
+            try:
+                await self._send(writer,{"ok" : False, "error" : "Server full."})
+            finally:
+                await self._close(writer)
+            return
+        self.sessionCount += 1
+        session = Session(self.computer,self.learn)
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(),self.idleTimeout)
+                except asyncio.TimeoutError:
+                    await self._send(writer,{"ok" : False, "error" : "Idle timeout."})
+                    break
+                if len(line) == 0:
+                    break
+                try:
+                    response = session.handle(json.loads(line))
+                except ValueError as err:
+                    response = {"ok" : False, "error" : str(err)}
+                await self._send(writer,response)
+        except (ConnectionError,ValueError):
+            # disconnected or request line over MAX_REQUEST_SIZE
+            pass
+        finally:
+            self.sessionCount -= 1
+            await self._close(writer)
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    async def start(self)->int:
+        """
+        Starts listening.
+
+        Returns
+        ---------
+        int : Listening port.
+        """
+        self._server = await asyncio.start_server(
+            self._handleConnection,
+            self.host,
+            self.port,
+            limit=MAX_REQUEST_SIZE)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serveForever(self)->None:
+        """
+        Starts listening and serves until cancelled.
+        """
+        if self._server == None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self)->None:
+        """
+        Stops listening.
+        """
+        if not self._server == None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hexapawn game server.")
+    parser.add_argument("--host",default=DEFAULT_HOST)
+    parser.add_argument("--port",type=int,default=DEFAULT_PORT)
+    parser.add_argument("--max-sessions",type=int,default=DEFAULT_MAX_SESSIONS)
+    parser.add_argument("--idle-timeout",type=float,default=DEFAULT_IDLE_TIMEOUT)
+    parser.add_argument("--fast",action="store_true",
+                        help="Skip validation in hot paths. See setValidationMode.")
+    args = parser.parse_args()
+    if args.fast:
+        setValidationMode(ValidationMode.FAST)
+    server = GameServer(
+        host=args.host,
+        port=args.port,
+        maxSessions=args.max_sessions,
+        idleTimeout=args.idle_timeout)
+    try:
+        asyncio.run(server.serveForever())
+    except KeyboardInterrupt:
+        pass
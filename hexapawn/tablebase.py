@@ -0,0 +1,666 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for solved-position tablebase implementations and
+        definitions.
+
+        Positions are indexed densely by board key (see Board.getKey) and
+        player to move:
+
+            index = key * 2 + (0 if white to move else 1)
+
+        Results are stored with 2 bits per index, 4 indexes per byte, with
+        an optional distance-to-end side array of 1 byte per index.
+
+###############################################################################
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from enum import IntEnum
+import mmap
+import os
+import struct
+
+from hexapawn.board import *
+from hexapawn.game_manager import Player
+
+TABLEBASE_MAGIC = b"HXTB"
+"""Tablebase file magic."""
+
+TABLEBASE_VERSION = 1
+"""Tablebase file format version."""
+
+TABLEBASE_HEADER = struct.Struct("<4sBBBxQ")
+"""Tablebase file header : magic, version, board size, flags, index count."""
+
+FLAG_HAS_DISTANCE = 0x01
+"""Header flag indicating the distance-to-end side array is present."""
+
+PROGRESS_FILE_SUFFIX = ".progress"
+"""Suffix of file recording solved slices while generating tablebase file."""
+
+DEFAULT_CHUNK_SIZE = 4096
+"""Default number of positions solved per worker task."""
+
+class Result(IntEnum):
+    """
+    Solved result for the player to move.
+    """
+    UNKNOWN = 0
+    WIN     = 1
+    LOSS    = 2
+
+def getIndexCount(size:int=SIZE)->int:
+    """
+    Gets the number of position indexes for board size.
+
+    Parameter
+    ---------
+    size : int
+        Board size.
+
+    Returns
+    ---------
+    int : Index count.
+    """
+    return (3**(size*size)) * 2
+
+def getPositionIndex(key:int,turnPlayer:Player)->int:
+    """
+    Gets position index of board key and player to move.
+
+    Parameter
+    ---------
+    key : int
+        Board key.
+    turnPlayer : Player
+        Player to move.
+
+    Returns
+    ---------
+    int : Position index.
+    """
+    return key * 2 + (0 if turnPlayer == Player.WHITE else 1)
+
+def _decodeKey(key:int,size:int)->list:
+    """
+    Decodes board key into flat list of tile codes.
+
+    Parameter
+    ---------
+    key : int
+        Board key.
+    size : int
+        Board size.
+
+    Returns
+    ---------
+    list : Tile codes, index row*size+col.
+    """
+    tiles = []
+    for _ in range(size*size):
+        key, tile = divmod(key,3)
+        tiles.append(tile)
+    return tiles
+
+def _getSuccessorKeys(key:int,tiles:list,size:int,whiteToMove:bool)->list:
+    """
+    Gets board keys after every valid move of player to move.
+
+    Parameter
+    ---------
+    key : int
+        Board key.
+    tiles : list
+        Decoded tile codes of key.
+    size : int
+        Board size.
+    whiteToMove : bool
+        True if white to move.
+
+    Returns
+    ---------
+    list : Board keys after move.
+    """
+    own, rival, forwardInc = (TILE_WHITE, TILE_BLACK, -1)\
+        if whiteToMove else (TILE_BLACK, TILE_WHITE, 1)
+    successors = []
+    for square in range(size*size):
+        if not tiles[square] == own:
+            continue
+        row, col = divmod(square,size)
+        newRow = row + forwardInc
+        if newRow < 0 or newRow >= size:
+            continue
+        removed = key - own * 3**square
+        front = newRow*size + col
+        if tiles[front] == TILE_EMPTY:
+            # moving forward
+            successors.append(removed + own * 3**front)
+        for newCol in (col-1, col+1):
+            if newCol < 0 or newCol >= size:
+                continue
+            diagonal = newRow*size + newCol
+            if tiles[diagonal] == rival:
+                # moving diagonal to take rival pawn
+                successors.append(removed + (own - rival) * 3**diagonal)
+    return successors
+
+def _isRivalOnGoal(tiles:list,size:int,whiteToMove:bool)->bool:
+    """
+    Checks if a rival pawn of player to move reached the other side.
+    """
+    if whiteToMove:
+        return any(tile == TILE_BLACK for tile in tiles[(size-1)*size:])
+    return any(tile == TILE_WHITE for tile in tiles[:size])
+
+def solvePosition(key:int,whiteToMove:bool,size:int,lookup)->tuple:
+    """
+    Solves position from already solved successor positions.
+
+    Parameter
+    ---------
+    key : int
+        Board key.
+    whiteToMove : bool
+        True if white to move.
+    size : int
+        Board size.
+    lookup : MethodType
+        Callback taking position index of successor and returning solved
+        (Result,distance). Every successor must already be solved.
+
+    Returns
+    ---------
+    tuple : (Result,distance) for player to move.
+    """
+    tiles = _decodeKey(key,size)
+    if _isRivalOnGoal(tiles,size,whiteToMove):
+        return (Result.LOSS, 0)
+    successors = _getSuccessorKeys(key,tiles,size,whiteToMove)
+    if len(successors) == 0:
+        # no pawn or no possible move
+        return (Result.LOSS, 0)
+    rivalSide = 1 if whiteToMove else 0
+    winDistance = None
+    lossDistance = 0
+    for successor in successors:
+        result, distance = lookup(successor*2 + rivalSide)
+        assert not result == Result.UNKNOWN, "Successor not solved."
+        if result == Result.LOSS:
+            # rival loses after this move
+            if winDistance == None or distance+1 < winDistance:
+                winDistance = distance+1
+        elif distance+1 > lossDistance:
+            lossDistance = distance+1
+    if not winDistance == None:
+        return (Result.WIN, winDistance)
+    return (Result.LOSS, lossDistance)
+
+class Tablebase():
+    """
+    Solved position results packed in 2 bits per position index.
+    """
+
+    def __init__(self,size:int=SIZE,hasDistance:bool=True) -> None:
+        """
+        Creates empty in-memory tablebase. All results are UNKNOWN.
+
+        Parameter
+        ---------
+        size : int
+            Board size.
+        hasDistance : bool
+            True to include distance-to-end side array.
+        """
+        assert type(size) == int and size > 1
+        self.size = size
+        self.count = getIndexCount(size)
+        self.hasDistance = hasDistance
+        self._mmap = None
+        self._results = bytearray((self.count+3)//4)
+        self._distances = bytearray(self.count) if hasDistance else None
+
+    @staticmethod
+    def _dataLength(count:int,hasDistance:bool)->int:
+        """
+        Gets length of data following header.
+        """
+        return ((count+3)//4) + (count if hasDistance else 0)
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    @staticmethod
+    def create(path:str,size:int=SIZE,hasDistance:bool=True)->"Tablebase":
+        """
+        Creates tablebase file with all results UNKNOWN and opens it
+        writable.
+
+        Parameter
+        ---------
+        path : str
+            Tablebase file path.
+        size : int
+            Board size.
+        hasDistance : bool
+            True to include distance-to-end side array.
+
+        Returns
+        ---------
+        Tablebase : Writable tablebase backed by file.
+        """
+        count = getIndexCount(size)
+        flags = FLAG_HAS_DISTANCE if hasDistance else 0
+        with open(path,"wb") as f:
+            f.write(TABLEBASE_HEADER.pack(
+                TABLEBASE_MAGIC,TABLEBASE_VERSION,size,flags,count))
+            f.truncate(TABLEBASE_HEADER.size + Tablebase._dataLength(count,hasDistance))
+        return Tablebase.open(path,writable=True)
+
+    @staticmethod
+    def open(path:str,writable:bool=False)->"Tablebase":
+        """
+        Opens tablebase file through mmap. Pages are loaded on access and
+        shared between processes opening the same file.
+
+        Parameter
+        ---------
+        path : str
+            Tablebase file path.
+        writable : bool
+            True to write results through to file.
+
+        Returns
+        ---------
+        Tablebase : Tablebase backed by file.
+        """
+        with open(path,"r+b" if writable else "rb") as f:
+            mapped = mmap.mmap(f.fileno(),0,
+                access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        magic, version, size, flags, count = TABLEBASE_HEADER.unpack_from(mapped,0)
+        hasDistance = bool(flags & FLAG_HAS_DISTANCE)
+        assert magic == TABLEBASE_MAGIC, "Not a tablebase file."
+        assert version == TABLEBASE_VERSION, "Unsupported tablebase version."
+        assert count == getIndexCount(size), "Invalid tablebase index count."
+        assert len(mapped) == TABLEBASE_HEADER.size +\
+            Tablebase._dataLength(count,hasDistance), "Truncated tablebase file."
+        tablebase = Tablebase.__new__(Tablebase)
+        tablebase.size = size
+        tablebase.count = count
+        tablebase.hasDistance = hasDistance
+        tablebase._mmap = mapped
+        view = memoryview(mapped)
+        resultsEnd = TABLEBASE_HEADER.size + (count+3)//4
+        tablebase._results = view[TABLEBASE_HEADER.size:resultsEnd]
+        tablebase._distances = view[resultsEnd:] if hasDistance else None
+        return tablebase
+
+    def save(self,path:str)->None:
+        """
+        Saves tablebase to file.
+
+        Parameter
+        ---------
+        path : str
+            Tablebase file path.
+        """
+        flags = FLAG_HAS_DISTANCE if self.hasDistance else 0
+        with open(path,"wb") as f:
+            f.write(TABLEBASE_HEADER.pack(
+                TABLEBASE_MAGIC,TABLEBASE_VERSION,self.size,flags,self.count))
+            f.write(self._results)
+            if self.hasDistance:
+                f.write(self._distances)
+
+    def flush(self)->None:
+        """
+        Flushes written results to file. Does nothing for in-memory tablebase.
+        """
+        if not self._mmap == None:
+            self._mmap.flush()
+
+    def close(self)->None:
+        """
+        Closes file backing tablebase. Does nothing for in-memory tablebase.
+        """
+        if not self._mmap == None:
+            self._results.release()
+            if self.hasDistance:
+                self._distances.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def getResult(self,index:int)->Result:
+        """
+        Gets result of position index.
+
+        Parameter
+        ---------
+        index : int
+            Position index.
+
+        Returns
+        ---------
+        Result : Result for player to move.
+        """
+        return Result((self._results[index >> 2] >> ((index & 3) << 1)) & 3)
+
+    def setResult(self,index:int,result:Result)->None:
+        """
+        Sets result of position index.
+
+        Parameter
+        ---------
+        index : int
+            Position index.
+        result : Result
+            Result for player to move.
+        """
+        shift = (index & 3) << 1
+        byte = index >> 2
+        self._results[byte] = (self._results[byte] & ~(3 << shift) & 0xFF) |\
+            (int(result) << shift)
+
+    def getDistance(self,index:int)->int:
+        """
+        Gets number of moves to end of game with best play of both players.
+
+        Parameter
+        ---------
+        index : int
+            Position index.
+
+        Returns
+        ---------
+        int : Distance to end. None if tablebase has no distance array.
+        """
+        return self._distances[index] if self.hasDistance else None
+
+    def setDistance(self,index:int,distance:int)->None:
+        """
+        Sets number of moves to end of game. Ignored if tablebase has no
+        distance array.
+
+        Parameter
+        ---------
+        index : int
+            Position index.
+        distance : int
+            Distance to end.
+        """
+        if self.hasDistance:
+            self._distances[index] = distance
+
+    def lookup(self,board:Board,turnPlayer:Player)->tuple:
+        """
+        Looks up solved result of board.
+
+        Parameter
+        ---------
+        board : Board
+            Board to lookup.
+        turnPlayer : Player
+            Player to move.
+
+        Returns
+        ---------
+        tuple : (Result,distance) for player to move.
+        """
+        assert self.size == SIZE, "Tablebase board size mismatch."
+        index = getPositionIndex(board.getKey(),turnPlayer)
+        return (self.getResult(index),self.getDistance(index))
+
+def generateTablebase(size:int=SIZE,hasDistance:bool=True)->Tablebase:
+    """
+    Solves every position index of board size into in-memory tablebase.
+
+    Parameter
+    ---------
+    size : int
+        Board size.
+    hasDistance : bool
+        True to include distance-to-end side array.
+
+    Returns
+    ---------
+    Tablebase : Solved tablebase.
+    """
+    tablebase = Tablebase(size,hasDistance)
+    distances = bytearray(tablebase.count)
+
+    def solve(index:int)->tuple:
+        result = tablebase.getResult(index)
+        if result == Result.UNKNOWN:
+            key, side = divmod(index,2)
+            result, distance = solvePosition(key,side == 0,size,solve)
+            tablebase.setResult(index,result)
+            distances[index] = distance
+        return (result, distances[index])
+
+    for index in range(tablebase.count):
+        solve(index)
+    if hasDistance:
+        tablebase._distances = distances
+    return tablebase
+
+def _getSuffixCounts(size:int)->list:
+    """
+    Counts tile assignments of board suffixes by pawn count and advancement
+    (sum of rows each pawn moved forward).
+
+    Parameter
+    ---------
+    size : int
+        Board size.
+
+    Returns
+    ---------
+    list : Dict of number of assignments by (pawnCount,advancement) of
+    squares square..size*size-1, by square.
+    """
+    counts = [None] * (size*size) + [{ (0,0) : 1 }]
+    for square in range(size*size-1,-1,-1):
+        row = square // size
+        squareCounts = {}
+        for (pawnCount, advancement), count in counts[square+1].items():
+            for pawns, adv in ((0,0),(1,(size-1)-row),(1,row)):
+                slice = (pawnCount+pawns,advancement+adv)
+                squareCounts[slice] = squareCounts.get(slice,0) + count
+        counts[square] = squareCounts
+    return counts
+
+def _getSlices(size:int)->list:
+    """
+    Gets slices of position indexes in solving order, without listing
+    their positions (see _iterSliceKeys).\n
+    A slice holds positions with the same pawn count and advancement (sum of
+    rows each pawn moved forward). Every move advances a pawn and captures
+    only reduce pawn count, so positions in a slice only depend on slices
+    with lower pawn count or higher advancement. Slices are ordered by
+    pawn count ascending then advancement descending.
+
+    Parameter
+    ---------
+    size : int
+        Board size.
+
+    Returns
+    ---------
+    list : List of ((pawnCount,advancement),number of position indexes).
+    """
+    counts = _getSuffixCounts(size)[0]
+    return sorted(((slice, count*2) for slice, count in counts.items()),
+                  key=lambda x: (x[0][0],-x[0][1]))
+
+def _iterSliceKeys(size:int,slice:tuple,suffixCounts:list):
+    """
+    Yields board keys of slice, visiting only tile assignments that can
+    still complete the slice, so memory does not grow with slice size.
+
+    Parameter
+    ---------
+    size : int
+        Board size.
+    slice : tuple
+        (pawnCount,advancement). See _getSlices.
+    suffixCounts : list
+        See _getSuffixCounts.
+
+    Returns
+    ---------
+    Generator of board keys.
+    """
+    squareCount = size*size
+    stack = [(0,0,slice[0],slice[1])]
+    while len(stack) > 0:
+        square, key, pawnCount, advancement = stack.pop()
+        if square == squareCount:
+            yield key
+            continue
+        row = square // size
+        nextCounts = suffixCounts[square+1]
+        for tile, pawns, adv in ((TILE_EMPTY,0,0),(TILE_WHITE,1,(size-1)-row),(TILE_BLACK,1,row)):
+            if (pawnCount-pawns,advancement-adv) in nextCounts:
+                stack.append((square+1,key + tile * 3**square,pawnCount-pawns,advancement-adv))
+
+_workerTablebases = {}
+"""Tablebase files opened by worker process, by path."""
+
+def _solveChunk(path:str,indexes:list)->tuple:
+    """
+    Worker task solving positions from solved slices in tablebase file.
+
+    Parameter
+    ---------
+    path : str
+        Tablebase file path.
+    indexes : list
+        Position indexes to solve.
+
+    Returns
+    ---------
+    tuple : (indexes,results,distances) with results and distances as bytes.
+    """
+    tablebase = _workerTablebases.get(path)
+    if tablebase == None:
+        tablebase = Tablebase.open(path)
+        _workerTablebases[path] = tablebase
+    lookup = lambda index : (tablebase.getResult(index),tablebase.getDistance(index) or 0)
+    results = bytearray(len(indexes))
+    distances = bytearray(len(indexes))
+    for i in range(len(indexes)):
+        key, side = divmod(indexes[i],2)
+        result, distance = solvePosition(key,side == 0,tablebase.size,lookup)
+        results[i] = result
+        distances[i] = distance
+    return (indexes,bytes(results),bytes(distances))
+
+def _readProgress(progressPath:str)->set:
+    """
+    Reads solved slices from progress file.
+    """
+    done = set()
+    with open(progressPath,"r") as f:
+        for line in f:
+            tokens = line.split()
+            if len(tokens) == 2:
+                done.add((int(tokens[0]),int(tokens[1])))
+    return done
+
+def generateTablebaseFile(
+        path:str,
+        size:int=SIZE,
+        hasDistance:bool=True,
+        maxWorkers:int=None,
+        chunkSize:int=DEFAULT_CHUNK_SIZE,
+        progressCallback=None)->Tablebase:
+    """
+    Solves every position index of board size into tablebase file using a
+    process pool. Each slice (see _getSlices) is split into chunks solved in
+    parallel by workers reading lower slices from the shared file mapping.
+    Slice positions are streamed into chunks with a bounded number of
+    pending chunks, so memory of the parent process depends on chunkSize
+    and maxWorkers only, not on board size.\n
+    Solved slices are recorded in a progress file next to the tablebase
+    file. If generation is interrupted, calling again with the same path
+    resumes from the last solved slice. The progress file is deleted once
+    every slice is solved.
+
+    Parameter
+    ---------
+    path : str
+        Tablebase file path.
+    size : int
+        Board size.
+    hasDistance : bool
+        True to include distance-to-end side array.
+    maxWorkers : int
+        Number of worker processes. None for number of processors.
+    chunkSize : int
+        Number of positions per worker task.
+    progressCallback : MethodType
+        Called after each slice with (solvedPositions,totalPositions).
+        Can be None.
+
+    Returns
+    ---------
+    Tablebase : Solved tablebase opened read-only.
+    """
+    assert type(chunkSize) == int and chunkSize > 0
+    progressPath = path + PROGRESS_FILE_SUFFIX
+    if os.path.exists(path) and not os.path.exists(progressPath):
+        # already generated
+        return Tablebase.open(path)
+    if os.path.exists(path):
+        done = _readProgress(progressPath)
+        tablebase = Tablebase.open(path,writable=True)
+        assert tablebase.size == size and tablebase.hasDistance == hasDistance,\
+            "Tablebase file does not match generation settings."
+    else:
+        open(progressPath,"w").close()
+        done = set()
+        tablebase = Tablebase.create(path,size,hasDistance)
+    slices = _getSlices(size)
+    suffixCounts = _getSuffixCounts(size)
+    solvedCount = sum(count for slice, count in slices if slice in done)
+    maxPending = 2 * (maxWorkers if not maxWorkers == None else (os.cpu_count() or 1))
+
+    def storeChunk(future)->None:
+        chunkIndexes, results, distances = future.result()
+        for i in range(len(chunkIndexes)):
+            tablebase.setResult(chunkIndexes[i],results[i])
+            tablebase.setDistance(chunkIndexes[i],distances[i])
+
+    with ProcessPoolExecutor(max_workers=maxWorkers) as executor:
+        for slice, count in slices:
+            if slice in done:
+                continue
+            pending = deque()
+            chunk = []
+            for key in _iterSliceKeys(size,slice,suffixCounts):
+                chunk.append(key*2)
+                chunk.append(key*2+1)
+                if len(chunk) >= chunkSize:
+                    pending.append(executor.submit(_solveChunk,path,chunk))
+                    chunk = []
+                    if len(pending) >= maxPending:
+                        storeChunk(pending.popleft())
+            if len(chunk) > 0:
+                pending.append(executor.submit(_solveChunk,path,chunk))
+            while len(pending) > 0:
+                storeChunk(pending.popleft())
+            tablebase.flush()
+            with open(progressPath,"a") as f:
+                f.write("{} {}\n".format(slice[0],slice[1]))
+            solvedCount += count
+            if not progressCallback == None:
+                progressCallback(solvedCount,tablebase.count)
+    tablebase.close()
+    os.remove(progressPath)
+    return Tablebase.open(path)
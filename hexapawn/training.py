@@ -0,0 +1,151 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Source file for background training of computer.
+
+        TrainingWorker plays games with MatchRunner in a worker thread and
+        reports progress at a fixed refresh rate through queued signals, so
+        the UI thread repaints at most refreshRate times per second whatever
+        the number of games played. Reports carry a snapshot of removed
+        moves, so the UI thread paints boxes without reading moves the
+        worker thread is changing.
+
+        Sample:
+            thread = QtCore.QThread()
+            worker = TrainingWorker(computer,1000)
+            worker.moveToThread(thread)
+            thread.started.connect(worker.run)
+            worker.finished.connect(thread.quit)
+            worker.progress.connect(onProgress)
+            thread.start()
+
+###############################################################################
+"""
+import time
+from types import MethodType
+from typing import NamedTuple
+
+from PyQt5 import QtCore
+
+from hexapawn.game_manager import *
+from hexapawn.computer import *
+from hexapawn.match_runner import MatchRunner, RandomPlayer
+
+TRAINING_REFRESH_RATE = 10
+"""Default number of progress reports per second."""
+
+class TrainingProgress(NamedTuple):
+    """
+    Training progress since last report.
+    """
+    gamesPlayed: int
+    """Number of games played so far."""
+    games: int
+    """Number of games to play."""
+    results: list
+    """(winner,removed move record) of games since last report. Removed move
+    record is None if no move was removed."""
+    learningVersion: int
+    """Computer learning version. See Computer.getLearningVersion."""
+    removedMasks: tuple
+    """Removed move mask of each box by box index when reported. See
+    Computer.getRemovedMasks."""
+
+class TrainingWorker(QtCore.QObject):
+    """
+    Plays games against a white player and learns from them. Computer must
+    not be modified by other threads while training.
+    """
+
+    progress = QtCore.pyqtSignal(object)
+    """Emitted with TrainingProgress at most refreshRate times per second and
+    once when training ends."""
+
+    finished = QtCore.pyqtSignal(int)
+    """Emitted with number of games played when training ends."""
+
+    def __init__(
+            self,
+            computer:Computer,
+            games:int,
+            whitePlayer:MethodType=None,
+            refreshRate:float=TRAINING_REFRESH_RATE,
+            parent:QtCore.QObject=None) -> None:
+        """
+        Parameter
+        ---------
+        computer : Computer
+            Computer to train.
+        games : int
+            Number of games to play.
+        whitePlayer : MethodType
+            White player callback. None for RandomPlayer.
+        refreshRate : float
+            Maximum number of progress reports per second.
+        parent : QtCore.QObject
+            Parent object.
+        """
+        super().__init__(parent)
+        assert type(games) == int and games >= 0
+        assert refreshRate > 0
+        self.games = games
+        """Number of games to play."""
+        self.refreshRate = refreshRate
+        """Maximum number of progress reports per second."""
+        self._runner = MatchRunner(
+            computer,
+            whitePlayer if not whitePlayer == None else RandomPlayer())
+        self._stopRequested = False
+
+    def _reportProgress(self,gamesPlayed:int,results:list)->None:
+        """
+        Emits progress.
+
+        Parameter
+        ---------
+        gamesPlayed : int
+            Number of games played so far.
+        results : list
+            Results since last report.
+        """
+        computer = self._runner.computer
+        self.progress.emit(TrainingProgress(
+            gamesPlayed,
+            self.games,
+            results,
+            computer.getLearningVersion(),
+            computer.getRemovedMasks()))
+
+    ######################################################################
+    #                          public functions                          #
+    ######################################################################
+
+    def run(self)->None:
+        """
+        Plays games until done or stopped. Called in worker thread.
+        """
+        interval = 1.0 / self.refreshRate
+        lastReport = time.monotonic()
+        results = []
+        gamesPlayed = 0
+        while gamesPlayed < self.games and not self._stopRequested:
+            winner = self._runner.playGame()
+            results.append((winner,self._runner.removedMoveRecord))
+            gamesPlayed += 1
+            now = time.monotonic()
+            if now - lastReport >= interval:
+                self._reportProgress(gamesPlayed,results)
+                results = []
+                lastReport = now
+        self._reportProgress(gamesPlayed,results)
+        self.finished.emit(gamesPlayed)
+
+    def stop(self)->None:
+        """
+        Requests training to stop after current game. Thread safe.
+        """
+        self._stopRequested = True
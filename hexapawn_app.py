@@ -12,24 +12,31 @@
 
 ###############################################################################
 """
-import random
 from functools import partial
 from PyQt5 import QtWidgets, QtCore
-from PyQt5.QtWidgets import QScrollArea
 
 from hexapawn.game_manager import *
 from hexapawn.board import *
 from hexapawn.computer import *
 from hexapawn.draw_util import DrawUtil
+from hexapawn.box_browser import BoxBrowser
+from hexapawn.results import ResultsModel
+from hexapawn.training import TrainingWorker
+from hexapawn.match_runner import MatchRunner, RandomPlayer
+from hexapawn.auto_play import AutoPlayer, AUTO_PLAY_SPEEDS
 
 TILE_SIZE               = 101
 CURRENT_BOX_BOARD       = 200
+BOX_BROWSER_HEIGHT      = 250
+TRAINING_GAMES          = 1000
+TRAINING_GAMES_MAX      = 1000000
+AUTO_PLAY_SPEED         = "Normal"
 
 class TileButton(QtWidgets.QPushButton):
     
     def __init__(self,row,col,tileSelectCallback):
         super().__init__()
-        clicked = lambda event,position=Position(row,col):\
+        clicked = lambda event,position=POSITIONS[row][col]:\
             tileSelectCallback(position)
         self.clicked.connect(clicked)
 
@@ -45,7 +52,7 @@ class Hexapawn():
         self._widgetMain.layout = QtWidgets.QGridLayout(self._widgetMain)
      
         self._gameManager = GameManager()
-        self._computer = Computer()
+        self._computer = Computer(cachePath=DEFAULT_CATALOGUE_CACHE_PATH)
         self._board = Board()
         self._mainBoardButtons = []
         self._selectedPawnPosition = None
@@ -87,40 +94,81 @@ class Hexapawn():
         self._grpBoxRecord = QtWidgets.QGroupBox()
         self._grpBoxRecord.setFixedWidth(300)
         self._grpBoxRecord.layout = QtWidgets.QVBoxLayout(self._grpBoxRecord)
-        self._tableResults = QtWidgets.QTableWidget()
-        columns = ["Winner"]
-        self._tableResults.setColumnCount(len(columns))
-        self._tableResults.setHorizontalHeaderLabels(columns)
+        self._resultsModel = ResultsModel()
+        self._tableResults = QtWidgets.QTableView()
+        self._tableResults.setModel(self._resultsModel)
         self._tableResults.horizontalHeader().setStretchLastSection(True)
+        self._tableResults.verticalHeader().setVisible(False)
+        self._tableResults.resizeColumnToContents(0)
         self._tableResults.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self._lblResultsSummary = QtWidgets.QLabel()
         self._grpBoxRecord.layout.addWidget(self._tableResults)
+        self._grpBoxRecord.layout.addWidget(self._lblResultsSummary)
         self._btnResetIntelligence = QtWidgets.QPushButton(text="Reset Intelligence")
         self._grpBoxRecord.layout.addWidget(self._btnResetIntelligence)
 
+        # Training
+        self._grpBoxTraining = QtWidgets.QGroupBox()
+        self._grpBoxTraining.layout = QtWidgets.QGridLayout(self._grpBoxTraining)
+        self._spinTrainingGames = QtWidgets.QSpinBox()
+        self._spinTrainingGames.setRange(1,TRAINING_GAMES_MAX)
+        self._spinTrainingGames.setValue(TRAINING_GAMES)
+        self._spinTrainingGames.setSuffix(" games")
+        self._btnTrain = QtWidgets.QPushButton(text="Train")
+        self._progressTraining = QtWidgets.QProgressBar()
+        self._grpBoxTraining.layout.addWidget(self._spinTrainingGames,0,0)
+        self._grpBoxTraining.layout.addWidget(self._btnTrain,0,1)
+        self._grpBoxTraining.layout.addWidget(self._progressTraining,1,0,1,2)
+        self._grpBoxRecord.layout.addWidget(self._grpBoxTraining)
+        self._trainingThread = None
+        self._trainingWorker = None
+
+        # Auto play
+        self._grpBoxAutoPlay = QtWidgets.QGroupBox()
+        self._grpBoxAutoPlay.layout = QtWidgets.QHBoxLayout(self._grpBoxAutoPlay)
+        self._cmbAutoPlaySpeed = QtWidgets.QComboBox()
+        for name, moveInterval in AUTO_PLAY_SPEEDS.items():
+            self._cmbAutoPlaySpeed.addItem(name,moveInterval)
+        self._cmbAutoPlaySpeed.setCurrentText(AUTO_PLAY_SPEED)
+        self._btnAutoPlay = QtWidgets.QPushButton(text="Auto Play")
+        self._grpBoxAutoPlay.layout.addWidget(self._cmbAutoPlaySpeed)
+        self._grpBoxAutoPlay.layout.addWidget(self._btnAutoPlay)
+        self._grpBoxRecord.layout.addWidget(self._grpBoxAutoPlay)
+        self._autoPlayer = AutoPlayer(
+            MatchRunner(
+                self._computer,
+                RandomPlayer(),
+                board=self._board,
+                gameManager=self._gameManager),
+            self._cmbAutoPlaySpeed.currentData())
+
         # Box informations
-        self._grpBoxBoxes = QtWidgets.QGroupBox()
+        self._boxBrowser = BoxBrowser(self._computer)
+        self._boxBrowser.setMinimumHeight(BOX_BROWSER_HEIGHT)
         
         # Assemble
         self._widgetMain.layout.addWidget(self._grpBoxMainBoard,0,0)
         self._widgetMain.layout.addWidget(self._grpBoxCurrentBoxInfo,0,1,2,1)
         self._widgetMain.layout.addWidget(self._grpBoxRecord,0,2,2,1)
         self._widgetMain.layout.addWidget(self._grpBoxPlayerInformation,1,0)
+        self._widgetMain.layout.addWidget(self._boxBrowser,2,0,1,3)
 
         self._setupMainBoard()
         self._btnReset.clicked.connect(self._reset)
         self._btnRandomMove.clicked.connect(self._moveRandomSelect)
         self._btnResetIntelligence.clicked.connect(self._resetIntelligence)
+        self._btnTrain.clicked.connect(self._toggleTraining)
+        self._btnAutoPlay.clicked.connect(self._toggleAutoPlay)
+        self._cmbAutoPlaySpeed.currentIndexChanged.connect(self._autoPlaySpeedSelected)
+        self._autoPlayer.frame.connect(self._autoPlayFrame)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self._stopTraining)
     
         DrawUtil.drawMainBoard(self._mainBoardButtons,self._board,self._selectedPawnPosition)
         DrawUtil.drawPlayerMoveInfo(self._btnPlayerInfo,self._gameManager.turnPlayer)
         DrawUtil.drawCurrentBox(self._btnCurrentBoxBoard,self._grpBoxMoves,self._currentBox,self._selectMove)
-        DrawUtil.drawBoxes(self._grpBoxBoxes,self._computer)
+        DrawUtil.drawResultsSummary(self._lblResultsSummary,self._resultsModel.log)
         self._setComputerMoveUi()
 
-        scrollArea = QScrollArea()
-        scrollArea.setWidget(self._grpBoxBoxes)
-        self._widgetMain.layout.addWidget(scrollArea,2,0,1,3)
-
     def _setupMainBoard(self):
         """
         """
@@ -183,11 +231,8 @@ class Hexapawn():
         """
         assert self._gameManager.turnPlayer == Player.BLACK
         assert not self._currentBox == None
-        remainingMoves = list(filter(lambda m : not m.removed,self._currentBox.moves))
-        move = None
-        if len(remainingMoves) > 0:
-            rand = random.choice(range(len(remainingMoves)))
-            move = remainingMoves[rand]
+        move = self._computer.selectRandomMove(self._currentBox)
+        if not move == None:
             self._selectMove(move)
         else:
             # move manually
@@ -231,18 +276,14 @@ class Hexapawn():
         self._gameManager.endGame()
         DrawUtil.drawWinnerInfo(self._lblPlayerInfo,self._gameManager)
         # update result
-        index = self._tableResults.rowCount()
-        self._tableResults.setRowCount(index + 1)
-        winDetails = winner.name
+        moveRecord = None
         if winner == Player.WHITE and len(self._recordedMoves)>0:
             moveRecord = self._removeMoveCausingBlackPlayerLose()
             if not moveRecord == None:
-                winDetails = "{} : Removed {} for from {}."\
-                    .format(winDetails,moveRecord.move.color.name,moveRecord.box.id)
-                moveRecord.move.remove()
-        item = QtWidgets.QTableWidgetItem()
-        item.setText(winDetails)
-        self._tableResults.setItem(index, 0, item)
+                self._computer.removeMove(moveRecord.box,moveRecord.move)
+        self._resultsModel.addResult(winner,moveRecord)
+        self._tableResults.scrollToBottom()
+        DrawUtil.drawResultsSummary(self._lblResultsSummary,self._resultsModel.log)
 
     def _findMoveInCurrentBox(self,pawn:Pawn,newPosition:Position)->None:
         """
@@ -258,11 +299,9 @@ class Hexapawn():
             New position of moved pawn
         """
         # Find move to evaluate
-        for move in self._currentBox.moves:
-            if pawn.inPosition(move.position) and\
-                arePositionsEqual(move.newPosition(),newPosition):
-                self._recordMove(move)
-                break
+        move = self._currentBox.findMove(pawn.position,newPosition)
+        if not move == None:
+            self._recordMove(move)
 
     def _movePawn(self,pawn:Pawn,newPosition:Position)->None:
         """
@@ -381,7 +420,7 @@ class Hexapawn():
                     redrawBoard = False
             if redrawBoard:
                 DrawUtil.drawMainBoard(self._mainBoardButtons,self._board,self._selectedPawnPosition)
-            DrawUtil.drawBoxes(self._grpBoxBoxes,self._computer)
+            self._boxBrowser.refresh()
 
     def _reset(self):
         """
@@ -404,10 +443,145 @@ class Hexapawn():
         """
         Resets intelligence.
         """
-        self._tableResults.setRowCount(0)
+        self._resultsModel.clear()
+        DrawUtil.drawResultsSummary(self._lblResultsSummary,self._resultsModel.log)
         self._computer.resetIntelligence()
         self._reset()
-        DrawUtil.drawBoxes(self._grpBoxBoxes,self._computer)
+        self._boxBrowser.refresh()
+
+    def _setBusyUi(self,stopButton:QtWidgets.QPushButton=None)->None:
+        """
+        Enables or disables game ui while training or auto-playing.
+
+        Parameter
+        ---------
+        stopButton : QtWidgets.QPushButton
+            Button of running task, kept enabled to stop it. None if no
+            task is running.
+        """
+        busy = not stopButton == None
+        for widget in [
+                self._grpBoxMainBoard,
+                self._grpBoxPlayerInformation,
+                self._grpBoxCurrentBoxInfo,
+                self._btnResetIntelligence,
+                self._spinTrainingGames,
+                self._btnTrain,
+                self._btnAutoPlay]:
+            widget.setEnabled(not busy or widget is stopButton)
+        self._btnTrain.setText("Stop" if stopButton is self._btnTrain else "Train")
+        self._btnAutoPlay.setText("Stop" if stopButton is self._btnAutoPlay else "Auto Play")
+
+    def _toggleTraining(self)->None:
+        """
+        Starts training of computer in worker thread, or stops running
+        training.
+        """
+        if not self._trainingWorker == None:
+            self._trainingWorker.stop()
+            return
+        self._reset()
+        games = self._spinTrainingGames.value()
+        self._progressTraining.setRange(0,games)
+        self._progressTraining.setValue(0)
+        self._trainingThread = QtCore.QThread()
+        self._trainingWorker = TrainingWorker(self._computer,games)
+        self._trainingWorker.moveToThread(self._trainingThread)
+        self._trainingThread.started.connect(self._trainingWorker.run)
+        self._trainingWorker.progress.connect(self._trainingProgress)
+        self._trainingWorker.finished.connect(self._trainingFinished)
+        self._setBusyUi(self._btnTrain)
+        self._trainingThread.start()
+
+    def _trainingProgress(self,progress)->None:
+        """
+        Callback of training progress, in UI thread.
+
+        Parameter
+        ---------
+        progress : TrainingProgress
+            Progress since last report.
+        """
+        self._progressTraining.setValue(progress.gamesPlayed)
+        self._resultsModel.addResults(progress.results)
+        self._tableResults.scrollToBottom()
+        DrawUtil.drawResultsSummary(self._lblResultsSummary,self._resultsModel.log)
+        # boxes are changed by worker thread, paint reported snapshot
+        self._boxBrowser.refresh(progress.removedMasks)
+
+    def _trainingFinished(self,gamesPlayed:int)->None:
+        """
+        Callback when training ends, in UI thread.
+
+        Parameter
+        ---------
+        gamesPlayed : int
+            Number of games played.
+        """
+        print("Trained {} games.".format(gamesPlayed))
+        self._stopTraining()
+        self._setBusyUi()
+        self._reset()
+        self._boxBrowser.refresh()
+
+    def _stopTraining(self)->None:
+        """
+        Stops training and waits for worker thread to end.
+        """
+        if not self._trainingWorker == None:
+            self._trainingWorker.stop()
+            self._trainingThread.quit()
+            self._trainingThread.wait()
+            self._trainingWorker.deleteLater()
+            self._trainingThread.deleteLater()
+            self._trainingWorker = None
+            self._trainingThread = None
+
+    def _toggleAutoPlay(self)->None:
+        """
+        Starts computer playing against random white player continuously, or
+        stops running auto-play.
+        """
+        if self._autoPlayer.isRunning():
+            self._autoPlayer.stop()
+            self._setBusyUi()
+            self._reset()
+            return
+        self._reset()
+        self._autoPlayer.runner.reset()
+        self._setBusyUi(self._btnAutoPlay)
+        self._autoPlayer.start()
+
+    def _autoPlaySpeedSelected(self,index:int)->None:
+        """
+        Callback when auto-play speed is selected.
+
+        Parameter
+        ---------
+        index : int
+            Index of selected speed.
+        """
+        self._autoPlayer.setMoveInterval(self._cmbAutoPlaySpeed.itemData(index))
+
+    def _autoPlayFrame(self,frame)->None:
+        """
+        Callback of auto-play frame. Repaints once for every change made in
+        frame.
+
+        Parameter
+        ---------
+        frame : AutoPlayFrame
+            Changes made in frame.
+        """
+        if frame.boardChanged:
+            DrawUtil.drawMainBoard(self._mainBoardButtons,self._board,None)
+            DrawUtil.drawPlayerMoveInfo(self._btnPlayerInfo,self._gameManager.turnPlayer)
+            DrawUtil.drawWinnerInfo(self._lblPlayerInfo,self._gameManager)
+        if len(frame.results) > 0:
+            self._resultsModel.addResults(frame.results)
+            self._tableResults.scrollToBottom()
+            DrawUtil.drawResultsSummary(self._lblResultsSummary,self._resultsModel.log)
+            self._boxBrowser.refresh()
 
     ######################################################################
     #                          public functions                          #
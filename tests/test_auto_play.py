@@ -0,0 +1,78 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for auto play.
+
+###############################################################################
+"""
+import unittest
+from hexapawn.auto_play import *
+from hexapawn.match_runner import *
+
+class TestAutoPlayer(unittest.TestCase):
+
+    def setUp(self):
+        self.computer = Computer(seed=1)
+        self.runner = MatchRunner(self.computer,RandomPlayer(1))
+
+    ### AutoPlayer.setMoveInterval ###
+
+    def test_setMoveInterval(self):
+        # setup
+        autoPlayer = AutoPlayer(self.runner,100)
+        # execute
+        autoPlayer.setMoveInterval(0)
+        # assert
+        self.assertEqual(autoPlayer.getMoveInterval(),0)
+        self.assertFalse(autoPlayer.isRunning())
+
+    ### AutoPlayer.playFrame ###
+
+    def test_playFrame_makesOneMoveAtRealTimeSpeed(self):
+        # setup
+        autoPlayer = AutoPlayer(self.runner,100)
+        frames = []
+        autoPlayer.frame.connect(frames.append)
+        # execute
+        frame = autoPlayer.playFrame()
+        # assert
+        self.assertEqual(frames,[frame])
+        self.assertEqual(frame.steps,1)
+        self.assertTrue(frame.boardChanged)
+        self.assertEqual(frame.results,[])
+        self.assertEqual(self.runner.gameManager.turnPlayer,Player.BLACK)
+
+    def test_playFrame_startsNewGameAfterGameEnds(self):
+        # setup
+        autoPlayer = AutoPlayer(self.runner,100)
+        results = []
+        # execute
+        while len(results) == 0:
+            results = autoPlayer.playFrame().results
+        winner = self.runner.gameManager.winner
+        frame = autoPlayer.playFrame()
+        # assert
+        self.assertEqual(len(results),1)
+        self.assertEqual(results[0][0],winner)
+        self.assertFalse(self.runner.gameManager.ended)
+        self.assertTrue(areBoardsEqual(self.runner.board,Board()))
+        self.assertEqual(frame.steps,1)
+
+    def test_playFrame_coalescesGamesAtMaximumSpeed(self):
+        # setup
+        autoPlayer = AutoPlayer(self.runner,0)
+        frames = []
+        autoPlayer.frame.connect(frames.append)
+        # execute
+        frame = autoPlayer.playFrame()
+        # assert
+        self.assertEqual(len(frames),1)
+        self.assertTrue(frame.steps > 1)
+        self.assertTrue(frame.boardChanged)
+        self.assertTrue(len(frame.results) > 0)
+        removed = [moveRecord for winner, moveRecord in frame.results if not moveRecord == None]
+        self.assertTrue(all(moveRecord.move.removed for moveRecord in removed))
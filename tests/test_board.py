@@ -83,6 +83,74 @@ class TestPosition(unittest.TestCase):
         with self.assertRaises(AssertionError):
             position = Position(0,SIZE)
 
+    def test_positionIsInterned(self):
+
+        self.assertIs(Position(1,2),Position(1,2))
+
+        self.assertIs(Position(1,2),POSITIONS[1][2])
+
+        self.assertIsNot(Position(1,2),Position(2,1))
+
+        self.assertEqual(Position(1,2).row,1)
+
+        self.assertEqual(Position(1,2).col,2)
+
+    def test_positionIsImmutable(self):
+
+        position = Position(0,0)
+
+        with self.assertRaises(AttributeError):
+            position.row = 1
+
+        self.assertEqual(POSITIONS[0][0].row,0)
+
+class TestValidationMode(unittest.TestCase):
+
+    def tearDown(self):
+        setValidationMode(ValidationMode.CHECKED)
+
+    ### setValidationMode ###
+
+    def test_setValidationMode(self):
+        # execute
+        setValidationMode(ValidationMode.FAST)
+        # assert
+        self.assertEqual(getValidationMode(),ValidationMode.FAST)
+        self.assertFalse(isCheckedMode())
+        # execute
+        setValidationMode(ValidationMode.CHECKED)
+        # assert
+        self.assertEqual(getValidationMode(),ValidationMode.CHECKED)
+        self.assertTrue(isCheckedMode())
+
+    def test_fastModeKeepsPositionBoundsCheck(self):
+        # execute
+        setValidationMode(ValidationMode.FAST)
+        # assert
+        for row, col in [(-1,0),(0,-1),(SIZE,0),(0,SIZE)]:
+            with self.assertRaises(IndexError):
+                Position(row,col)
+        self.assertIs(Position(SIZE-1,SIZE-1),POSITIONS[SIZE-1][SIZE-1])
+
+    def test_fastModeSkipsValidation(self):
+        # setup
+        board = Board()
+        # execute
+        setValidationMode(ValidationMode.FAST)
+        # assert
+        self.assertFalse(arePositionsEqual(Position(0,0),None))
+        self.assertFalse(arePawnsEqual([None],[]))
+        self.assertEqual(
+            board.movePawn(board._getPawnInPosition(Position(2,0)),Position(1,0)),
+            MovePawnResult.NO_WINNER)
+        # execute
+        setValidationMode(ValidationMode.CHECKED)
+        # assert
+        with self.assertRaises(AssertionError):
+            arePositionsEqual(Position(0,0),None)
+        with self.assertRaises(AssertionError):
+            arePawnsEqual([None],[])
+
 class TestPawn(unittest.TestCase):
 
     ### Pawn.__init__ ###
@@ -800,6 +868,148 @@ class TestBoard(unittest.TestCase):
         self.assertEqual([None,whitePawns[0],blackPawns[1]],tilePositions[1])
         self.assertEqual([whitePawns[1],None,None],tilePositions[2])
 
+    def test_getTilePositions_isCachedUntilChange(self):
+        board = Board()
+        # execute
+        tilePositions = board.getTilePositions()
+        # assert
+        self.assertIs(board.getTilePositions(),tilePositions)
+        # execute
+        board.movePawn(tilePositions[2][0],Position(1,0))
+        # assert
+        self.assertIsNot(board.getTilePositions(),tilePositions)
+        self.assertIsNone(board.getTilePositions()[2][0])
+        self.assertIsNotNone(board.getTilePositions()[1][0])
+
+    ### Board.getVersion ###
+
+    def test_getVersion_incrementsOnChange(self):
+        board = Board()
+        # execute
+        version = board.getVersion()
+        board.movePawn(board._getPawnInPosition(Position(2,0)),Position(0,0))
+        # assert
+        self.assertEqual(board.getVersion(),version)
+        # execute
+        board.movePawn(board._getPawnInPosition(Position(2,0)),Position(1,0))
+        # assert
+        self.assertGreater(board.getVersion(),version)
+        version = board.getVersion()
+        # execute
+        board.resetPawns()
+        # assert
+        self.assertGreater(board.getVersion(),version)
+        version = board.getVersion()
+        # execute
+        board.setPawnsFromKey(board.getKey())
+        # assert
+        self.assertGreater(board.getVersion(),version)
+        version = board.getVersion()
+        # execute
+        TestBoardUtil.setBoard(
+            board,
+            [
+                "- B B",
+                "W B -",
+                "- W W",
+            ])
+        # assert
+        self.assertGreater(board.getVersion(),version)
+
+    ### Board.getOccupancy ###
+
+    def test_getOccupancy(self):
+        board = Board()
+        # setup
+        TestBoardUtil.setBoard(
+            board,
+            [
+                "- B -",
+                "- W B",
+                "W - -",
+            ])
+        # execute
+        occupancy = board.getOccupancy()
+        # assert
+        self.assertEqual(occupancy,(
+            TILE_EMPTY,TILE_BLACK,TILE_EMPTY,
+            TILE_EMPTY,TILE_WHITE,TILE_BLACK,
+            TILE_WHITE,TILE_EMPTY,TILE_EMPTY))
+        self.assertIs(board.getOccupancy(),occupancy)
+
+    ### Board.getKey ###
+
+    def test_getKey(self):
+        board = Board()
+        # setup
+        TestBoardUtil.setBoard(
+            board,
+            [
+                "- - -",
+                "- - -",
+                "- - -",
+            ])
+        # execute/assert
+        self.assertEqual(board.getKey(),0)
+        # setup
+        TestBoardUtil.setBoard(
+            board,
+            [
+                "W B -",
+                "- - -",
+                "- - B",
+            ])
+        # execute/assert
+        self.assertEqual(board.getKey(),TILE_WHITE + TILE_BLACK*3 + TILE_BLACK*3**8)
+
+    ### Board.setPawnsFromKey ###
+
+    def test_setPawnsFromKey(self):
+        board = Board()
+        # execute
+        board.setPawnsFromKey(TILE_WHITE + TILE_BLACK*3 + TILE_BLACK*3**8)
+        # assert
+        self.assertBoard(
+            board,
+            [
+                "W B -",
+                "- - -",
+                "- - B",
+            ])
+        # execute
+        board.setPawnsFromKey(Board().getKey())
+        # assert
+        self.assertBoard(
+            board,
+            [
+                "B B B",
+                "- - -",
+                "W W W",
+            ])
+
+    ### Board.getPossibleMoves ###
+
+    def test_getPossibleMoves(self):
+        board = Board()
+        # setup
+        TestBoardUtil.setBoard(
+            board,
+            [
+                "B B -",
+                "W - -",
+                "- - W",
+            ])
+        # execute
+        moves = board.getPossibleMoves(Color.BLACK)
+        # assert
+        res = [(p.position.row,p.position.col,n.row,n.col) for p, n in moves]
+        self.assertEqual(sorted(res),[(0,1,1,0),(0,1,1,1)])
+        # execute
+        moves = board.getPossibleMoves(Color.WHITE)
+        # assert
+        res = [(p.position.row,p.position.col,n.row,n.col) for p, n in moves]
+        self.assertEqual(sorted(res),[(1,0,0,1),(2,2,1,2)])
+
     ### Board.movePawn ####
 
     def test_movePawn_whiteMovingForwardMoreThanOneTileAwayIsInvalidMove(self):
@@ -1882,6 +2092,15 @@ class TestBoard(unittest.TestCase):
         # assert
         self.assertTrue(res)
 
+    def test_arePawnPositionsSymmetric_updatesAfterMove(self):
+        board = Board()
+        # execute, assert
+        self.assertTrue(board.arePawnPositionsSymmetric())
+        # execute
+        board.movePawn(board._getPawnInPosition(Position(2,0)),Position(1,0))
+        # assert
+        self.assertFalse(board.arePawnPositionsSymmetric())
+
     ### Board.resetPawns ###
 
     def test_resetPawns(self):
@@ -1905,6 +2124,71 @@ class TestBoard(unittest.TestCase):
                 "W W W",
             ])
         
+    ### Board.addChangeListener ###
+
+    def test_addChangeListener_receivesMoveChanges(self):
+        board = Board()
+        changes = []
+        board.addChangeListener(changes.append)
+        # setup
+        TestBoardUtil.setBoard(
+            board,
+            [
+                "B B B",
+                "W - -",
+                "- W W",
+            ])
+        # execute
+        board.movePawn(board._getPawnInPosition(Position(0,2)),Position(1,2))
+        captured = board._getPawnInPosition(Position(1,0))
+        board.movePawn(board._getPawnInPosition(Position(0,1)),Position(1,0))
+        board.movePawn(board._getPawnInPosition(Position(2,1)),Position(1,2))
+        # assert
+        self.assertEqual(len(changes),4)
+        self.assertTrue(changes[0].isReset())
+        self.assertEqual(changes[1],BoardChange(
+            changes[0].version+1,Position(0,2),Position(1,2),None,MovePawnResult.NO_WINNER))
+        self.assertEqual(changes[2],BoardChange(
+            changes[0].version+2,Position(0,1),Position(1,0),captured,MovePawnResult.NO_WINNER))
+        self.assertEqual(changes[3].version,board.getVersion())
+        self.assertEqual(changes[3].captured.color,Color.BLACK)
+        # execute
+        board.removeChangeListener(changes.append)
+        board.resetPawns()
+        # assert
+        self.assertEqual(len(changes),4)
+
+    def test_removeChangeListener_notRegisteredRaisesError(self):
+        board = Board()
+        # execute, assert
+        with self.assertRaises(ValueError):
+            board.removeChangeListener(print)
+        board.addChangeListener(len)
+        with self.assertRaises(ValueError):
+            board.removeChangeListener(print)
+
+    ### BoardChangeLog ###
+
+    def test_boardChangeLog_getChangesSince(self):
+        board = Board()
+        log = BoardChangeLog(capacity=2)
+        board.addChangeListener(log)
+        version = board.getVersion()
+        # execute
+        board.movePawn(board._getPawnInPosition(Position(2,0)),Position(1,0))
+        # assert
+        changes = log.getChangesSince(version)
+        self.assertEqual(len(changes),1)
+        self.assertEqual(changes[0].toPosition,Position(1,0))
+        self.assertEqual(log.getChangesSince(board.getVersion()),[])
+        # execute
+        board.movePawn(board._getPawnInPosition(Position(0,1)),Position(1,1))
+        board.movePawn(board._getPawnInPosition(Position(2,2)),Position(1,2))
+        # assert
+        self.assertEqual(len(log),2)
+        self.assertIsNone(log.getChangesSince(version))
+        self.assertEqual(len(log.getChangesSince(version+1)),2)
+
     ### areBoardsEqual ###
 
     def test_areBoardsEqual_matchReturnsTrue(self):
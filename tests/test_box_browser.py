@@ -0,0 +1,121 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for box browser.
+
+###############################################################################
+"""
+import unittest
+from hexapawn.box_browser import *
+
+class TestBoxListModel(unittest.TestCase):
+
+    def setUp(self):
+        self.computer = Computer(seed=1)
+        self.model = BoxListModel(self.computer)
+
+    ### BoxListModel.rowCount ###
+
+    def test_rowCount_listsEveryBoxOrderedByTurn(self):
+        # execute
+        boxes = [self.model.getBox(row) for row in range(self.model.rowCount())]
+        # assert
+        self.assertEqual(len(boxes),len(self.computer._boxes))
+        self.assertEqual([box.turn for box in boxes],sorted(box.turn for box in boxes))
+
+    ### BoxListModel.data ###
+
+    def test_data(self):
+        # setup
+        index = self.model.index(0)
+        box = self.model.getBox(0)
+        # execute, assert
+        self.assertEqual(self.model.data(index),box.id)
+        self.assertIs(self.model.data(index,BOX_ROLE),box)
+        self.assertEqual(self.model.data(self.model.index(self.model.rowCount())),None)
+
+    ### BoxListModel.setTurnFilter ###
+
+    def test_setTurnFilter(self):
+        # execute
+        self.model.setTurnFilter(4)
+        # assert
+        expected = [box for box in self.computer._boxes if box.turn == 4]
+        self.assertEqual(self.model.rowCount(),len(expected))
+        self.assertTrue(all(self.model.getBox(row).turn == 4 for row in range(self.model.rowCount())))
+        # execute
+        self.model.setTurnFilter(None)
+        # assert
+        self.assertEqual(self.model.rowCount(),len(self.computer._boxes))
+
+    ### BoxListModel.setIdFilter ###
+
+    def test_setIdFilter_ignoresCase(self):
+        # setup
+        box = self.computer._boxes[0]
+        # execute
+        self.model.setIdFilter(box.id.lower())
+        # assert
+        ids = [self.model.getBox(row).id for row in range(self.model.rowCount())]
+        self.assertIn(box.id,ids)
+        self.assertTrue(all(box.id.lower() in id.lower() for id in ids))
+        # execute
+        self.model.setIdFilter("no such box")
+        # assert
+        self.assertEqual(self.model.rowCount(),0)
+
+    def test_setIdFilter_combinesWithTurnFilter(self):
+        # setup
+        box = self.computer._boxes[-1]
+        # execute
+        self.model.setTurnFilter(box.turn)
+        self.model.setIdFilter(box.id)
+        # assert
+        self.assertTrue(self.model.rowCount() >= 1)
+        self.assertTrue(all(self.model.getBox(row).turn == box.turn for row in range(self.model.rowCount())))
+
+    ### BoxListModel.refresh ###
+
+    def test_refresh_notifiesOnlyAfterLearning(self):
+        # setup
+        changes = []
+        self.model.dataChanged.connect(lambda first, last, roles: changes.append((first.row(),last.row())))
+        # execute
+        self.model.refresh()
+        # assert
+        self.assertEqual(changes,[])
+        # execute
+        box = self.computer._boxes[0]
+        self.computer.removeMove(box,box.moves[0])
+        self.model.refresh()
+        self.model.refresh()
+        # assert
+        self.assertEqual(changes,[(0,self.model.rowCount()-1)])
+
+    def test_refresh_paintsRemovedMaskSnapshot(self):
+        # setup
+        changes = []
+        self.model.dataChanged.connect(lambda first, last, roles: changes.append((first.row(),last.row())))
+        box = self.computer._boxes[0]
+        row = next(row for row in range(self.model.rowCount()) if self.model.getBox(row) is box)
+        index = self.model.index(row)
+        snapshot = self.computer.getRemovedMasks()
+        # execute
+        self.computer.removeMove(box,box.moves[0])
+        self.model.refresh(snapshot)
+        # assert
+        self.assertEqual(self.model.data(index,REMOVED_MASK_ROLE),0)
+        self.assertEqual(len(changes),1)
+        # execute
+        self.model.refresh(snapshot)
+        # assert
+        self.assertEqual(len(changes),1)
+        # execute
+        self.model.refresh()
+        # assert
+        self.assertEqual(self.model.data(index,REMOVED_MASK_ROLE),1)
+        self.assertEqual(len(changes),2)
@@ -0,0 +1,155 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for catalogue.
+
+###############################################################################
+"""
+import os
+import tempfile
+import unittest
+from hexapawn.catalogue import *
+from hexapawn.match_runner import MatchRunner, RandomPlayer
+
+class TestCatalogue(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmpDir.name,"catalogue.txt")
+
+    def tearDown(self):
+        self._tmpDir.cleanup()
+
+    def writeCatalogue(self,lines:list):
+        with open(self.path,"w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    ### getTilesKey ###
+
+    def test_getTilesKey(self):
+        self.assertEqual(getTilesKey("BBB---WWW"),Board().getKey())
+
+    ### loadCatalogue ###
+
+    def test_loadCatalogue(self):
+        # setup
+        self.writeCatalogue([
+            "# comment",
+            "",
+            "2A 2 BBBW---WW 01LG,01FR=3,02FB=0.5",
+        ])
+        # execute
+        boxes = list(loadCatalogue(self.path))
+        # assert
+        expected = Computer(cachePath=None)._boxes[0]
+        self.assertEqual(len(boxes),1)
+        self.assertEqual(boxes[0].id,"2A")
+        self.assertEqual(boxes[0].turn,2)
+        self.assertTrue(areBoardsEqual(boxes[0],expected))
+        self.assertEqual([(m.code,m.color) for m in boxes[0].moves],
+                         [(m.code,m.color) for m in expected.moves])
+        self.assertEqual([m.weight for m in boxes[0].moves],[1.0,3.0,0.5])
+
+    def test_loadCatalogue_raisesErrorWithLine(self):
+        records = [
+            "2A 2 BBBW---W 01LG",      # tiles
+            "2A 3 BBBW---WW 01LG",     # odd turn
+            "2A 2 BBBW---WW 11FG",     # no black pawn
+            "2A 2 BBBW---WW 02RG",     # outside board
+            "2A 2 BBBW---WW 02LG",     # diagonal to empty tile
+            "2A 2 BBBW---WW 00FG",     # forward to white pawn
+            "2A 2 BBBW---WW 01LG,01LR",# duplicate move
+            "2A 2 BBBW---WW 01LG=-1",  # negative weight
+            "2A 2 BBBW---WW 01LG=.",   # weight
+        ]
+        for record in records:
+            # setup
+            self.writeCatalogue(["# comment",record])
+            # execute, assert
+            with self.assertRaisesRegex(ValueError,"catalogue.txt:2: "):
+                list(loadCatalogue(self.path))
+
+    def test_loadCatalogue_raisesErrorWhenDuplicateId(self):
+        # setup
+        self.writeCatalogue([
+            "2A 2 BBBW---WW 01LG",
+            "2A 4 BBBW---WW 01LG",
+        ])
+        # execute, assert
+        with self.assertRaisesRegex(ValueError,"catalogue.txt:2: Duplicate box ID."):
+            list(loadCatalogue(self.path))
+
+    def test_loadCatalogue_createsPawnsOnFirstAccess(self):
+        # setup
+        self.writeCatalogue(["2A 2 BBBW---WW 01LG"])
+        box = next(loadCatalogue(self.path))
+        expected = Board()
+        Box._setPawnsFromStringSetup(expected,["B B B","W - -","- W W"])
+        # execute, assert
+        self.assertEqual(box.getKey(),expected.getKey())
+        self.assertTrue(areBoardsEqual(box,expected))
+        self.assertFalse(box._pendingKey == None)
+        self.assertEqual(box._getPawnInPosition(Position(1,0)).color,Color.WHITE)
+        self.assertTrue(box._pendingKey == None)
+        self.assertEqual(box.getKey(),expected.getKey())
+        # execute
+        box.setPawnsFromKey(Board().getKey())
+        # assert
+        self.assertEqual(box.getKey(),Board().getKey())
+
+    ### saveCatalogue ###
+
+    def test_saveCatalogue_roundTrip(self):
+        # setup
+        expected = Computer(cachePath=None)._boxes
+        expected[0].moves[1].weight = 2.5
+        # execute
+        saveCatalogue(expected,self.path)
+        boxes = list(loadCatalogue(self.path))
+        # assert
+        self.assertEqual(len(boxes),len(expected))
+        for box, expectedBox in zip(boxes,expected):
+            self.assertEqual(box.id,expectedBox.id)
+            self.assertEqual(box.turn,expectedBox.turn)
+            self.assertTrue(areBoardsEqual(box,expectedBox))
+            self.assertEqual([(m.code,m.color,m.weight) for m in box.moves],
+                             [(m.code,m.color,m.weight) for m in expectedBox.moves])
+
+    ### generateCatalogue ###
+
+    def test_generateCatalogue(self):
+        # execute
+        count = generateCatalogue(self.path)
+        boxes = list(loadCatalogue(self.path))
+        # assert
+        self.assertEqual(count,37)
+        self.assertEqual(len(boxes),count)
+        for box in boxes:
+            self.assertEqual(len(box.moves),len(box.getPossibleMoves(Color.BLACK)))
+
+    ### Computer ###
+
+    def test_computer_fromCatalogue(self):
+        # setup
+        generateCatalogue(self.path)
+        # execute
+        computer = Computer(seed=1,boxes=loadCatalogue(self.path))
+        runner = MatchRunner(computer,RandomPlayer(seed=1))
+        whiteWins, blackWins = runner.playGames(50)
+        # assert
+        self.assertEqual(len(computer._boxes),37)
+        self.assertEqual(whiteWins+blackWins,50)
+
+    def test_computer_raisesErrorWhenDuplicatePosition(self):
+        # setup
+        self.writeCatalogue([
+            "2A 2 BBBW---WW 01LG",
+            "2B 2 BBBW---WW 01FG",
+        ])
+        # execute, assert
+        with self.assertRaises(ValueError):
+            Computer(boxes=loadCatalogue(self.path))
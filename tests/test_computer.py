@@ -9,6 +9,9 @@
 
 ###############################################################################
 """
+import json
+import os
+import tempfile
 import unittest
 from hexapawn.computer import *
 from tests.test_board import TestBoardUtil
@@ -50,6 +53,21 @@ class TestMove(unittest.TestCase):
         self.assertEqual(newPosition.row,2)
         self.assertEqual(newPosition.col,2)
 
+    ### Move.code ###
+
+    def test_code_mapsToMoveTables(self):
+        # setup
+        move = Move(Position(1,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT)
+        # assert
+        self.assertEqual(move.code,getMoveCode(Position(1,1),Movement.DIAGONAL_LEFT))
+        self.assertIs(MOVE_FROM[move.code],Position(1,1))
+        self.assertEqual(MOVE_MOVEMENT[move.code],Movement.DIAGONAL_LEFT)
+        self.assertIs(MOVE_TO[move.code],Position(2,0))
+        self.assertEqual(len(set(getMoveCode(p,m) for row in POSITIONS for p in row for m in Movement)),
+                         MOVE_CODE_COUNT)
+        self.assertIsNone(MOVE_TO[getMoveCode(Position(0,0),Movement.DIAGONAL_LEFT)])
+        self.assertIsNone(MOVE_TO[getMoveCode(Position(SIZE-1,1),Movement.FORWARD)])
+
 class TestBox(unittest.TestCase):
 
     def test_box_raisesErrorWhenMoveBlackPawnDoesNotExists(self):
@@ -70,6 +88,28 @@ class TestBox(unittest.TestCase):
             )
         self.assertEqual("2 : [1,1] FORWARD : Move position must have black pawn.",str(err.exception))
 
+    def test_box_fastModeSkipsMoveValidation(self):
+        # setup
+        setValidationMode(ValidationMode.FAST)
+        try:
+            # execute
+            box = Box(
+                "2A",
+                2,
+                [
+                    "B B B",
+                    "W - -",
+                    "- W W"
+                ],
+                [
+                    Move(Position(1,1),MoveColor.RED,Movement.FORWARD),
+                ]
+            )
+        finally:
+            setValidationMode(ValidationMode.CHECKED)
+        # assert
+        self.assertEqual(len(box.moves),1)
+
     def test_box_raisesErrorWhenForwardMoveForBlackPawnInLastRow(self):
         with self.assertRaises(AssertionError) as err:
             box = Box(
@@ -208,11 +248,143 @@ class TestBox(unittest.TestCase):
             )
         self.assertEqual("2 : [0,0] DIAGONAL_RIGHT : Expecting to take white pawn.",str(err.exception))
 
+    ### Box.findMove ###
+
+    def test_findMove(self):
+        # setup
+        box = Box(
+            "4D", 4,
+            [
+                "B B -",
+                "W - W",
+                "- - W"
+            ],
+            [
+                Move(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                Move(Position(0,1),MoveColor.RED,Movement.FORWARD),
+                Move(Position(0,1),MoveColor.BLUE,Movement.DIAGONAL_RIGHT)
+            ]
+        )
+        # execute/assert
+        self.assertIs(box.findMove(Position(0,1),Position(1,0)),box.moves[0])
+        self.assertIs(box.findMove(Position(0,1),Position(1,1)),box.moves[1])
+        self.assertIs(box.findMove(Position(0,1),Position(1,2)),box.moves[2])
+        self.assertIsNone(box.findMove(Position(0,0),Position(1,0)))
+
 class TestComputer(unittest.TestCase):
 
     def test_computer(self):
         computer = Computer()
 
+    def assertBoxesEqual(self,boxesA:list,boxesB:list):
+        self.assertEqual(len(boxesA),len(boxesB))
+        for boxA, boxB in zip(boxesA,boxesB):
+            self.assertEqual(boxA.id,boxB.id)
+            self.assertEqual(boxA.turn,boxB.turn)
+            self.assertTrue(areBoardsEqual(boxA,boxB))
+            self.assertEqual([(m.code,m.color,m.weight) for m in boxA.moves],
+                             [(m.code,m.color,m.weight) for m in boxB.moves])
+            for move in boxA.moves:
+                self.assertIs(boxA.findMove(move.position,move.newPosition()),move)
+
+    ### Computer catalogue cache ###
+
+    def test_computer_loadsCatalogueCache(self):
+        # setup
+        expected = Computer(cachePath=None)
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir,"catalogue.json")
+            # execute
+            computer = Computer(cachePath=path)
+            # assert
+            self.assertTrue(os.path.exists(path))
+            self.assertBoxesEqual(computer._boxes,expected._boxes)
+            # execute
+            computer = Computer(cachePath=path)
+            # assert
+            self.assertBoxesEqual(computer._boxes,expected._boxes)
+
+    def test_computer_ignoresStaleCatalogueCache(self):
+        # setup
+        expected = Computer(cachePath=None)
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir,"catalogue.json")
+            Computer(cachePath=path)
+            with open(path,"r") as f:
+                cache = json.load(f)
+            cache["hash"] = "stale"
+            cache["boxes"] = cache["boxes"][:1]
+            with open(path,"w") as f:
+                json.dump(cache,f)
+            # execute
+            computer = Computer(cachePath=path)
+            # assert
+            self.assertBoxesEqual(computer._boxes,expected._boxes)
+            # setup
+            with open(path,"w") as f:
+                f.write("{")
+            # execute
+            computer = Computer(cachePath=path)
+            # assert
+            self.assertBoxesEqual(computer._boxes,expected._boxes)
+
+    def test_computer_ignoresInvalidCatalogueCacheRecords(self):
+        # setup
+        expected = Computer(cachePath=None)
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir,"catalogue.json")
+            Computer(cachePath=path)
+            with open(path,"r") as f:
+                cache = json.load(f)
+            id, turn, key, moves = cache["boxes"][0]
+            code, color, weight = moves[0]
+            invalidRecords = [
+                [id,turn,key,[[MOVE_CODE_COUNT,color,weight]]],
+                [id,turn,key,[[-1,color,weight]]],
+                [id,turn,key,[[code,"PURPLE",weight]]],
+                [id,turn,key,[[code,color,-1]]],
+                [id,turn,key,[moves[0],moves[0]]],
+                [id,turn,0,moves],
+                [id,turn,3**(SIZE*SIZE),moves],
+                [id,3,key,moves],
+                [id,turn,key,[[code,color]]],
+            ]
+            for record in invalidRecords:
+                cache["boxes"][0] = record
+                with open(path,"w") as f:
+                    json.dump(cache,f)
+                # execute
+                computer = Computer(cachePath=path)
+                # assert
+                self.assertBoxesEqual(computer._boxes,expected._boxes)
+
+    def test_computer_boxesAreNotSharedBetweenComputers(self):
+        # setup
+        computerA = Computer()
+        computerB = Computer()
+        box = computerA._boxes[0]
+        # execute
+        computerA.removeMove(box,box.moves[0])
+        # assert
+        self.assertFalse(computerB._boxes[0].moves[0].removed)
+
+    ### Computer.getLearningVersion ###
+
+    def test_getLearningVersion_incrementsOnLearning(self):
+        # setup
+        computer = Computer()
+        box = computer._boxes[0]
+        version = computer.getLearningVersion()
+        # execute
+        computer.removeMove(box,box.moves[0])
+        # assert
+        self.assertGreater(computer.getLearningVersion(),version)
+        version = computer.getLearningVersion()
+        # execute
+        computer.resetIntelligence()
+        # assert
+        self.assertGreater(computer.getLearningVersion(),version)
+
     ### Computer._createMirroredBox ###
 
     def test_createMirroredBox(self):
@@ -301,3 +473,124 @@ class TestComputer(unittest.TestCase):
         self.assertEqual(move.color,MoveColor.GREEN)
         self.assertEqual(move.movement,Movement.FORWARD)
         index+=1
+
+    ### Computer.selectRandomMove ###
+
+    def test_selectRandomMove_skipsRemovedMoves(self):
+        # setup
+        computer = Computer(seed=1)
+        box = computer._boxes[0]
+        for move in box.moves[1:]:
+            computer.removeMove(box,move)
+        # execute/assert
+        for _ in range(20):
+            self.assertIs(computer.selectRandomMove(box),box.moves[0])
+        # setup
+        computer.removeMove(box,box.moves[0])
+        # execute/assert
+        self.assertIsNone(computer.selectRandomMove(box))
+        # setup
+        computer.resetIntelligence()
+        # execute/assert
+        self.assertIn(computer.selectRandomMove(box),box.moves)
+
+    def test_selectRandomMove_boxesWithSameId(self):
+        # setup
+        boxA = Box("2A",2,["B B B","W - -","- W W"],[
+            Move(POSITIONS[0][1],MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+            Move(POSITIONS[0][1],MoveColor.RED,Movement.FORWARD)])
+        boxB = Box("2A",4,["B B B","W - -","- W W"],[
+            Move(POSITIONS[0][1],MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+            Move(POSITIONS[0][1],MoveColor.RED,Movement.FORWARD)])
+        computer = Computer(seed=1,boxes=[boxA,boxB])
+        # execute
+        computer.removeMove(boxA,boxA.moves[0])
+        # assert
+        for _ in range(20):
+            self.assertIs(computer.selectRandomMove(boxA),boxA.moves[1])
+        self.assertTrue(any(computer.selectRandomMove(boxB) is boxB.moves[0] for _ in range(50)))
+
+    ### Computer.setMoveWeight ###
+
+    def test_setMoveWeight_keptAfterRemovingMove(self):
+        # setup
+        computer = Computer(seed=1)
+        box = next(b for b in computer._boxes if len(b.moves) >= 3)
+        version = computer.getLearningVersion()
+        # execute
+        computer.setMoveWeight(box,box.moves[0],50.0)
+        computer.removeMove(box,box.moves[2])
+        # assert
+        self.assertEqual(box.moves[0].weight,50.0)
+        self.assertGreater(computer.getLearningVersion(),version)
+        selected = [computer.selectRandomMove(box) for _ in range(500)]
+        self.assertGreater(selected.count(box.moves[0]),400)
+        self.assertNotIn(box.moves[2],selected)
+
+    ### Computer.getRemovedMasks ###
+
+    def test_getRemovedMasks(self):
+        # setup
+        computer = Computer(seed=1)
+        box = computer._boxes[1]
+        # execute
+        computer.removeMove(box,box.moves[-1])
+        masks = computer.getRemovedMasks()
+        # assert
+        self.assertEqual(len(masks),len(computer._boxes))
+        self.assertEqual(masks[1],1 << (len(box.moves)-1))
+        self.assertEqual(masks[1],box.getRemovedMask())
+        self.assertTrue(all(mask == 0 for i, mask in enumerate(masks) if not i == 1))
+
+    ### Computer.getBoxForCurrentBlackTurn ###
+
+    def test_getBoxForCurrentBlackTurn(self):
+        # setup
+        computer = Computer()
+        board = Board()
+        TestBoardUtil.setBoard(board,[
+                "B B B",
+                "- W -",
+                "W - W"
+        ])
+        # execute
+        box = computer.getBoxForCurrentBlackTurn(2,board)
+        # assert
+        self.assertIsNotNone(box)
+        self.assertEqual(box.id,"2B")
+        # execute/assert
+        self.assertIsNone(computer.getBoxForCurrentBlackTurn(4,board))
+
+    ### Computer.chooseMoves ###
+
+    def test_chooseMoves(self):
+        # setup
+        computer = Computer(seed=1)
+        computer.resetIntelligence()
+        boardA = Board()
+        TestBoardUtil.setBoard(boardA,[
+                "B B B",
+                "- W -",
+                "W - W"
+        ])
+        boardB = Board()
+        TestBoardUtil.setBoard(boardB,[
+                "B - B",
+                "W - -",
+                "- - W"
+        ])
+        boxB = computer.getBoxForCurrentBlackTurn(4,boardB)
+        # execute
+        moves = computer.chooseMoves([boardA,boardB.getKey(),boardA],[2,4,4])
+        # assert
+        self.assertEqual(len(moves),3)
+        self.assertIn(moves[0],computer.getBoxForCurrentBlackTurn(2,boardA).moves)
+        self.assertIs(moves[1],boxB.moves[0])
+        self.assertIs(moves[2],MISSING_BOX)
+        # setup
+        computer.removeMove(boxB,boxB.moves[0])
+        # execute
+        moves = computer.chooseMoves([boardB],[4])
+        # assert
+        self.assertEqual(moves,[None])
+        computer.resetIntelligence()
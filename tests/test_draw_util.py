@@ -0,0 +1,127 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for drawing utility functions.
+
+###############################################################################
+"""
+import os
+import unittest
+from PyQt5.QtWidgets import QApplication
+from hexapawn.draw_util import *
+
+def getApplication()->QApplication:
+    """
+    Gets application for pixmaps and widgets, rendering without display.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM","offscreen")
+    app = QApplication.instance()
+    if app == None:
+        app = QApplication([])
+    return app
+
+class TestBoxPixmapCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = getApplication()
+
+    def setUp(self):
+        self.computer = Computer(seed=1)
+        self.boxes = self.computer._boxes[:3]
+        cost = BoxPixmapCache._getCost(BoxPixmapCache().get(self.boxes[0],BOXES_BOARD_SIZE))
+        self.cache = BoxPixmapCache(2*cost)
+
+    ### BoxPixmapCache.get ###
+
+    def test_get_returnsCachedPixmap(self):
+        # execute
+        pixmap = self.cache.get(self.boxes[0],BOXES_BOARD_SIZE)
+        # assert
+        self.assertEqual(pixmap.height(),BOXES_BOARD_SIZE)
+        self.assertIs(self.cache.get(self.boxes[0],BOXES_BOARD_SIZE),pixmap)
+        self.assertEqual(len(self.cache),1)
+
+    def test_get_evictsLeastRecentlyUsed(self):
+        # setup
+        first = self.cache.get(self.boxes[0],BOXES_BOARD_SIZE)
+        second = self.cache.get(self.boxes[1],BOXES_BOARD_SIZE)
+        # execute
+        self.cache.get(self.boxes[0],BOXES_BOARD_SIZE)
+        self.cache.get(self.boxes[2],BOXES_BOARD_SIZE)
+        # assert
+        self.assertEqual(len(self.cache),2)
+        self.assertTrue(self.cache.size <= self.cache.budget)
+        self.assertIs(self.cache.get(self.boxes[0],BOXES_BOARD_SIZE),first)
+        self.assertIsNot(self.cache.get(self.boxes[1],BOXES_BOARD_SIZE),second)
+
+    def test_get_sizeStaysWithinBudget(self):
+        # execute
+        for box in self.computer._boxes:
+            self.cache.get(box,BOXES_BOARD_SIZE)
+            # assert
+            self.assertTrue(self.cache.size <= self.cache.budget)
+        self.assertEqual(len(self.cache),2)
+        self.assertEqual(self.cache.size,sum(BoxPixmapCache._getCost(pixmap)\
+                                             for pixmap in self.cache._pixmaps.values()))
+
+    def test_get_rendersAgainAfterMoveRemoved(self):
+        # setup
+        box = self.boxes[0]
+        pixmap = self.cache.get(box,BOXES_BOARD_SIZE)
+        # execute
+        self.computer.removeMove(box,box.moves[0])
+        # assert
+        self.assertIsNot(self.cache.get(box,BOXES_BOARD_SIZE),pixmap)
+
+    def test_get_rendersRemovedMaskSnapshot(self):
+        # setup
+        box = self.boxes[0]
+        pixmap = self.cache.get(box,BOXES_BOARD_SIZE)
+        # execute, assert
+        self.assertIs(self.cache.get(box,BOXES_BOARD_SIZE,0),pixmap)
+        self.assertIsNot(self.cache.get(box,BOXES_BOARD_SIZE,1),pixmap)
+        self.assertFalse(box.moves[0].removed)
+
+    ### BoxPixmapCache.clear ###
+
+    def test_clear(self):
+        # setup
+        self.cache.get(self.boxes[0],BOXES_BOARD_SIZE)
+        # execute
+        self.cache.clear()
+        # assert
+        self.assertEqual(len(self.cache),0)
+        self.assertEqual(self.cache.size,0)
+
+class TestMoveButton(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = getApplication()
+
+    ### MoveButton.setMove ###
+
+    def test_setMove_keepsWidgetMove(self):
+        # setup
+        box = Computer(seed=1)._boxes[0]
+        button = MoveButton()
+        selected = []
+        # execute
+        button.setMove(box.moves[0],selected.append)
+        button.move(3,4)
+        button.click()
+        # assert
+        self.assertIs(button.boundMove,box.moves[0])
+        self.assertEqual((button.x(),button.y()),(3,4))
+        self.assertEqual(selected,[box.moves[0]])
+        # execute
+        button.setMove(None,None)
+        button.click()
+        # assert
+        self.assertIsNone(button.boundMove)
+        self.assertEqual(len(selected),1)
@@ -0,0 +1,127 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for enumeration.
+
+###############################################################################
+"""
+import os
+import tempfile
+import unittest
+import unittest.mock
+from hexapawn.enumeration import *
+from hexapawn.enumeration import _SpillSet
+
+class TestEnumeration(unittest.TestCase):
+
+    ### getInitialKey ###
+
+    def test_getInitialKey(self):
+        self.assertEqual(getInitialKey(),Board().getKey())
+
+    ### enumeratePositions ###
+
+    def test_enumeratePositions_ordersByTurnThenKey(self):
+        # execute
+        positions = list(enumeratePositions())
+        # assert
+        self.assertEqual(positions[0],(1,getInitialKey()))
+        self.assertEqual(positions,sorted(positions))
+        self.assertEqual(len(positions),len(set(positions)))
+
+    def test_enumeratePositions_blackPositionsMatchBoxCount(self):
+        # execute
+        positions = list(enumeratePositions())
+        # assert
+        self.assertEqual(len([p for p in positions if p[0] == 2]),3)
+        self.assertEqual(len([p for p in positions if p[0] == 4]),20)
+        self.assertEqual(len([p for p in positions if p[0] == 6]),14)
+        self.assertEqual(len([p for p in positions if p[0] == 8]),0)
+
+    def test_enumeratePositions_spillingKeepsResult(self):
+        # setup
+        expected = list(enumeratePositions())
+        with tempfile.TemporaryDirectory() as tmpDir:
+            # execute
+            positions = list(enumeratePositions(
+                memoryBudget=4*BUFFERED_KEY_COST,directory=tmpDir))
+            # assert
+            self.assertEqual(positions,expected)
+            self.assertEqual(os.listdir(tmpDir),[])
+
+    def test_enumeratePositions_stoppingEarlyClosesChunkFiles(self):
+        # setup
+        opened = []
+        openedAtClose = []
+        readers = []
+        class CountingSpillSet(_SpillSet):
+            def _countingRead(self,path):
+                opened.append(path)
+                try:
+                    yield from super()._readChunk(path)
+                finally:
+                    opened.remove(path)
+            def _readChunk(self,path):
+                # keep readers referenced, so they are not closed on release
+                reader = self._countingRead(path)
+                readers.append(reader)
+                return reader
+            def close(self):
+                openedAtClose.append(len(opened))
+                super().close()
+        with tempfile.TemporaryDirectory() as tmpDir:
+            with unittest.mock.patch("hexapawn.enumeration._SpillSet",CountingSpillSet):
+                positions = enumeratePositions(memoryBudget=4*BUFFERED_KEY_COST,directory=tmpDir)
+                # execute
+                for i, position in enumerate(positions):
+                    if len(opened) > 0 and i > 20:
+                        break
+                positions.close()
+            # assert
+            self.assertTrue(max(openedAtClose) == 0 and len(openedAtClose) > 0)
+            self.assertEqual(opened,[])
+            self.assertEqual(os.listdir(tmpDir),[])
+
+class TestSpillSet(unittest.TestCase):
+
+    ### _SpillSet.iterSorted ###
+
+    def test_iterSorted_mergesWithBoundedFanIn(self):
+        # setup
+        opened = []
+        maxOpened = []
+        class CountingSpillSet(_SpillSet):
+            def _readChunk(self,path):
+                opened.append(path)
+                maxOpened.append(len(opened))
+                try:
+                    yield from super()._readChunk(path)
+                finally:
+                    opened.remove(path)
+        keys = [(i*7919) % 1000 for i in range(3000)]
+        with tempfile.TemporaryDirectory() as tmpDir:
+            spillSet = CountingSpillSet(2,10,tmpDir)
+            for key in keys:
+                spillSet.add(key)
+            # execute
+            result = list(spillSet.iterSorted())
+            spillSet.close()
+            # assert
+            self.assertEqual(result,sorted(set(keys)))
+            self.assertEqual(spillSet.fanIn,2)
+            self.assertTrue(max(maxOpened) <= spillSet.fanIn)
+            self.assertEqual(os.listdir(tmpDir),[])
+
+    def test_init_buffersFitBudget(self):
+        # setup
+        recordSize = 8
+        limit = 10000
+        # execute
+        spillSet = _SpillSet(recordSize,limit,None)
+        # assert
+        self.assertTrue(spillSet.fanIn <= MAX_MERGE_FAN_IN)
+        self.assertTrue((spillSet.fanIn+1)*spillSet.readRecords*recordSize <= limit*BUFFERED_KEY_COST)
@@ -0,0 +1,87 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for load generator.
+
+###############################################################################
+"""
+import asyncio
+import unittest
+from hexapawn.computer import Computer
+from hexapawn.load_generator import *
+
+class TestLoadReport(unittest.TestCase):
+
+    ### LoadReport.getPercentile ###
+
+    def test_getPercentile(self):
+        # setup
+        report = LoadReport()
+        # execute/assert
+        self.assertEqual(report.getPercentile(50),0.0)
+        # setup
+        report.latencies = [0.004,0.001,0.003,0.002]
+        # execute/assert
+        self.assertEqual(report.getPercentile(50),0.002)
+        self.assertEqual(report.getPercentile(99),0.004)
+        self.assertEqual(report.getPercentile(100),0.004)
+        self.assertEqual(report.getPercentile(0),0.001)
+
+    ### LoadReport.getErrorRate ###
+
+    def test_getErrorRate(self):
+        # setup
+        report = LoadReport()
+        report.latencies = [0.001]*3
+        report.errors = 1
+        report.elapsed = 2.0
+        # execute/assert
+        self.assertEqual(report.getErrorRate(),0.25)
+        self.assertEqual(report.getThroughput(),2.0)
+
+class TestRunLoad(unittest.TestCase):
+
+    def test_runLoad_againstLocalServer(self):
+        # setup
+        computer = Computer(seed=1)
+        async def run():
+            server = GameServer(computer,port=0)
+            port = await server.start()
+            try:
+                return await runLoad(port=port,clients=5,duration=0.3,
+                                     policy="capture",thinkTime=(0.0,0.001),seed=1)
+            finally:
+                await server.stop()
+        # execute
+        report = asyncio.run(run())
+        computer.resetIntelligence()
+        # assert
+        self.assertEqual(report.errors,0)
+        self.assertGreater(len(report.latencies),0)
+        self.assertGreater(report.games,0)
+
+    def test_runLoad_keepsPlayingAfterErrorResponses(self):
+        # setup
+        async def handle(reader,writer):
+            while len(await reader.readline()) > 0:
+                writer.write(b'{"ok":false,"error":"busy"}\n')
+                await writer.drain()
+            writer.close()
+        async def run():
+            server = await asyncio.start_server(handle,DEFAULT_HOST,0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                return await runLoad(port=port,clients=2,duration=0.2,seed=1)
+            finally:
+                server.close()
+                await server.wait_closed()
+        # execute
+        report = asyncio.run(run())
+        # assert
+        self.assertGreater(report.errors,2)
+        self.assertEqual(report.games,0)
+        self.assertEqual(report.latencies,[])
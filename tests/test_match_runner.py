@@ -0,0 +1,94 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for match runner.
+
+###############################################################################
+"""
+import unittest
+from hexapawn.match_runner import *
+
+class TestMatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.computer = Computer(seed=1)
+        self.computer.resetIntelligence()
+
+    def tearDown(self):
+        self.computer.resetIntelligence()
+
+    ### MatchRunner.step ###
+
+    def test_step_switchesPlayer(self):
+        # setup
+        runner = MatchRunner(self.computer,RandomPlayer(1))
+        runner.reset()
+        # execute
+        res = runner.step()
+        # assert
+        self.assertEqual(res,MovePawnResult.NO_WINNER)
+        self.assertEqual(runner.gameManager.turnPlayer,Player.BLACK)
+        self.assertEqual(runner.gameManager.turn,2)
+        # execute
+        res = runner.step()
+        # assert
+        self.assertEqual(res,MovePawnResult.NO_WINNER)
+        self.assertEqual(runner.gameManager.turnPlayer,Player.WHITE)
+        self.assertEqual(len(runner._recordedMoves),1)
+
+    def test_step_resignDeclaresRivalWinner(self):
+        # setup
+        runner = MatchRunner(self.computer,lambda board,gameManager,box : None)
+        runner.reset()
+        # execute
+        res = runner.step()
+        # assert
+        self.assertEqual(res,MovePawnResult.BLACK_WIN)
+        self.assertTrue(runner.gameManager.ended)
+        self.assertEqual(runner.gameManager.winner,Player.BLACK)
+
+    ### MatchRunner.playGame ###
+
+    def test_playGame_whiteWinRemovesLastBlackMove(self):
+        # setup
+        def whitePlayer(board,gameManager,box):
+            # always take black pawn if possible, otherwise move forward
+            moves = board.getPossibleMoves(Color.WHITE)
+            takes = [m for m in moves if not m[0].position.col == m[1].col]
+            return takes[0] if len(takes) > 0 else moves[0]
+        runner = MatchRunner(self.computer,whitePlayer)
+        # execute
+        for _ in range(20):
+            winner = runner.playGame()
+            if winner == Player.WHITE:
+                break
+        # assert
+        self.assertEqual(winner,Player.WHITE)
+        self.assertTrue(any(move.removed for box in self.computer._boxes for move in box.moves))
+        self.assertTrue(runner.removedMoveRecord.move.removed)
+        # execute
+        runner.reset()
+        # assert
+        self.assertEqual(runner.removedMoveRecord,None)
+
+    def test_playGame_withoutLearningKeepsMoves(self):
+        # setup
+        runner = MatchRunner(self.computer,RandomPlayer(1),learn=False)
+        # execute
+        whiteWins, blackWins = runner.playGames(50)
+        # assert
+        self.assertEqual(whiteWins+blackWins,50)
+        self.assertFalse(any(move.removed for box in self.computer._boxes for move in box.moves))
+
+    def test_playGames_learningImprovesBlack(self):
+        # setup
+        runner = MatchRunner(self.computer,RandomPlayer(1))
+        # execute
+        runner.playGames(300)
+        whiteWins, blackWins = runner.playGames(100)
+        # assert
+        self.assertGreater(blackWins,90)
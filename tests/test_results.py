@@ -0,0 +1,145 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for results.
+
+###############################################################################
+"""
+import unittest
+from hexapawn.results import *
+
+class TestResultsLog(unittest.TestCase):
+
+    def setUp(self):
+        self.computer = Computer(seed=1)
+        box = self.computer._boxes[0]
+        self.moveRecord = MoveRecord(box,box.moves[0])
+
+    ### ResultsLog.addResult ###
+
+    def test_addResult(self):
+        # setup
+        log = ResultsLog()
+        # execute
+        first = log.addResult(Player.BLACK)
+        second = log.addResult(Player.WHITE,self.moveRecord)
+        # assert
+        self.assertEqual(len(log),2)
+        self.assertEqual(first,GameResult(1,Player.BLACK))
+        self.assertEqual(second.number,2)
+        self.assertEqual(second.removedBoxId,self.moveRecord.box.id)
+        self.assertEqual(second.removedColor,self.moveRecord.move.color)
+        self.assertEqual(first.getDetails(),"BLACK")
+        self.assertEqual(second.getDetails(),"WHITE : Removed {} for from {}."\
+            .format(self.moveRecord.move.color.name,self.moveRecord.box.id))
+
+    def test_addResult_keepsRecentResultsAndAggregates(self):
+        # setup
+        log = ResultsLog(capacity=3)
+        # execute
+        for i in range(10):
+            log.addResult(Player.WHITE if i%2 == 0 else Player.BLACK,
+                          self.moveRecord if i%2 == 0 else None)
+        # assert
+        self.assertEqual(len(log),3)
+        self.assertEqual([result.number for result in log],[8,9,10])
+        self.assertEqual(log.gameCount,10)
+        self.assertEqual(log.getWins(Player.WHITE),5)
+        self.assertEqual(log.getWins(Player.BLACK),5)
+        self.assertEqual(log.getWinRate(Player.WHITE),0.5)
+        self.assertEqual(log.removalCount,5)
+        self.assertEqual(log.getRemovals(self.moveRecord.box.id),5)
+        self.assertEqual(log.getRemovals("no such box"),0)
+
+    ### ResultsLog.dropOldest ###
+
+    def test_dropOldest_keepsAggregates(self):
+        # setup
+        log = ResultsLog()
+        log.addResult(Player.BLACK)
+        log.addResult(Player.WHITE)
+        # execute
+        dropped = log.dropOldest()
+        # assert
+        self.assertEqual(dropped.number,1)
+        self.assertEqual([result.number for result in log],[2])
+        self.assertEqual(log.gameCount,2)
+        self.assertEqual(log.getWins(Player.BLACK),1)
+        self.assertEqual(log.dropOldest().number,2)
+        self.assertIsNone(log.dropOldest())
+
+    ### ResultsLog.getWinRate ###
+
+    def test_getWinRate_noGames(self):
+        self.assertEqual(ResultsLog().getWinRate(Player.WHITE),0.0)
+
+    ### ResultsLog.clear ###
+
+    def test_clear(self):
+        # setup
+        log = ResultsLog()
+        log.addResult(Player.WHITE,self.moveRecord)
+        # execute
+        log.clear()
+        # assert
+        self.assertEqual(len(log),0)
+        self.assertEqual(log.gameCount,0)
+        self.assertEqual(log.getWins(Player.WHITE),0)
+        self.assertEqual(log.getRemovals(self.moveRecord.box.id),0)
+        self.assertEqual(log.addResult(Player.BLACK).number,1)
+
+class TestResultsModel(unittest.TestCase):
+
+    ### ResultsModel.addResult ###
+
+    def test_addResult_dropsOldestRow(self):
+        # setup
+        model = ResultsModel(ResultsLog(capacity=2))
+        changes = []
+        model.rowsRemoved.connect(lambda parent, first, last: changes.append(("removed",first,last)))
+        model.rowsInserted.connect(lambda parent, first, last: changes.append(("inserted",first,last)))
+        # execute
+        for _ in range(3):
+            model.addResult(Player.BLACK)
+        # assert
+        self.assertEqual(model.rowCount(),2)
+        self.assertEqual(model.data(model.index(0,0)),"2")
+        self.assertEqual(model.data(model.index(1,1)),"BLACK")
+        self.assertEqual(changes,[
+            ("inserted",0,0),
+            ("inserted",1,1),
+            ("removed",0,0),
+            ("inserted",1,1),
+        ])
+
+    ### ResultsModel.addResults ###
+
+    def test_addResults(self):
+        # setup
+        model = ResultsModel(ResultsLog(capacity=3))
+        resets = []
+        model.modelReset.connect(lambda: resets.append(True))
+        # execute
+        model.addResults([(Player.BLACK,None)] * 5)
+        model.addResults([])
+        # assert
+        self.assertEqual(len(resets),1)
+        self.assertEqual(model.rowCount(),3)
+        self.assertEqual(model.log.gameCount,5)
+        self.assertEqual(model.data(model.index(2,0)),"5")
+
+    ### ResultsModel.clear ###
+
+    def test_clear(self):
+        # setup
+        model = ResultsModel()
+        model.addResult(Player.WHITE)
+        # execute
+        model.clear()
+        # assert
+        self.assertEqual(model.rowCount(),0)
+        self.assertEqual(model.log.gameCount,0)
@@ -0,0 +1,114 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for sampling.
+
+###############################################################################
+"""
+import unittest
+import numpy as np
+from hexapawn.computer import *
+from hexapawn.sampling import *
+
+class TestMoveSampler(unittest.TestCase):
+
+    def createBoxes(self)->list:
+        return [
+            Box(
+                "2A", 2,
+                [
+                    "B B B",
+                    "W - -",
+                    "- W W"
+                ],
+                [
+                    Move(Position(0,1),MoveColor.GREEN,Movement.DIAGONAL_LEFT),
+                    Move(Position(0,1),MoveColor.RED,Movement.FORWARD,3.0),
+                    Move(Position(0,2),MoveColor.BLUE,Movement.FORWARD,0.0)
+                ]
+            ),
+            Box(
+                "4K", 4,
+                [
+                    "B - B",
+                    "W - -",
+                    "- - W"
+                ],
+                [
+                    Move(Position(0,2),MoveColor.GREEN,Movement.FORWARD)
+                ]
+            ),
+        ]
+
+    ### MoveSampler.sample ###
+
+    def test_sample_followsWeights(self):
+        # setup
+        sampler = MoveSampler(self.createBoxes(),seed=1)
+        # execute
+        slots = [sampler.sample(0) for _ in range(4000)]
+        # assert
+        counts = np.bincount(slots,minlength=3)
+        self.assertEqual(counts[2],0)
+        self.assertAlmostEqual(counts[1]/counts[0],3.0,delta=0.5)
+        self.assertTrue(all(sampler.sample(1) == 0 for _ in range(10)))
+
+    def test_sample_removedMoveIsNotSelected(self):
+        # setup
+        boxes = self.createBoxes()
+        sampler = MoveSampler(boxes,seed=1)
+        # execute
+        boxes[0].moves[1].remove()
+        sampler.refreshBox(0)
+        # assert
+        self.assertTrue(all(sampler.sample(0) == 0 for _ in range(100)))
+        # execute
+        sampler.setWeight(0,0,0.0)
+        # assert
+        self.assertEqual(sampler.sample(0),NO_MOVE)
+        # execute
+        boxes[0].reset()
+        sampler.reset()
+        # assert
+        self.assertTrue(all(sampler.sample(0) in (0,1) for _ in range(100)))
+
+    ### MoveSampler.setWeight ###
+
+    def test_setWeight_keptAfterRefresh(self):
+        # setup
+        boxes = self.createBoxes()
+        sampler = MoveSampler(boxes,seed=1)
+        # execute
+        sampler.setWeight(0,1,0.0)
+        sampler.refreshBox(0)
+        sampler.reset()
+        # assert
+        self.assertEqual(boxes[0].moves[1].weight,0.0)
+        self.assertTrue(all(sampler.sample(0) == 0 for _ in range(100)))
+
+    ### MoveSampler.sampleBatch ###
+
+    def test_sampleBatch(self):
+        # setup
+        boxes = self.createBoxes()
+        sampler = MoveSampler(boxes,seed=1)
+        boxIndexes = np.array([0,1]*2000)
+        # execute
+        slots = sampler.sampleBatch(boxIndexes)
+        # assert
+        self.assertEqual(len(slots),len(boxIndexes))
+        self.assertTrue(np.all(slots[boxIndexes == 1] == 0))
+        counts = np.bincount(slots[boxIndexes == 0],minlength=3)
+        self.assertEqual(counts[2],0)
+        self.assertAlmostEqual(counts[1]/counts[0],3.0,delta=0.5)
+        # execute
+        boxes[1].moves[0].remove()
+        sampler.refreshBox(1)
+        slots = sampler.sampleBatch([1,0])
+        # assert
+        self.assertEqual(slots[0],NO_MOVE)
+        self.assertNotEqual(slots[1],NO_MOVE)
@@ -0,0 +1,127 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for game server.
+
+###############################################################################
+"""
+import asyncio
+import json
+import unittest
+from hexapawn.server import *
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.computer = Computer(seed=1)
+        self.computer.resetIntelligence()
+
+    def tearDown(self):
+        self.computer.resetIntelligence()
+
+    ### Session.handle ###
+
+    def test_handle_newGame(self):
+        # setup
+        session = Session(self.computer,True)
+        # execute
+        response = session.handle({"op" : "new"})
+        # assert
+        self.assertEqual(response,{
+            "ok" : True, "board" : Board().getKey(), "turn" : 1,
+            "black" : None, "winner" : None })
+
+    def test_handle_moveAnsweredByBlack(self):
+        # setup
+        session = Session(self.computer,True)
+        # execute
+        response = session.handle({"op" : "move", "from" : [2,1], "to" : [1,1]})
+        # assert
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["turn"],3)
+        self.assertIsNone(response["winner"])
+        self.assertEqual(response["black"][0][0],0)
+        self.assertEqual(response["black"][1][0],1)
+        self.assertEqual(response["board"],session.key)
+
+    def test_handle_invalidRequestsRaiseValueError(self):
+        # setup
+        session = Session(self.computer,True)
+        # execute/assert
+        with self.assertRaises(ValueError):
+            session.handle({"op" : "move", "from" : [2,1], "to" : [0,1]})
+        with self.assertRaises(ValueError):
+            session.handle({"op" : "move", "from" : [2,1], "to" : [3,1]})
+        with self.assertRaises(ValueError):
+            session.handle({"op" : "move", "from" : [2,1]})
+        with self.assertRaises(ValueError):
+            session.handle({"op" : "jump"})
+        with self.assertRaises(ValueError):
+            session.handle(["new"])
+
+class TestGameServer(unittest.TestCase):
+
+    def setUp(self):
+        self.computer = Computer(seed=1)
+        self.computer.resetIntelligence()
+
+    def tearDown(self):
+        self.computer.resetIntelligence()
+
+    async def request(self,reader,writer,request:dict)->dict:
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    def test_server_playsGame(self):
+        async def run():
+            server = GameServer(self.computer,port=0)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection(DEFAULT_HOST,port)
+            response = await self.request(reader,writer,{"op" : "new"})
+            self.assertTrue(response["ok"])
+            self.assertEqual(server.sessionCount,1)
+            response = await self.request(reader,writer,{"op" : "move", "from" : [2,0], "to" : [1,0]})
+            self.assertTrue(response["ok"])
+            self.assertEqual(response["turn"],3)
+            response = await self.request(reader,writer,{"op" : "move", "from" : [2,0], "to" : [0,0]})
+            self.assertFalse(response["ok"])
+            writer.write(b"not json\n")
+            response = json.loads(await reader.readline())
+            self.assertFalse(response["ok"])
+            writer.close()
+            await writer.wait_closed()
+            await server.stop()
+        asyncio.run(run())
+
+    def test_server_rejectsSessionsOverLimit(self):
+        async def run():
+            server = GameServer(self.computer,port=0,maxSessions=1)
+            port = await server.start()
+            readerA, writerA = await asyncio.open_connection(DEFAULT_HOST,port)
+            await self.request(readerA,writerA,{"op" : "new"})
+            readerB, writerB = await asyncio.open_connection(DEFAULT_HOST,port)
+            response = json.loads(await readerB.readline())
+            self.assertEqual(response,{"ok" : False, "error" : "Server full."})
+            self.assertEqual(await readerB.readline(),b"")
+            writerA.close()
+            writerB.close()
+            await server.stop()
+        asyncio.run(run())
+
+    def test_server_evictsIdleSession(self):
+        async def run():
+            server = GameServer(self.computer,port=0,idleTimeout=0.1)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection(DEFAULT_HOST,port)
+            response = json.loads(await reader.readline())
+            self.assertEqual(response,{"ok" : False, "error" : "Idle timeout."})
+            self.assertEqual(await reader.readline(),b"")
+            self.assertEqual(server.sessionCount,0)
+            writer.close()
+            await server.stop()
+        asyncio.run(run())
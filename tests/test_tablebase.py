@@ -0,0 +1,186 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for tablebase.
+
+###############################################################################
+"""
+import os
+import tempfile
+import unittest
+from hexapawn.tablebase import *
+from hexapawn.tablebase import _getSlices, _getSuffixCounts, _iterSliceKeys
+from tests.test_board import TestBoardUtil
+
+class TestTablebase(unittest.TestCase):
+
+    ### Tablebase.setResult/getResult ###
+
+    def test_setResult_packsFourResultsPerByte(self):
+        # setup
+        tablebase = Tablebase(hasDistance=False)
+        # execute
+        tablebase.setResult(4,Result.WIN)
+        tablebase.setResult(5,Result.LOSS)
+        tablebase.setResult(7,Result.WIN)
+        # assert
+        self.assertEqual(tablebase.getResult(3),Result.UNKNOWN)
+        self.assertEqual(tablebase.getResult(4),Result.WIN)
+        self.assertEqual(tablebase.getResult(5),Result.LOSS)
+        self.assertEqual(tablebase.getResult(6),Result.UNKNOWN)
+        self.assertEqual(tablebase.getResult(7),Result.WIN)
+        self.assertEqual(tablebase.getResult(8),Result.UNKNOWN)
+        self.assertIsNone(tablebase.getDistance(4))
+        # execute
+        tablebase.setResult(5,Result.WIN)
+        # assert
+        self.assertEqual(tablebase.getResult(4),Result.WIN)
+        self.assertEqual(tablebase.getResult(5),Result.WIN)
+
+    ### Tablebase.save/open ###
+
+    def test_open_readsSavedTablebase(self):
+        # setup
+        tablebase = Tablebase()
+        tablebase.setResult(10,Result.LOSS)
+        tablebase.setDistance(10,4)
+        tablebase.setResult(tablebase.count-1,Result.WIN)
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir,"tb.bin")
+            tablebase.save(path)
+            # execute
+            opened = Tablebase.open(path)
+            # assert
+            self.assertEqual(opened.size,SIZE)
+            self.assertTrue(opened.hasDistance)
+            self.assertEqual(opened.getResult(10),Result.LOSS)
+            self.assertEqual(opened.getDistance(10),4)
+            self.assertEqual(opened.getResult(tablebase.count-1),Result.WIN)
+            self.assertEqual(opened.getResult(11),Result.UNKNOWN)
+            opened.close()
+
+    def test_create_writesThroughToFile(self):
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir,"tb.bin")
+            # execute
+            tablebase = Tablebase.create(path,hasDistance=False)
+            tablebase.setResult(3,Result.WIN)
+            tablebase.flush()
+            tablebase.close()
+            # assert
+            opened = Tablebase.open(path)
+            self.assertFalse(opened.hasDistance)
+            self.assertEqual(opened.getResult(3),Result.WIN)
+            self.assertEqual(opened.getResult(2),Result.UNKNOWN)
+            opened.close()
+
+    ### generateTablebase ###
+
+    def test_generateTablebase_initialPositionIsLossForWhite(self):
+        # execute
+        tablebase = generateTablebase()
+        # assert
+        result, distance = tablebase.lookup(Board(),Player.WHITE)
+        self.assertEqual(result,Result.LOSS)
+        self.assertGreater(distance,0)
+        self.assertTrue(all(not tablebase.getResult(i) == Result.UNKNOWN\
+                            for i in range(tablebase.count)))
+
+    def test_generateTablebase_winningAndTerminalPositions(self):
+        # setup
+        tablebase = generateTablebase()
+        board = Board()
+        TestBoardUtil.setBoard(
+            board,
+            [
+                "B - -",
+                "- W -",
+                "- - -",
+            ])
+        # execute
+        result, distance = tablebase.lookup(board,Player.WHITE)
+        # assert
+        self.assertEqual(result,Result.WIN)
+        self.assertEqual(distance,1)
+        # execute
+        result, distance = tablebase.lookup(board,Player.BLACK)
+        # assert
+        self.assertEqual(result,Result.WIN)
+        self.assertEqual(distance,1)
+        # setup
+        TestBoardUtil.setBoard(
+            board,
+            [
+                "W - -",
+                "- - B",
+                "- - -",
+            ])
+        # execute
+        result, distance = tablebase.lookup(board,Player.BLACK)
+        # assert
+        self.assertEqual(result,Result.LOSS)
+        self.assertEqual(distance,0)
+
+    ### _iterSliceKeys ###
+
+    def test_iterSliceKeys_partitionsEveryKey(self):
+        # setup
+        suffixCounts = _getSuffixCounts(SIZE)
+        keys = []
+        # execute
+        for slice, count in _getSlices(SIZE):
+            sliceKeys = list(_iterSliceKeys(SIZE,slice,suffixCounts))
+            # assert
+            self.assertEqual(len(sliceKeys)*2,count)
+            keys.extend(sliceKeys)
+        self.assertEqual(sorted(keys),list(range(3**(SIZE*SIZE))))
+
+    ### generateTablebaseFile ###
+
+    def assertTablebasesEqual(self,tablebaseA:Tablebase,tablebaseB:Tablebase):
+        self.assertEqual(tablebaseA.count,tablebaseB.count)
+        for index in range(tablebaseA.count):
+            self.assertEqual(tablebaseA.getResult(index),tablebaseB.getResult(index))
+            self.assertEqual(tablebaseA.getDistance(index),tablebaseB.getDistance(index))
+
+    def test_generateTablebaseFile_matchesGenerateTablebase(self):
+        # setup
+        expected = generateTablebase()
+        progress = []
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir,"tb.bin")
+            # execute
+            tablebase = generateTablebaseFile(path,maxWorkers=2,
+                progressCallback=lambda solved,total : progress.append((solved,total)))
+            # assert
+            self.assertTablebasesEqual(tablebase,expected)
+            self.assertEqual(progress[-1],(expected.count,expected.count))
+            self.assertFalse(os.path.exists(path + PROGRESS_FILE_SUFFIX))
+            tablebase.close()
+
+    def test_generateTablebaseFile_resumesAfterInterruption(self):
+        # setup
+        expected = generateTablebase()
+        progress = []
+        def interrupt(solved,total):
+            progress.append(solved)
+            if len(progress) == 5:
+                raise RuntimeError("interrupted")
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir,"tb.bin")
+            with self.assertRaises(RuntimeError):
+                generateTablebaseFile(path,maxWorkers=2,progressCallback=interrupt)
+            self.assertTrue(os.path.exists(path + PROGRESS_FILE_SUFFIX))
+            # execute
+            resumed = []
+            tablebase = generateTablebaseFile(path,maxWorkers=2,
+                progressCallback=lambda solved,total : resumed.append(solved))
+            # assert
+            self.assertGreater(resumed[0],progress[-1])
+            self.assertEqual(len(progress)+len(resumed),len(_getSlices(SIZE)))
+            self.assertTablebasesEqual(tablebase,expected)
+            tablebase.close()
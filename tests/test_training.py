@@ -0,0 +1,67 @@
+"""
+###############################################################################
+
+    Author        :   abelaro
+    Copyright     :   2023
+
+    Description   :
+        Unit test for training.
+
+###############################################################################
+"""
+import unittest
+from hexapawn.training import *
+
+class TestTrainingWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.computer = Computer(seed=1)
+
+    ### TrainingWorker.run ###
+
+    def test_run_reportsEveryGame(self):
+        # setup
+        worker = TrainingWorker(self.computer,50,RandomPlayer(1))
+        reports = []
+        finished = []
+        worker.progress.connect(reports.append)
+        worker.finished.connect(finished.append)
+        # execute
+        worker.run()
+        # assert
+        self.assertEqual(finished,[50])
+        self.assertEqual(reports[-1].gamesPlayed,50)
+        self.assertEqual(reports[-1].games,50)
+        self.assertEqual(reports[-1].learningVersion,self.computer.getLearningVersion())
+        self.assertEqual(reports[-1].removedMasks,self.computer.getRemovedMasks())
+        results = [result for report in reports for result in report.results]
+        self.assertEqual(len(results),50)
+        removed = [moveRecord for winner, moveRecord in results if not moveRecord == None]
+        self.assertTrue(len(removed) > 0)
+        self.assertTrue(all(moveRecord.move.removed for moveRecord in removed))
+        self.assertTrue(all(winner == Player.WHITE for winner, moveRecord in results if not moveRecord == None))
+
+    def test_run_throttlesReports(self):
+        # setup
+        worker = TrainingWorker(self.computer,200,RandomPlayer(1),refreshRate=0.001)
+        reports = []
+        worker.progress.connect(reports.append)
+        # execute
+        worker.run()
+        # assert
+        self.assertEqual(len(reports),1)
+        self.assertEqual(len(reports[0].results),200)
+
+    ### TrainingWorker.stop ###
+
+    def test_stop_endsAfterCurrentGame(self):
+        # setup
+        worker = TrainingWorker(self.computer,100,RandomPlayer(1))
+        finished = []
+        worker.progress.connect(lambda progress: worker.stop())
+        worker.finished.connect(finished.append)
+        worker.refreshRate = 1e9
+        # execute
+        worker.run()
+        # assert
+        self.assertEqual(finished,[1])